@@ -1,17 +1,42 @@
 """SOS Agent client with multi-model support (AgentAPI, Gemini, OpenAI)."""
 
+import importlib
 import logging
 from typing import Any, AsyncIterator, Dict, Optional
 
-from .agentapi_client import AgentAPIClient
-from .gemini_client import GeminiClient
-from .openai_client import OpenAIClient
-from .inception_client import InceptionClient
-from .claude_sdk_client import ClaudeSDKClientAdapter
 from .config import SOSConfig
 
 logger = logging.getLogger(__name__)
 
+# Provider clients are imported on first use: their SDKs take over a second
+# to import, which every CLI invocation (even ``--help``) would otherwise pay.
+_PROVIDER_MODULES = {
+    "AgentAPIClient": ".agentapi_client",
+    "ClaudeSDKClientAdapter": ".claude_sdk_client",
+    "GeminiClient": ".gemini_client",
+    "InceptionClient": ".inception_client",
+    "OpenAIClient": ".openai_client",
+}
+
+_LANGUAGE_INSTRUCTIONS = {
+    "cs": "Language: Czech (cs). Respond in Czech.\n",
+    "en": "Language: English (en). Respond in English.\n",
+}
+
+
+def _load_client(name: str) -> Any:
+    """Return a provider client class, importing its module if needed."""
+    if name not in globals():
+        module = importlib.import_module(_PROVIDER_MODULES[name], __package__)
+        globals()[name] = getattr(module, name)
+    return globals()[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _PROVIDER_MODULES:
+        return _load_client(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class SOSAgentClient:
     """
@@ -43,13 +68,15 @@ class SOSAgentClient:
         # Initialize AI client based on provider
         self.client: Any
         if provider == "claude-agentapi":
-            self.client = AgentAPIClient(
+            self.client = _load_client("AgentAPIClient")(
                 api_url="http://localhost:3284",
                 claude_path="/usr/bin/claude",
             )
             self.client_type = "agentapi"
         elif provider == "claude-sdk":
-            self.client = ClaudeSDKClientAdapter(mcp_enabled=config.mcp_server_enabled)
+            self.client = _load_client("ClaudeSDKClientAdapter")(
+                mcp_enabled=config.mcp_server_enabled
+            )
             self.client_type = "claude-sdk"
         elif provider == "gemini":
             if not config.gemini_api_key:
@@ -57,7 +84,7 @@ class SOSAgentClient:
                     "Gemini provider vyžaduje GEMINI_API_KEY. "
                     "Doplňte klíč nebo zvolte jiného providera."
                 )
-            self.client = GeminiClient(
+            self.client = _load_client("GeminiClient")(
                 api_key=config.gemini_api_key,
                 model=config.gemini_model,
             )
@@ -68,7 +95,7 @@ class SOSAgentClient:
                     "OpenAI provider vyžaduje OPENAI_API_KEY. "
                     "Doplňte klíč nebo zvolte jiného providera."
                 )
-            self.client = OpenAIClient(
+            self.client = _load_client("OpenAIClient")(
                 api_key=config.openai_api_key,
                 model=config.openai_model,
             )
@@ -79,7 +106,7 @@ class SOSAgentClient:
                     "Inception provider vyžaduje INCEPTION_API_KEY. "
                     "Doplňte klíč nebo zvolte jiného providera."
                 )
-            self.client = InceptionClient(
+            self.client = _load_client("InceptionClient")(
                 api_key=config.inception_api_key,
                 model=config.inception_model,
                 language=config.ai_language,
@@ -184,28 +211,28 @@ class SOSAgentClient:
         """Reinitialize underlying provider client in-place."""
         self.config.ai_provider = provider
         if provider == "claude-agentapi":
-            self.client = AgentAPIClient(
+            self.client = _load_client("AgentAPIClient")(
                 api_url="http://localhost:3284",
                 claude_path="/usr/bin/claude",
             )
             self.client_type = "agentapi"
             return
         if provider == "gemini":
-            self.client = GeminiClient(
+            self.client = _load_client("GeminiClient")(
                 api_key=self.config.gemini_api_key,
                 model=self.config.gemini_model,
             )
             self.client_type = "gemini"
             return
         if provider == "openai":
-            self.client = OpenAIClient(
+            self.client = _load_client("OpenAIClient")(
                 api_key=self.config.openai_api_key,
                 model=self.config.openai_model,
             )
             self.client_type = "openai"
             return
         if provider == "inception":
-            self.client = InceptionClient(
+            self.client = _load_client("InceptionClient")(
                 api_key=self.config.inception_api_key,
                 model=self.config.inception_model,
                 language=self.config.ai_language,
@@ -250,12 +277,7 @@ class SOSAgentClient:
         Returns:
             Task with context
         """
-        language = (self.config.ai_language or "en").lower()
-        language_instruction = (
-            "Language: Czech (cs). Respond in Czech.\n"
-            if language.startswith("cs")
-            else "Language: English (en). Respond in English.\n"
-        )
+        language_instruction = _LANGUAGE_INSTRUCTIONS[self.config.language]
 
         context_str = f"""
 {language_instruction}
@@ -286,13 +308,14 @@ Task:
 
         try:
             # Basic system info
+            # Fixed argv lists: no shell is spawned in front of each probe.
             commands = [
-                ("Free Memory", f"{self.config.shell} -c 'free -h'"),
-                ("Disk Space", f"{self.config.shell} -c 'df -h'"),
-                ("System Load", f"{self.config.shell} -c 'uptime'"),
+                ("Free Memory", ["free", "-h"]),
+                ("Disk Space", ["df", "-h"]),
+                ("System Load", ["uptime"]),
                 (
                     "Critical Services",
-                    f"{self.config.shell} -c 'systemctl status sshd NetworkManager'",
+                    ["systemctl", "status", "sshd", "NetworkManager"],
                 ),
             ]
 
@@ -300,11 +323,10 @@ Task:
             for name, cmd in commands:
                 try:
                     result = subprocess.run(
-                        cmd.split(),
+                        cmd,
                         capture_output=True,
                         text=True,
                         timeout=10,
-                        shell=True,
                     )
                     output = result.stdout or result.stderr
                     results.append(f"### {name}\\n```\\n{output}\\n```\\n")
@@ -11,6 +11,14 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# SOSConfig field holding the model of each provider.
+PROVIDER_MODEL_ATTRS = {
+    "gemini": "gemini_model",
+    "openai": "openai_model",
+    "inception": "inception_model",
+    "claude-agentapi": "model",
+}
+
 
 @dataclass
 class SOSConfig:
@@ -73,6 +81,11 @@ class SOSConfig:
     memory_mcp_enabled: bool = False
     memory_mcp_port: Optional[int] = None
 
+    @property
+    def language(self) -> str:
+        """Normalized UI/response language: ``"cs"`` or ``"en"``."""
+        return "cs" if (self.ai_language or "en").lower().startswith("cs") else "en"
+
     @classmethod
     def from_yaml(cls, config_path: Path) -> "SOSConfig":
         """Load configuration from YAML file."""
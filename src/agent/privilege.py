@@ -1,3 +1,4 @@
+import functools
 import os
 import shutil
 import logging
@@ -5,8 +6,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def is_root() -> bool:
-    """Check if running as root."""
+    """Check if running as root (the effective UID is fixed for the process)."""
     return os.geteuid() == 0
 
 
@@ -0,0 +1,51 @@
+"""Text extraction from provider response streams."""
+
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+
+def _text_from_object(message: Any) -> str:
+    return "".join(block.text for block in message.content if hasattr(block, "text"))
+
+
+def _text_from_dict(message: Dict[str, Any]) -> str:
+    return "".join(
+        block["text"]
+        for block in message.get("content", ())
+        if block.get("type") == "text"
+    )
+
+
+def _text_from_str(message: str) -> str:
+    return message
+
+
+def _pick_text_extractor(message: Any) -> Optional[Callable[[Any], str]]:
+    """Select the text extractor matching a provider's chunk format."""
+    if hasattr(message, "content"):
+        return _text_from_object
+    if isinstance(message, dict) and "content" in message:
+        return _text_from_dict
+    if isinstance(message, str):
+        return _text_from_str
+    return None
+
+
+async def iter_text_chunks(stream: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Yield non-empty text chunks from a provider stream.
+
+    The extractor is picked once per run of same-typed chunks, not per
+    chunk: a backend sends one format, and only a failover (or a final
+    error string) switches it mid-stream. Unrecognised chunks are skipped.
+    """
+    extractor: Callable[[Any], str] = _text_from_str
+    kind: Optional[type] = None
+    async for message in stream:
+        if type(message) is not kind:
+            picked = _pick_text_extractor(message)
+            if picked is None:
+                kind = None
+                continue
+            extractor, kind = picked, type(message)
+        text_chunk = extractor(message)
+        if text_chunk:
+            yield text_chunk
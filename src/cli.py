@@ -1,12 +1,18 @@
 """SOS Agent CLI - Interactive menu-driven rescue interface."""
 
 import asyncio
+import atexit
+import contextlib
 import logging
+import logging.handlers
+import queue
+import secrets
 import subprocess
 import sys
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from dotenv import load_dotenv
 import asyncclick as click
@@ -15,13 +21,22 @@ from rich.panel import Panel
 from rich.table import Table
 
 from .agent.client import SOSAgentClient
+from .agent.stream import iter_text_chunks
 from .agent.config import SOSConfig, load_config
 from .agent.permissions import safe_permission_handler, CRITICAL_SERVICES
-from .tools.log_analyzer import analyze_system_logs
+from .tools.log_analyzer import (
+    CATEGORIES as LOG_CATEGORIES,
+    analyze_system_logs,
+    dedupe_entries,
+    format_timestamp,
+)
 from .session.store import FileSessionStore
 from .tools.fixers import get_all_fixers
 from .agent.privilege import is_root
 
+if TYPE_CHECKING:
+    from .gcloud.manager import GCloudManager
+
 console = Console()
 logger = logging.getLogger(__name__)
 
@@ -29,6 +44,22 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 MAX_LOG_SAMPLES = 10
+MAX_PARALLEL_PREVIEWS = 4
+# Command output longer than this (chars) is shown truncated.
+MAX_PRINTED_OUTPUT = 64 * 1024
+
+# Lowercase markers for GUI/display related service errors
+GUI_KEYWORDS = (
+    "x11",
+    "wayland",
+    "plasma",
+    "kde",
+    "gnome",
+    "display",
+    "xorg",
+    "gdm",
+    "sddm",
+)
 
 
 def _has_provider_key(config: SOSConfig) -> bool:
@@ -64,43 +95,190 @@ async def _run_shell(command: str) -> tuple[int, str, str]:
     )
 
 
-def _t(config: SOSConfig, cs: str, en: str) -> str:
-    return cs if (config.ai_language or "en").lower().startswith("cs") else en
+def _print_output(text: str, style: Optional[str] = None) -> None:
+    """Print captured command output, truncating very large outputs."""
+    text = text.rstrip()
+    if not text:
+        return
+    if len(text) > MAX_PRINTED_OUTPUT:
+        omitted = len(text) - MAX_PRINTED_OUTPUT
+        text = f"{text[:MAX_PRINTED_OUTPUT]}\n... [truncated {omitted} chars]"
+    # Output is plain text; don't let stray brackets be parsed as markup.
+    console.print(text, style=style, markup=False)
+
+
+class _ShellPool:
+    """Persistent ``/bin/sh`` workers for short read-only commands.
+
+    Saves a shell start-up per command. Each command runs in a subshell with
+    stdin from ``/dev/null`` so commands cannot affect each other or consume
+    the worker's input; output is delimited by a random end marker.
+    """
+
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, size: int):
+        self._size = size
+        self._spawned = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._procs: list[asyncio.subprocess.Process] = []
+        self._marker = f"__SOS_END_{secrets.token_hex(8)}__".encode()
+
+    async def _acquire(self) -> asyncio.subprocess.Process:
+        if self._idle.empty() and self._spawned < self._size:
+            self._spawned += 1
+            proc = await asyncio.create_subprocess_exec(
+                "/bin/sh",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            self._procs.append(proc)
+            return proc
+        return await self._idle.get()
+
+    async def _read_until_marker(
+        self, stream: asyncio.StreamReader
+    ) -> tuple[str, bytes]:
+        # Chunked reads rather than readline(): output lines of any length
+        # are fine, readline() fails on lines longer than the stream limit.
+        needle = b"\n" + self._marker
+        data = bytearray()
+        start = 0
+        while True:
+            pos = data.find(needle, start)
+            if pos >= 0:
+                end = data.find(b"\n", pos + len(needle))
+                if end >= 0:
+                    # Output up to the newline emitted in front of the marker
+                    return data[:pos].decode(errors="replace"), bytes(
+                        data[pos + 1 : end + 1]
+                    )
+                start = pos
+            else:
+                start = max(0, len(data) - len(needle) + 1)
+            chunk = await stream.read(self.READ_SIZE)
+            if not chunk:
+                raise RuntimeError("shell worker exited unexpectedly")
+            data += chunk
+
+    async def run(self, command: str) -> tuple[int, str, str]:
+        """Run ``command`` on a pooled shell, like ``_run_shell``."""
+        proc = await self._acquire()
+        marker = self._marker.decode()
+        script = (
+            f"( {command}\n) </dev/null\n"
+            f"printf '\\n{marker}:%d\\n' $?\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        try:
+            proc.stdin.write(script.encode())
+            await proc.stdin.drain()
+            (out, tail), (err, _) = await asyncio.gather(
+                self._read_until_marker(proc.stdout),
+                self._read_until_marker(proc.stderr),
+            )
+        except BaseException:
+            # The worker is in an unknown state; replace it on next use.
+            proc.kill()
+            self._procs.remove(proc)
+            self._spawned -= 1
+            raise
+        self._idle.put_nowait(proc)
+        return int(tail[len(self._marker) + 1 :] or 0), out, err
+
+    async def aclose(self) -> None:
+        for proc in self._procs:
+            if proc.returncode is None:
+                proc.stdin.close()
+                await proc.wait()
+        self._procs.clear()
+
+
+@dataclass(frozen=True)
+class _OptimizeMessages:
+    """User-facing strings of the interactive ``optimize-apps`` flow."""
+
+    interactive_mode: str
+    apt_missing: str
+    flatpak_missing: str
+    snap_missing: str
+    docker_missing: str
+    appimage_info: str
+    no_steps: str
+    preview_exit_note: str
+    no_tty_skipped: str
+    confirm_step: str
+    running: str
+    step_failed: str
+
+
+# Resolved once per command via SOSConfig.language.
+_OPTIMIZE_MESSAGES: Dict[str, _OptimizeMessages] = {
+    "cs": _OptimizeMessages(
+        interactive_mode="Interaktivní režim: nejdřív preview (dry-run), pak nabídka provedení kroků.",
+        apt_missing="[yellow]APT není k dispozici (apt-get nenalezen).[/yellow]",
+        flatpak_missing="[yellow]Flatpak není k dispozici.[/yellow]",
+        snap_missing="[yellow]Snap není k dispozici.[/yellow]",
+        docker_missing="[yellow]Docker není k dispozici.[/yellow]",
+        appimage_info="[dim]AppImage optimalizace zatím jen informativní (TODO).[/dim]",
+        no_steps="[yellow]Žádné kroky k provedení (nebo chybí nástroje).[/yellow]",
+        preview_exit_note="[yellow]Pozn.: preview příkaz skončil kódem {rc}.[/yellow]",
+        no_tty_skipped="[dim]Bez TTY: přeskočeno. Pro provedení použij `--yes` nebo spusť interaktivně.[/dim]",
+        confirm_step="Chceš provést tento krok teď? ({label})",
+        running="[cyan]Spouštím...[/cyan]",
+        step_failed="[red]Krok selhal (exit {rc}).[/red]",
+    ),
+    "en": _OptimizeMessages(
+        interactive_mode="Interactive mode: preview first (dry-run), then offer to execute steps.",
+        apt_missing="[yellow]APT not available (apt-get not found).[/yellow]",
+        flatpak_missing="[yellow]Flatpak not available.[/yellow]",
+        snap_missing="[yellow]Snap not available.[/yellow]",
+        docker_missing="[yellow]Docker not available.[/yellow]",
+        appimage_info="[dim]AppImage optimization is informational only (TODO).[/dim]",
+        no_steps="[yellow]No actionable steps (or required tools missing).[/yellow]",
+        preview_exit_note="[yellow]Note: preview command exited with {rc}.[/yellow]",
+        no_tty_skipped="[dim]No TTY detected: skipped. Use `--yes` or run interactively to execute.[/dim]",
+        confirm_step="Execute this step now? ({label})",
+        running="[cyan]Running...[/cyan]",
+        step_failed="[red]Step failed (exit {rc}).[/red]",
+    ),
+}
 
 
 def setup_logging(verbose: bool = False) -> None:
-    """Configure logging for SOS Agent."""
+    """Configure logging for SOS Agent.
+
+    Records are pushed onto a queue and written by a background listener,
+    so console/file I/O never blocks the event loop.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        # Same contract as logging.basicConfig: never reconfigure.
+        return
+
     level = logging.DEBUG if verbose else logging.INFO
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = logging.FileHandler("logs/sos-agent.log", delay=True)
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("logs/sos-agent.log"),
-        ],
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
     )
+    listener.start()
+    atexit.register(listener.stop)
 
 
 async def _safe_print_stream(stream):
     """Print stream chunks with safety guardrails."""
-    async for message in stream:
-        text_chunk = ""
-        # Handle various response formats
-        if hasattr(message, "content"):
-            for block in message.content:
-                if hasattr(block, "text"):
-                    text_chunk += block.text
-        elif isinstance(message, dict) and "content" in message:
-            for block in message["content"]:
-                if block.get("type") == "text":
-                    text_chunk += block["text"]
-        elif isinstance(message, str):
-            text_chunk = message
-
-        if not text_chunk:
-            continue
-
+    async for text_chunk in iter_text_chunks(stream):
         # Guardrail logic: Check for critical service stop/disable
         for service in CRITICAL_SERVICES:
             # We check for the dangerous pattern in the chunk.
@@ -196,7 +374,8 @@ async def diagnose(ctx: click.Context, category: str, issue: Optional[str]) -> N
     Analyzes logs, system health, and identifies issues.
     """
     client: SOSAgentClient = ctx.obj["client"]
-    store = FileSessionStore()
+    # Compacted and closed when the command exits
+    store = await ctx.with_async_resource(contextlib.aclosing(FileSessionStore()))
 
     if issue:
         await store.save_issue(issue)
@@ -208,63 +387,33 @@ async def diagnose(ctx: click.Context, category: str, issue: Optional[str]) -> N
     console.print(Panel(f"[bold cyan]Running {category} diagnostics...[/bold cyan]"))
 
     # STEP 1: Collect REAL system data instead of asking AI to hallucinate
-    console.print("[dim]Collecting system logs (errors)...[/dim]")
-    log_data_errors = await analyze_system_logs(time_range="24h", severity="error")
-
-    console.print("[dim]Collecting system logs (warnings)...[/dim]")
-    log_data_warnings = await analyze_system_logs(time_range="24h", severity="warning")
-
-    # Merge data - combine errors and warnings, dedupe by (unit, message)
-    def _dedupe(entries):
-        seen = set()
-        unique = []
-        for entry in entries:
-            key = (entry.get("unit", ""), entry.get("message", ""))
-            if key in seen:
-                continue
-            seen.add(key)
-            unique.append(entry)
-        return unique
+    # journalctl -p warning includes every higher priority (errors too), so
+    # one scan replaces separate error and warning passes
+    console.print("[dim]Collecting system logs (errors and warnings)...[/dim]")
+    log_results = await analyze_system_logs(time_range="24h", severity="warning")
 
+    # Collapse repeats of the same (unit, message)
     log_data = {
-        "hardware_errors": _dedupe(
-            log_data_errors["hardware_errors"] + log_data_warnings["hardware_errors"]
-        ),
-        "driver_errors": _dedupe(
-            log_data_errors["driver_errors"] + log_data_warnings["driver_errors"]
-        ),
-        "service_errors": _dedupe(
-            log_data_errors["service_errors"] + log_data_warnings["service_errors"]
-        ),
-        "security_warnings": _dedupe(
-            log_data_errors["security_warnings"]
-            + log_data_warnings["security_warnings"]
-        ),
-        "recommendations": log_data_errors["recommendations"]
-        + log_data_warnings["recommendations"],
+        category: dedupe_entries(log_results[category]) for category in LOG_CATEGORIES
     }
+    log_data["recommendations"] = log_results["recommendations"]
+    # Full totals: the category lists are capped
+    counts = log_results["counts"]
 
     # STEP 2: Detect OS/System Info (CRITICAL - must know what we're fixing!)
     console.print("[dim]Detecting system information...[/dim]")
     try:
-        os_release_proc = await asyncio.create_subprocess_shell(
-            "cat /etc/os-release",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        os_release_out, _ = await os_release_proc.communicate()
-
-        uname_proc = await asyncio.create_subprocess_shell(
-            "uname -a", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        # Independent commands: run them concurrently
+        (_, os_release_out, _), (_, uname_out, _) = await asyncio.gather(
+            _run_shell("cat /etc/os-release"), _run_shell("uname -a")
         )
-        uname_out, _ = await uname_proc.communicate()
 
         system_info = f"""
 OS Information:
-{os_release_out.decode()}
+{os_release_out}
 
 Kernel:
-{uname_out.decode()}
+{uname_out}
 """
     except Exception as e:
         logger.warning(f"Failed to detect system info: {e}")
@@ -273,63 +422,40 @@ Kernel:
     # STEP 3: Collect resource usage
     console.print("[dim]Checking system resources...[/dim]")
     try:
-        # Get actual system metrics
-        free_proc = await asyncio.create_subprocess_shell(
-            "free -h", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        free_out, _ = await free_proc.communicate()
-
-        df_proc = await asyncio.create_subprocess_shell(
-            "df -h /", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        # Get actual system metrics, all commands at once
+        (_, free_out, _), (_, df_out, _), (_, uptime_out, _) = await asyncio.gather(
+            _run_shell("free -h"), _run_shell("df -h /"), _run_shell("uptime")
         )
-        df_out, _ = await df_proc.communicate()
-
-        uptime_proc = await asyncio.create_subprocess_shell(
-            "uptime", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        uptime_out, _ = await uptime_proc.communicate()
 
         resource_data = f"""
 Memory Usage:
-{free_out.decode()}
+{free_out}
 
 Disk Usage:
-{df_out.decode()}
+{df_out}
 
 System Load:
-{uptime_out.decode()}
+{uptime_out}
 """
     except Exception as e:
         logger.warning(f"Failed to collect resource data: {e}")
         resource_data = "⚠️  Could not collect resource data"
 
     # STEP 4: Prioritize GUI/Display errors (critical for user experience)
-    gui_keywords = [
-        "x11",
-        "wayland",
-        "plasma",
-        "kde",
-        "gnome",
-        "display",
-        "xorg",
-        "gdm",
-        "sddm",
-    ]
-    gui_errors = [
-        e
-        for e in log_data["service_errors"]
-        if any(
-            kw in (e["message"].lower() + str(e["unit"]).lower()) for kw in gui_keywords
-        )
-    ]
-
-    other_errors = [e for e in log_data["service_errors"] if e not in gui_errors]
+    gui_errors = []
+    other_errors = []
+    for e in log_data["service_errors"]:
+        haystack = f"{e.get('message') or ''} {e.get('unit') or ''}".lower()
+        if any(kw in haystack for kw in GUI_KEYWORDS):
+            gui_errors.append(e)
+        else:
+            other_errors.append(e)
 
     def _format_entries(entries, limit=MAX_LOG_SAMPLES):
         if not entries:
             return "No entries"
         lines = [
-            f"- [{e['timestamp']}] {e.get('unit','unknown')}: {e.get('message','')}"
+            f"- [{format_timestamp(e)}] {e.get('unit','unknown')}: {e.get('message','')}"
             for e in entries[:limit]
         ]
         return "\n".join(lines)
@@ -347,11 +473,11 @@ System:
 Resources:
 {resource_data.strip()}
 
-Log summary (last 24h, deduped):
-- Hardware errors: {len(log_data['hardware_errors'])}
-- Driver errors: {len(log_data['driver_errors'])}
-- Service errors: {len(log_data['service_errors'])} (GUI/display: {len(gui_errors)})
-- Security warnings: {len(log_data['security_warnings'])}
+Log summary (last 24h, total entries):
+- Hardware errors: {counts['hardware_errors']}
+- Driver errors: {counts['driver_errors']}
+- Service errors: {counts['service_errors']} (GUI/display among the newest: {len(gui_errors)})
+- Security warnings: {counts['security_warnings']}
 
 Analyzer Recommendations (automated pre-analysis):
 {chr(10).join(f"- {r}" for r in log_data['recommendations'])}
@@ -641,7 +767,7 @@ async def chat(ctx: click.Context, message: Optional[str]) -> None:
         )
         return
 
-    store = FileSessionStore()
+    store = await ctx.with_async_resource(contextlib.aclosing(FileSessionStore()))
     issue = await store.get_issue()
     history = await store.get_chat_history()
 
@@ -662,22 +788,11 @@ async def chat(ctx: click.Context, message: Optional[str]) -> None:
 
         response_text = ""
         try:
-            async for chunk in client.execute_rescue_task(full_prompt):
-                text_chunk = ""
-                if hasattr(chunk, "content"):
-                    for block in chunk.content:
-                        if hasattr(block, "text"):
-                            text_chunk += block.text
-                elif isinstance(chunk, dict) and "content" in chunk:
-                    for block in chunk["content"]:
-                        if block.get("type") == "text":
-                            text_chunk += block["text"]
-                elif isinstance(chunk, str):
-                    text_chunk = chunk
-
-                if text_chunk:
-                    response_text += text_chunk
-                    console.print(text_chunk, end="")
+            async for text_chunk in iter_text_chunks(
+                client.execute_rescue_task(full_prompt)
+            ):
+                response_text += text_chunk
+                console.print(text_chunk, end="")
             console.print()  # Newline after streaming
         except Exception as e:
             console.print(f"[red]Error during chat: {e}[/red]")
@@ -731,28 +846,42 @@ async def tui_screenshot(ctx: click.Context, out: Optional[str], as_png: bool) -
 
     ts = datetime.now().strftime("%Y-%m-%dT%H_%M_%S")
     svg_path = Path(out) if out else Path.cwd() / f"SOS_Agent_{ts}.svg"
+    png_path = svg_path.with_suffix(".png")
+    chrome = shutil.which("google-chrome") if as_png else None
+    chrome_proc: Optional[asyncio.subprocess.Process] = None
 
     app = SOSApp(init_client=False)
     async with app.run_test() as pilot:
         await pilot.pause()
         saved = app.save_screenshot(filename=svg_path.name, path=str(svg_path.parent))
+        if chrome:
+            # Start Chrome as soon as the SVG exists so its startup overlaps
+            # with the Textual app shutdown.
+            chrome_proc = await asyncio.create_subprocess_exec(
+                chrome,
+                "--headless",
+                "--disable-gpu",
+                "--no-sandbox",
+                "--window-size=2200,1200",
+                f"--screenshot={png_path}",
+                f"file://{svg_path}",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
 
     console.print(f"[green]Saved:[/green] {saved}")
 
     if not as_png:
         return
 
-    png_path = svg_path.with_suffix(".png")
-    if shutil.which("google-chrome"):
-        cmd = (
-            f"google-chrome --headless --disable-gpu --no-sandbox "
-            f'--window-size=2200,1200 --screenshot="{png_path}" "file://{svg_path}"'
-        )
-        rc, _, err = await _run_shell(cmd)
-        if rc == 0 and png_path.exists():
+    if chrome_proc is not None:
+        _, err = await chrome_proc.communicate()
+        if chrome_proc.returncode == 0 and png_path.exists():
             console.print(f"[green]Saved:[/green] {png_path}")
             return
-        console.print(f"[yellow]PNG export failed:[/yellow] {err.strip()}")
+        console.print(
+            f"[yellow]PNG export failed:[/yellow] {err.decode(errors='replace').strip()}"
+        )
 
     console.print(
         "[yellow]PNG export not available (install Chrome or use another SVG viewer).[/yellow]"
@@ -820,6 +949,7 @@ async def optimize_apps(
     """
     client: SOSAgentClient = ctx.obj["client"]
     config: SOSConfig = ctx.obj["config"]
+    msgs = _OPTIMIZE_MESSAGES[config.language]
 
     console.print(
         Panel(f"[bold cyan]Optimizing {platform} applications...[/bold cyan]")
@@ -828,11 +958,7 @@ async def optimize_apps(
     if not use_ai:
         console.print(
             Panel(
-                _t(
-                    config,
-                    "Interaktivní režim: nejdřív preview (dry-run), pak nabídka provedení kroků.",
-                    "Interactive mode: preview first (dry-run), then offer to execute steps.",
-                ),
+                msgs.interactive_mode,
                 style="cyan",
             )
         )
@@ -857,13 +983,7 @@ async def optimize_apps(
                     ]
                 )
             else:
-                console.print(
-                    _t(
-                        config,
-                        "[yellow]APT není k dispozici (apt-get nenalezen).[/yellow]",
-                        "[yellow]APT not available (apt-get not found).[/yellow]",
-                    )
-                )
+                console.print(msgs.apt_missing)
 
             if shutil.which("deborphan"):
                 steps.append(
@@ -884,13 +1004,7 @@ async def optimize_apps(
                     )
                 )
             else:
-                console.print(
-                    _t(
-                        config,
-                        "[yellow]Flatpak není k dispozici.[/yellow]",
-                        "[yellow]Flatpak not available.[/yellow]",
-                    )
-                )
+                console.print(msgs.flatpak_missing)
 
         if platform in {"all", "snap"}:
             if shutil.which("snap"):
@@ -903,13 +1017,7 @@ async def optimize_apps(
                     )
                 )
             else:
-                console.print(
-                    _t(
-                        config,
-                        "[yellow]Snap není k dispozici.[/yellow]",
-                        "[yellow]Snap not available.[/yellow]",
-                    )
-                )
+                console.print(msgs.snap_missing)
 
         if platform in {"all", "docker"}:
             if shutil.which("docker"):
@@ -922,99 +1030,74 @@ async def optimize_apps(
                     )
                 )
             else:
-                console.print(
-                    _t(
-                        config,
-                        "[yellow]Docker není k dispozici.[/yellow]",
-                        "[yellow]Docker not available.[/yellow]",
-                    )
-                )
+                console.print(msgs.docker_missing)
 
         if platform in {"all", "appimage"}:
-            console.print(
-                _t(
-                    config,
-                    "[dim]AppImage optimalizace zatím jen informativní (TODO).[/dim]",
-                    "[dim]AppImage optimization is informational only (TODO).[/dim]",
-                )
-            )
+            console.print(msgs.appimage_info)
 
         if not steps:
-            console.print(
-                _t(
-                    config,
-                    "[yellow]Žádné kroky k provedení (nebo chybí nástroje).[/yellow]",
-                    "[yellow]No actionable steps (or required tools missing).[/yellow]",
-                )
-            )
+            console.print(msgs.no_steps)
             return
 
-        for label, preview_cmd, exec_cmd in steps:
-            console.print(Panel(label, style="bold magenta"))
-            rc, out, err = await _run_shell(preview_cmd)
-            if out.strip():
-                console.print(out.rstrip())
-            if err.strip():
-                console.print(f"[dim]{err.rstrip()}[/dim]")
-            if rc != 0:
-                console.print(
-                    _t(
-                        config,
-                        f"[yellow]Pozn.: preview příkaz skončil kódem {rc}.[/yellow]",
-                        f"[yellow]Note: preview command exited with {rc}.[/yellow]",
-                    )
-                )
+        # Previews are read-only: start them all up front on a bounded pool of
+        # shells and show results in step order; execution stays sequential
+        # and uses a fresh shell per command.
+        shell_pool = _ShellPool(MAX_PARALLEL_PREVIEWS)
+        previews = [asyncio.create_task(shell_pool.run(p)) for _, p, _ in steps]
 
-            if not exec_cmd:
-                continue
+        try:
+            for i, (label, _, exec_cmd) in enumerate(steps):
+                console.print(Panel(label, style="bold magenta"))
+                rc, out, err = await previews[i]
+                _print_output(out)
+                _print_output(err, style="dim")
+                if rc != 0:
+                    console.print(msgs.preview_exit_note.format(rc=rc))
+
+                if not exec_cmd:
+                    continue
 
-            if yes:
-                proceed = True
-            elif not sys.stdin.isatty():
-                console.print(
-                    _t(
-                        config,
-                        "[dim]Bez TTY: přeskočeno. Pro provedení použij `--yes` nebo spusť interaktivně.[/dim]",
-                        "[dim]No TTY detected: skipped. Use `--yes` or run interactively to execute.[/dim]",
+                if yes:
+                    proceed = True
+                elif not sys.stdin.isatty():
+                    console.print(msgs.no_tty_skipped)
+                    proceed = False
+                else:
+                    proceed = click.confirm(
+                        msgs.confirm_step.format(label=label),
+                        default=False,
                     )
-                )
-                proceed = False
-            else:
-                proceed = click.confirm(
-                    _t(
-                        config,
-                        f"Chceš provést tento krok teď? ({label})",
-                        f"Execute this step now? ({label})",
-                    ),
-                    default=False,
-                )
-            if not proceed:
-                continue
-
-            # Safety gate
-            perm = await safe_permission_handler(
-                "Bash", {"command": exec_cmd}, {"emergency_mode": config.emergency_mode}
-            )
-            if perm.get("behavior") == "deny":
-                console.print(f"[red]Blocked:[/red] {perm.get('reason')}")
-                continue
+                if not proceed:
+                    continue
 
-            console.print(
-                _t(config, "[cyan]Spouštím...[/cyan]", "[cyan]Running...[/cyan]")
-            )
-            rc2, out2, err2 = await _run_shell(exec_cmd)
-            if out2.strip():
-                console.print(out2.rstrip())
-            if err2.strip():
-                console.print(f"[dim]{err2.rstrip()}[/dim]")
-            if rc2 != 0:
-                console.print(
-                    _t(
-                        config,
-                        f"[red]Krok selhal (exit {rc2}).[/red]",
-                        f"[red]Step failed (exit {rc2}).[/red]",
-                    )
+                # Safety gate
+                perm = await safe_permission_handler(
+                    "Bash",
+                    {"command": exec_cmd},
+                    {"emergency_mode": config.emergency_mode},
                 )
+                if perm.get("behavior") == "deny":
+                    console.print(f"[red]Blocked:[/red] {perm.get('reason')}")
+                    continue
+
+                console.print(msgs.running)
+                rc2, out2, err2 = await _run_shell(exec_cmd)
+                _print_output(out2)
+                _print_output(err2, style="dim")
+                if rc2 != 0:
+                    console.print(msgs.step_failed.format(rc=rc2))
+
+                # The remaining previews saw the system before this step ran
+                # (e.g. upgrade after autoremove): compute them again
+                for stale in previews[i + 1 :]:
+                    stale.cancel()
+                previews[i + 1 :] = [
+                    asyncio.create_task(shell_pool.run(p)) for _, p, _ in steps[i + 1 :]
+                ]
+        finally:
+            for preview in previews:
+                preview.cancel()
+            await shell_pool.aclose()
         return
 
     task = f"""
@@ -1040,16 +1123,21 @@ Platforms to check: {platform}
 
 
 @cli.command()
-def setup() -> None:
+@click.option(
+    "--non-interactive",
+    is_flag=True,
+    help="Use keys from .env/environment; fail instead of prompting",
+)
+def setup(non_interactive: bool) -> None:
     """🛠️  Run interactive setup wizard to configure API keys."""
     console.print(Panel("[bold green]Starting SOS Agent Setup Wizard...[/bold green]"))
 
     # Run setup wizard
+    cmd = [sys.executable, "-m", "src.setup_wizard"]
+    if non_interactive:
+        cmd.append("--non-interactive")
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "src.setup_wizard"],
-            check=True,
-        )
+        result = subprocess.run(cmd, check=True)
         if result.returncode == 0:
             console.print("\n[green]✅ Setup completed successfully![/green]")
         else:
@@ -1068,13 +1156,34 @@ def gcloud() -> None:
     pass
 
 
+def _gcloud_manager(ctx: click.Context, use_cache: bool = True) -> "GCloudManager":
+    """Return the GCloudManager shared by the gcloud commands of this run.
+
+    Kept on the root context, one per ``use_cache`` setting, so its lookup
+    cache and REST session (and their auth) are reused; closed at exit.
+    """
+    from .gcloud.manager import GCloudManager, default_cache_path
+
+    root = ctx.find_root()
+    managers = root.ensure_object(dict).setdefault("gcloud_managers", {})
+    if use_cache not in managers:
+        manager = GCloudManager(
+            cache_path=default_cache_path() if use_cache else None, use_rest=True
+        )
+        root.call_on_close(manager.close)
+        managers[use_cache] = manager
+    return managers[use_cache]
+
+
 @gcloud.command()
-def check() -> None:
+@click.option(
+    "--no-cache", is_flag=True, help="Ignore cached gcloud results from earlier runs"
+)
+@click.pass_context
+async def check(ctx: click.Context, no_cache: bool) -> None:
     """Check current GCloud project and quota status."""
-    from .gcloud.manager import GCloudManager
-
     try:
-        manager = GCloudManager()
+        manager = _gcloud_manager(ctx, use_cache=not no_cache)
 
         console.print(Panel("[bold cyan]Google Cloud Status Check[/bold cyan]"))
 
@@ -1093,8 +1202,12 @@ def check() -> None:
             f"[green]✓[/green] Active project: [bold]{current_project}[/bold]"
         )
 
-        # Check if Gemini API is enabled
-        api_enabled = manager.is_api_enabled(current_project)
+        # API state and quota are independent lookups; run them concurrently
+        api_enabled, quota = await asyncio.gather(
+            asyncio.to_thread(manager.is_api_enabled, current_project),
+            asyncio.to_thread(manager.check_quota_status, current_project),
+        )
+
         if api_enabled:
             console.print(
                 "[green]✓[/green] Gemini API: [bold green]Enabled[/bold green]"
@@ -1103,9 +1216,6 @@ def check() -> None:
             console.print("[red]✗[/red] Gemini API: [bold red]Not Enabled[/bold red]")
             console.print("\nEnable with: [green]sos gcloud enable-api[/green]")
 
-        # Check quota status
-        quota = manager.check_quota_status(current_project)
-
         table = Table(title="Gemini API Quota Status")
         table.add_column("Metric", style="cyan")
         table.add_column("Value", style="magenta")
@@ -1138,12 +1248,11 @@ def check() -> None:
 
 
 @gcloud.command()
-def list_projects() -> None:
+@click.pass_context
+def list_projects(ctx: click.Context) -> None:
     """List all Google Cloud projects."""
-    from .gcloud.manager import GCloudManager
-
     try:
-        manager = GCloudManager()
+        manager = _gcloud_manager(ctx)
         projects = manager.list_projects()
 
         table = Table(title="Google Cloud Projects")
@@ -1173,12 +1282,11 @@ def list_projects() -> None:
 
 @gcloud.command()
 @click.option("--project", help="Project ID to enable API for")
-def enable_api(project: Optional[str]) -> None:
+@click.pass_context
+def enable_api(ctx: click.Context, project: Optional[str]) -> None:
     """Enable Gemini API for a project."""
-    from .gcloud.manager import GCloudManager
-
     try:
-        manager = GCloudManager()
+        manager = _gcloud_manager(ctx)
 
         if not project:
             project = manager.get_current_project()
@@ -1202,16 +1310,15 @@ def enable_api(project: Optional[str]) -> None:
     "--auto", is_flag=True, help="Enable auto-mode (creates project automatically)"
 )
 @click.option("--project-id", help="Custom project ID (auto-generated if not provided)")
-def init(auto: bool, project_id: Optional[str]) -> None:
+@click.pass_context
+def init(ctx: click.Context, auto: bool, project_id: Optional[str]) -> None:
     """Initialize Google Cloud project for SOS Agent.
 
     Level 1 (Safe): Guides you through manual setup
     Level 2 (Auto): Automatically creates and configures project (requires --auto flag)
     """
-    from .gcloud.manager import GCloudManager
-
     try:
-        manager = GCloudManager()
+        manager = _gcloud_manager(ctx)
 
         if not auto:
             # Level 1: Safe mode - just guidance
@@ -1294,10 +1401,19 @@ def init(auto: bool, project_id: Optional[str]) -> None:
         sys.exit(1)
 
 
+def _backend_options() -> Dict[str, Any]:
+    """Run the event loop on uvloop when it is installed."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return {}
+    return {"use_uvloop": True}
+
+
 def main() -> None:
     """Main entry point."""
     try:
-        cli(_anyio_backend="asyncio")
+        cli(_anyio_backend="asyncio", _anyio_backend_options=_backend_options())
     except KeyboardInterrupt:
         console.print("\n[yellow]SOS Agent interrupted[/yellow]")
         sys.exit(0)
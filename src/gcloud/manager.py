@@ -1,15 +1,48 @@
-"""Google Cloud Platform manager for SOS Agent."""
+"""Google Cloud Platform manager for SOS Agent.
 
+gcloud is always invoked with an explicit argv list (never through a shell),
+so arguments such as ``--name=SOS Agent`` are passed verbatim.
+"""
+
+import functools
 import json
 import logging
+import os
+import secrets
 import subprocess
+import tempfile
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import fastjson
 
 logger = logging.getLogger(__name__)
 
+# Cache lifetimes (seconds) for gcloud lookups; the data rarely changes
+# while gcloud itself costs hundreds of ms per invocation.
+PROJECT_TTL = 20 * 60
+PROJECT_LIST_TTL = 5 * 60
+API_ENABLED_TTL = 10 * 60
+QUOTA_TTL = 30
+
+# REST endpoints for the read-only fast path (no gcloud process per call)
+RESOURCE_MANAGER_URL = "https://cloudresourcemanager.googleapis.com/v1"
+SERVICE_USAGE_URL = "https://serviceusage.googleapis.com/v1"
+REST_TIMEOUT = 10
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
-@dataclass
+
+def default_cache_path() -> Path:
+    """Location of the persistent gcloud lookup cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "sos-agent" / "gcloud.json"
+
+
+@dataclass(slots=True)
 class GCloudProject:
     """Google Cloud Project information."""
 
@@ -18,8 +51,18 @@ class GCloudProject:
     project_number: str
     lifecycle_state: str
 
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> "GCloudProject":
+        """Build from a Resource Manager project resource."""
+        return cls(
+            project_id=item["projectId"],
+            name=item["name"],
+            project_number=item["projectNumber"],
+            lifecycle_state=item["lifecycleState"],
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class QuotaStatus:
     """Gemini API quota status."""
 
@@ -31,33 +74,282 @@ class QuotaStatus:
     region: str
 
 
+@functools.lru_cache(maxsize=1)
+def _gcloud_version() -> str:
+    """Run ``gcloud version`` once per process; failures are not cached."""
+    return subprocess.run(
+        ["gcloud", "version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def _iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """Incrementally decode the elements of a JSON array split across chunks.
+
+    Only the current partial element is buffered, so large listings are
+    never held in memory as one string.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    opened = False
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not opened:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            yield item
+        buffer = buffer[pos:]
+
+    if opened:
+        raise ValueError("Truncated JSON array")
+
+
 class GCloudManager:
     """Manages Google Cloud operations for SOS Agent."""
 
-    def __init__(self):
-        """Initialize GCloud manager."""
+    def __init__(self, cache_path: Optional[Path] = None, use_rest: bool = False):
+        """Initialize GCloud manager.
+
+        Args:
+            cache_path: Optional JSON file used to persist cached lookups
+                across runs. Without it results are only cached in memory.
+            use_rest: Serve read-only lookups through Google REST APIs,
+                authenticated as the active gcloud account, falling back to
+                the gcloud CLI when they are unavailable.
+        """
+        self.cache_path = cache_path
+        self.use_rest = use_rest
+        self._session: Any = None
+        self._session_lock = threading.Lock()
+        # Lookups may run concurrently from worker threads (see `sos gcloud check`)
+        self._cache_lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Any]] = self._load_cache()
+        # (expiry, project) of the active project; local gcloud config, so it
+        # is never persisted: `gcloud config set project` run outside sos has
+        # to take effect on the next invocation
+        self._current_project: Optional[Tuple[float, str]] = None
         self._check_gcloud_installed()
 
+    def _load_cache(self) -> Dict[str, Tuple[float, Any]]:
+        """Load unexpired cache entries from disk."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+
+        try:
+            raw = fastjson.load_file(self.cache_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable gcloud cache: {e}")
+            return {}
+
+        now = time.time()
+        return {
+            key: (expiry, value) for key, (expiry, value) in raw.items() if expiry > now
+        }
+
+    def _save_cache(self) -> None:
+        """Persist cache entries to disk (best effort, caller holds the lock)."""
+        if not self.cache_path:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(fastjson.dumps(self._cache))
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Failed to save gcloud cache: {e}")
+
+    def _cache_get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a cache key."""
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= time.time():
+            return False, None
+        return True, entry[1]
+
+    def _cache_set(self, key: str, value: Any, ttl: float) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.time() + ttl, value)
+            self._save_cache()
+
+    def invalidate_cache(self, *prefixes: str) -> None:
+        """Drop cached entries whose key starts with any of the prefixes.
+
+        Without prefixes the whole cache is cleared.
+        """
+        with self._cache_lock:
+            if prefixes:
+                stale = [k for k in self._cache if k.startswith(prefixes)]
+            else:
+                stale = list(self._cache)
+            for key in stale:
+                del self._cache[key]
+            if stale:
+                self._save_cache()
+
     def _check_gcloud_installed(self) -> bool:
         """Check if gcloud CLI is installed and authenticated."""
         try:
-            result = subprocess.run(
-                ["gcloud", "version"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            logger.debug(f"gcloud version: {result.stdout}")
+            logger.debug(f"gcloud version: {_gcloud_version()}")
             return True
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
             logger.error(f"gcloud CLI not found or not authenticated: {e}")
             raise RuntimeError(
                 "gcloud CLI not installed or not authenticated. "
                 "Install: https://cloud.google.com/sdk/docs/install"
+            ) from e
+
+    def _rest_session(self) -> Any:
+        """Return the shared authorized HTTP session, or None if unavailable."""
+        if not self.use_rest:
+            return None
+
+        with self._session_lock:
+            if self._session is None:
+                try:
+                    from google.auth.transport.requests import AuthorizedSession
+                    from google.oauth2.credentials import Credentials
+
+                    # gcloud's own account, not application-default credentials:
+                    # those often belong to another principal, and answers must
+                    # match what the gcloud CLI fallback would report
+                    credentials = Credentials(self._active_account_token())
+                except (
+                    ImportError,
+                    OSError,
+                    RuntimeError,
+                    subprocess.CalledProcessError,
+                ) as e:
+                    logger.debug(f"REST fast path unavailable, using gcloud: {e}")
+                    self.use_rest = False
+                    return None
+                # One keep-alive session for all calls; once the token expires
+                # requests fail and fall back to gcloud
+                self._session = AuthorizedSession(credentials)
+            return self._session
+
+    def _active_account_token(self) -> str:
+        """Return an access token for the account gcloud is logged in with."""
+        result = subprocess.run(
+            ["gcloud", "auth", "print-access-token"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        token = result.stdout.strip()
+        if not token:
+            raise RuntimeError("gcloud returned no access token")
+        return token
+
+    def close(self) -> None:
+        """Release the REST session, if one was opened."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _rest_get(self, url: str, params: Optional[Dict[str, str]] = None) -> Any:
+        """GET a Google API resource; returns None to fall back to gcloud."""
+        session = self._rest_session()
+        if session is None:
+            return None
+        # Importable: the session exists only if google-auth is installed
+        from google.auth.exceptions import GoogleAuthError
+
+        try:
+            response = session.get(url, params=params, timeout=REST_TIMEOUT)
+            response.raise_for_status()
+            return response.json()
+        except (OSError, ValueError, GoogleAuthError) as e:
+            logger.debug(f"REST request failed ({url}), using gcloud: {e}")
+            return None
+
+    def _rest_list_projects(self) -> Optional[List[Dict[str, Any]]]:
+        """List projects via Resource Manager, shaped like gcloud output.
+
+        Like ``gcloud projects list``, only ACTIVE projects are returned (the
+        API also lists those pending deletion).
+        """
+        projects: List[Dict[str, Any]] = []
+        params: Dict[str, str] = {}
+        while True:
+            page = self._rest_get(f"{RESOURCE_MANAGER_URL}/projects", params)
+            if page is None:
+                return None
+            projects.extend(
+                project
+                for project in page.get("projects", [])
+                if project.get("lifecycleState") == "ACTIVE"
             )
+            token = page.get("nextPageToken")
+            if not token:
+                return projects
+            params = {"pageToken": token}
+
+    def _rest_enabled_services(
+        self, project_id: str, api_name: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Look up one service via Service Usage, shaped like gcloud output."""
+        data = self._rest_get(
+            f"{SERVICE_USAGE_URL}/projects/{project_id}/services/{api_name}"
+        )
+        if data is None:
+            return None
+        return [data] if data.get("state") == "ENABLED" else []
+
+    def _run_gcloud_command(
+        self,
+        args: List[str],
+        cache_ttl: float = 0,
+        rest: Optional[Callable[[], Any]] = None,
+        stream: bool = False,
+    ) -> Any:
+        """Run gcloud command and return JSON output.
 
-    def _run_gcloud_command(self, args: List[str]) -> Any:
-        """Run gcloud command and return JSON output."""
+        Args:
+            args: gcloud arguments (without ``--format``).
+            cache_ttl: Seconds to reuse the parsed output; 0 disables caching.
+            rest: Optional REST fast path returning the same JSON shape, or
+                None to fall back to the gcloud CLI.
+            stream: Parse a JSON list output element by element while gcloud
+                is still writing it (for potentially large listings).
+        """
+        cache_key = " ".join(args)
+        if cache_ttl:
+            hit, value = self._cache_get(cache_key)
+            if hit:
+                logger.debug(f"gcloud cache hit: {cache_key}")
+                return value
+
+        data = rest() if rest is not None and self.use_rest else None
+        if data is None:
+            if stream:
+                data = list(self._stream_gcloud_items(args))
+            else:
+                data = self._run_gcloud_cli(args)
+
+        if cache_ttl:
+            self._cache_set(cache_key, data, cache_ttl)
+        return data
+
+    def _run_gcloud_cli(self, args: List[str]) -> Any:
+        """Invoke the gcloud CLI and parse its JSON output."""
         cmd = ["gcloud"] + args + ["--format=json"]
         logger.debug(f"Running: {' '.join(cmd)}")
 
@@ -68,35 +360,76 @@ class GCloudManager:
                 text=True,
                 check=True,
             )
-            return json.loads(result.stdout) if result.stdout else {}
+            return fastjson.loads(result.stdout) if result.stdout else {}
         except subprocess.CalledProcessError as e:
             logger.error(f"gcloud command failed: {e.stderr}")
-            raise RuntimeError(f"gcloud command failed: {e.stderr}")
-        except json.JSONDecodeError as e:
+            raise RuntimeError(f"gcloud command failed: {e.stderr}") from e
+        except fastjson.JSONDecodeError as e:
             logger.error(f"Failed to parse gcloud output: {e}")
-            raise RuntimeError(f"Failed to parse gcloud output: {e}")
+            raise RuntimeError(f"Failed to parse gcloud output: {e}") from e
+
+    def _stream_gcloud_items(self, args: List[str]) -> Iterator[Any]:
+        """Yield the elements of a gcloud JSON list as they are printed."""
+        cmd = ["gcloud"] + args + ["--format=json"]
+        logger.debug(f"Streaming: {' '.join(cmd)}")
+
+        # stderr goes to a file so a chatty gcloud can never fill the pipe
+        # while we are still reading stdout.
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                bufsize=STREAM_CHUNK_SIZE,
+            )
+            assert proc.stdout is not None
+            try:
+                chunks = iter(lambda: proc.stdout.read(STREAM_CHUNK_SIZE), "")
+                items = _iter_json_array(chunks)
+                try:
+                    yield from items
+                except ValueError as e:
+                    # Drain what gcloud still writes, or it blocks on a full
+                    # pipe and never exits
+                    for _ in chunks:
+                        pass
+                    if proc.wait() == 0:
+                        logger.error(f"Failed to parse gcloud output: {e}")
+                        raise RuntimeError(f"Failed to parse gcloud output: {e}") from e
+
+                if proc.wait() != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode(errors="replace")
+                    logger.error(f"gcloud command failed: {stderr}")
+                    raise RuntimeError(f"gcloud command failed: {stderr}")
+            finally:
+                proc.stdout.close()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
 
     def list_projects(self) -> List[GCloudProject]:
         """List all Google Cloud projects."""
         logger.info("Listing Google Cloud projects...")
-        data = self._run_gcloud_command(["projects", "list"])
-
-        projects = []
-        for item in data:
-            projects.append(
-                GCloudProject(
-                    project_id=item["projectId"],
-                    name=item["name"],
-                    project_number=item["projectNumber"],
-                    lifecycle_state=item["lifecycleState"],
-                )
-            )
+        data = self._run_gcloud_command(
+            ["projects", "list"],
+            cache_ttl=PROJECT_LIST_TTL,
+            rest=self._rest_list_projects,
+            stream=True,
+        )
+
+        projects = [GCloudProject.from_dict(item) for item in data]
 
         logger.info(f"Found {len(projects)} projects")
         return projects
 
     def get_current_project(self) -> Optional[str]:
         """Get currently active project."""
+        cached = self._current_project
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+
         try:
             result = subprocess.run(
                 ["gcloud", "config", "get-value", "project"],
@@ -106,7 +439,10 @@ class GCloudManager:
             )
             project_id = result.stdout.strip()
             logger.info(f"Current project: {project_id}")
-            return project_id if project_id else None
+            if not project_id:
+                return None
+            self._current_project = (time.time() + PROJECT_TTL, project_id)
+            return project_id
         except subprocess.CalledProcessError:
             logger.warning("No active project set")
             return None
@@ -130,7 +466,8 @@ class GCloudManager:
                     "generativelanguage.googleapis.com/generate_content_requests",
                     f"--project={project_id}",
                     "--consumer=projects/" + project_id,
-                ]
+                ],
+                cache_ttl=QUOTA_TTL,
             )
 
             # Parse quota data
@@ -178,7 +515,9 @@ class GCloudManager:
                     f"--project={project_id}",
                     "--enabled",
                     f"--filter=name:{api_name}",
-                ]
+                ],
+                cache_ttl=API_ENABLED_TTL,
+                rest=lambda: self._rest_enabled_services(project_id, api_name),
             )
 
             return len(data) > 0
@@ -208,19 +547,13 @@ class GCloudManager:
 
         # Auto-generate project ID if not provided
         if not project_id:
-            import random
-            import string
-
-            random_suffix = "".join(
-                random.choices(string.ascii_lowercase + string.digits, k=6)
-            )
-            project_id = f"sos-agent-{random_suffix}"
+            project_id = f"sos-agent-{secrets.token_hex(3)}"
 
         logger.info(f"Creating new project: {project_id}")
 
         try:
             # Create project
-            self._run_gcloud_command(
+            created = self._run_gcloud_command(
                 [
                     "projects",
                     "create",
@@ -238,18 +571,28 @@ class GCloudManager:
             )
 
             logger.info(f"Project {project_id} created and set as active")
-
-            # Get project details
-            projects = self.list_projects()
-            for project in projects:
-                if project.project_id == project_id:
-                    return project
-
-            raise RuntimeError(f"Project {project_id} created but not found in list")
+            self.invalidate_cache("projects list")
+            self._current_project = None
+
+            # The create output normally carries the project (possibly wrapped
+            # in the finished operation); describe it only if fields are missing
+            if isinstance(created, dict):
+                created = created.get("response", created)
+            try:
+                return GCloudProject.from_dict(created)
+            except (KeyError, TypeError):
+                pass
+
+            try:
+                return GCloudProject.from_dict(self.get_project_info(project_id))
+            except (KeyError, TypeError) as e:
+                raise RuntimeError(
+                    f"Project {project_id} created but its details are unavailable"
+                ) from e
 
         except Exception as e:
             logger.error(f"Failed to create project: {e}")
-            raise RuntimeError(f"Failed to create project: {e}")
+            raise RuntimeError(f"Failed to create project: {e}") from e
 
     def enable_api(
         self, project_id: str, api_name: str = "generativelanguage.googleapis.com"
@@ -265,10 +608,11 @@ class GCloudManager:
                 check=True,
             )
             logger.info(f"{api_name} enabled successfully")
+            self.invalidate_cache(f"services list --project={project_id}")
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to enable API: {e.stderr}")
-            raise RuntimeError(f"Failed to enable API: {e.stderr}")
+            raise RuntimeError(f"Failed to enable API: {e.stderr}") from e
 
     def create_api_key(self, project_id: str) -> str:
         """Create a new API key for Gemini.
@@ -289,4 +633,9 @@ class GCloudManager:
     def get_project_info(self, project_id: str) -> Dict[str, Any]:
         """Get detailed project information."""
         logger.info(f"Getting info for project: {project_id}")
-        return self._run_gcloud_command(["projects", "describe", project_id])
+        return self._run_gcloud_command(
+            ["projects", "describe", project_id],
+            rest=lambda: self._rest_get(
+                f"{RESOURCE_MANAGER_URL}/projects/{project_id}"
+            ),
+        )
@@ -1,13 +1,33 @@
 """Session persistence layer for SOS Agent."""
 
-import json
+import asyncio
+import fcntl
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils import fastjson
 
 logger = logging.getLogger(__name__)
 
+# Journal entries after which a background compaction is scheduled.
+COMPACT_EVERY = 200
+
+# Chat messages kept per session; older ones are dropped.
+MAX_HISTORY = 1000
+
+# Serializes journal appends against compaction, which truncates the journal,
+# among the stores of this process. Other processes are kept out by an
+# flock on the journal: shared while appending, exclusive while compacting.
+_journal_lock = threading.Lock()
+
+
+def _empty_session() -> Dict[str, Any]:
+    return {"chat_history": [], "current_issue": None}
+
 
 class SessionStore(ABC):
     """Abstract base class for session storage."""
@@ -49,15 +69,45 @@ class SessionStore(ABC):
 
 
 class FileSessionStore(SessionStore):
-    """JSON file-based session storage."""
+    """JSON file-based session storage.
 
-    def __init__(self, path: Optional[Path] = None):
+    ``session.json`` holds a snapshot; every mutation is appended as one JSON
+    line to the ``session.log`` journal next to it, so a change costs a single
+    small write. Loading replays the journal over the snapshot. ``compact()``
+    folds the journal into a fresh snapshot; it runs in the background once
+    ``COMPACT_EVERY`` entries piled up, and on ``flush()``/``aclose()``.
+    Only the newest ``max_history`` chat messages are retained.
+
+    ``generation`` changes whenever the chat history is replaced rather than
+    appended to (reload, compaction, clear, trimming), so readers may cache
+    what they derived from it while the generation stays the same.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        debounce_s: float = 0.2,
+        max_history: int = MAX_HISTORY,
+    ):
         """Initialize file session store."""
         if path is None:
             # Default to ~/.config/sos-agent/session.json
             self.path = Path.home() / ".config" / "sos-agent" / "session.json"
         else:
             self.path = path
+        self.journal_path = self.path.with_suffix(".log")
+        # Plain str paths for the syscalls below (no Path.__fspath__ per call)
+        self._path_str = os.fspath(self.path)
+        self._journal_str = os.fspath(self.journal_path)
+        self._tmp_str = self._path_str + ".tmp"
+
+        self.debounce_s = debounce_s
+        self.max_history = max_history
+        self._journal_fd: Optional[int] = None
+        self._journal_entries = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self.generation = 0
 
         self._ensure_dir()
         self._data: Dict[str, Any] = self._load()
@@ -70,38 +120,263 @@ class FileSessionStore(SessionStore):
             logger.error(f"Failed to create config directory: {e}")
 
     def _load(self) -> Dict[str, Any]:
-        """Load session data from file."""
-        if not self.path.exists():
-            return {"chat_history": [], "current_issue": None}
+        """Load the snapshot and replay the journal on top of it."""
+        # Taken before reading, so a write racing the load is seen as a change
+        self._disk_state = self._stat_files()
+        data = self._read_snapshot() or _empty_session()
+        self._journal_entries = self._replay(data)
+        self.generation += 1
+        return data
+
+    def reload(self) -> None:
+        """Re-read the session from disk, picking up other processes' changes."""
+        with _journal_lock:
+            self._data = self._load()
+
+    def reload_if_changed(self) -> bool:
+        """Reload only if the snapshot or journal changed since the last load."""
+        if self._stat_files() == self._disk_state:
+            return False
+        self.reload()
+        return True
 
+    def _stat_files(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """(mtime_ns, size) of the snapshot and the journal, None if missing."""
+        state = []
+        for path in (self._path_str, self._journal_str):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                state.append(None)
+            else:
+                state.append((st.st_mtime_ns, st.st_size))
+        return tuple(state)
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return the snapshot, ``None`` if there is none yet."""
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return fastjson.load_file(self._path_str)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Failed to load session file: {e}")
-            return {"chat_history": [], "current_issue": None}
+            return _empty_session()
+
+    def _replay(self, data: Dict[str, Any]) -> int:
+        """Apply journal entries to ``data``; return how many were applied."""
+        try:
+            with open(self._journal_str, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.error(f"Failed to read session journal: {e}")
+            return 0
+
+        applied = 0
+        for line in lines:
+            try:
+                entry = fastjson.loads(line)
+            except ValueError:
+                # A torn trailing line from an interrupted append.
+                continue
+            self._apply(data, entry)
+            applied += 1
+        return applied
+
+    def _apply(self, data: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        kind = entry.get("t")
+        if kind == "msg":
+            history = data.setdefault("chat_history", [])
+            history.append(
+                {
+                    "role": entry.get("role"),
+                    "content": entry.get("content"),
+                    "timestamp": entry.get("timestamp"),
+                }
+            )
+            if len(history) > self.max_history:
+                del history[: -self.max_history]
+                self.generation += 1
+        elif kind == "issue":
+            data["current_issue"] = entry.get("value")
+        elif kind == "diag":
+            data["last_diagnostic"] = entry.get("value")
+        elif kind == "clear":
+            data.clear()
+            data.update(_empty_session(), last_diagnostic=None)
+            self.generation += 1
+
+    def _open_journal(self) -> int:
+        fd = os.open(
+            self._journal_str,
+            os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC,
+            0o600,
+        )
+        # Terminate a torn trailing line so the next entry stays parseable.
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            os.write(fd, b"\n")
+        return fd
+
+    def _journal(self) -> int:
+        if self._journal_fd is None:
+            self._journal_fd = self._open_journal()
+        return self._journal_fd
+
+    def _append(self, entry: Dict[str, Any], blocking: bool = True) -> bool:
+        """Apply a mutation in memory and journal it (caller holds the lock).
 
-    def _save(self) -> None:
-        """Save session data to file."""
+        Returns ``False``, changing nothing, if ``blocking`` is off and
+        another process is compacting the journal.
+        """
+        payload = fastjson.dumps(entry) + b"\n"
         try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2, ensure_ascii=False)
+            fd = self._journal()
+            fcntl.flock(
+                fd, fcntl.LOCK_SH if blocking else fcntl.LOCK_SH | fcntl.LOCK_NB
+            )
+        except BlockingIOError:
+            return False
+        except Exception as e:
+            logger.error(f"Failed to append to session journal: {e}")
+            self._apply(self._data, entry)
+            return True
+        self._apply(self._data, entry)
+        try:
+            size = os.fstat(fd).st_size
+            os.write(fd, payload)
+            st = os.fstat(fd)
+        except Exception as e:
+            logger.error(f"Failed to append to session journal: {e}")
+            return True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._journal_entries += 1
+        # Our own append is not a change from another process; only the
+        # exact growth by this entry keeps the last load current.
+        snapshot, journal = self._disk_state
+        if (journal[1] if journal else 0) == size and st.st_size == size + len(payload):
+            self._disk_state = (snapshot, (st.st_mtime_ns, st.st_size))
+        return True
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """Apply a mutation in memory and append it to the journal."""
+        with _journal_lock:
+            self._append(entry)
+        if self._journal_entries >= COMPACT_EVERY:
+            self._schedule_compaction()
+
+    async def _arecord(self, entry: Dict[str, Any]) -> None:
+        """``_record`` for coroutines: never blocks the loop on a compaction.
+
+        The append itself is one small write and runs inline; only when a
+        compaction, in this or another process, holds the journal lock is
+        the whole record handed to a worker thread.
+        """
+        if not _journal_lock.acquire(blocking=False):
+            await asyncio.to_thread(self._record, entry)
+            return
+        try:
+            appended = self._append(entry, blocking=False)
+        finally:
+            _journal_lock.release()
+        if not appended:
+            await asyncio.to_thread(self._record, entry)
+            return
+        if self._journal_entries >= COMPACT_EVERY:
+            self._schedule_compaction()
+
+    def _serialize(self, data: Dict[str, Any]) -> bytes:
+        return fastjson.dumps(data, indent=True)
+
+    def _write(self, payload: bytes) -> None:
+        """Atomically replace the snapshot with ``payload``."""
+        with open(self._tmp_str, "wb") as f:
+            f.write(payload)
+        os.replace(self._tmp_str, self._path_str)
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot and truncate the journal.
+
+        State is rebuilt from disk so entries appended by other stores
+        sharing the same files are kept. Appends, also from other processes,
+        wait until the journal is truncated.
+        """
+        with _journal_lock:
+            try:
+                fd = self._journal()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except Exception as e:
+                logger.error(f"Failed to lock session journal: {e}")
+                return
+            try:
+                self._compact_locked(fd)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _compact_locked(self, fd: int) -> None:
+        data = self._read_snapshot()
+        has_snapshot = data is not None
+        if data is None:
+            data = _empty_session()
+        if not self._replay(data) and has_snapshot:
+            return
+        try:
+            self._write(self._serialize(data))
+            os.ftruncate(fd, 0)
         except Exception as e:
             logger.error(f"Failed to save session file: {e}")
+            return
+        self._data = data
+        self._journal_entries = 0
+        self._disk_state = self._stat_files()
+        self.generation += 1
+
+    def _schedule_compaction(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.compact()
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._compact_later())
+
+    async def _compact_later(self) -> None:
+        await asyncio.sleep(self.debounce_s)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Compact the journal into the snapshot now."""
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        async with self._write_lock:
+            if not self._journal_entries:
+                return
+            await asyncio.to_thread(self.compact)
+
+    async def aclose(self) -> None:
+        """Compact, stop the background task and close the journal."""
+        await self.flush()
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
 
     async def save_chat_message(self, role: str, content: str) -> None:
         """Save a chat message to history."""
-        if "chat_history" not in self._data:
-            self._data["chat_history"] = []
-
-        self._data["chat_history"].append(
+        await self._arecord(
             {
+                "t": "msg",
                 "role": role,
                 "content": content,
                 "timestamp": "TODO: timestamp",  # Optional, purely for potential future use
             }
         )
-        self._save()
 
     async def get_chat_history(self) -> List[Dict[str, str]]:
         """Retrieve chat history."""
@@ -109,8 +384,7 @@ class FileSessionStore(SessionStore):
 
     async def save_issue(self, issue: str) -> None:
         """Save the current diagnostic issue description."""
-        self._data["current_issue"] = issue
-        self._save()
+        await self._arecord({"t": "issue", "value": issue})
 
     async def get_issue(self) -> Optional[str]:
         """Retrieve the current diagnostic issue."""
@@ -118,8 +392,7 @@ class FileSessionStore(SessionStore):
 
     async def save_diagnostic_result(self, result: Dict[str, Any]) -> None:
         """Save a diagnostic result."""
-        self._data["last_diagnostic"] = result
-        self._save()
+        await self._arecord({"t": "diag", "value": result})
 
     async def get_last_diagnostic_result(self) -> Optional[Dict[str, Any]]:
         """Retrieve the last diagnostic result."""
@@ -127,9 +400,4 @@ class FileSessionStore(SessionStore):
 
     async def clear_session(self) -> None:
         """Clear all session data."""
-        self._data = {
-            "chat_history": [],
-            "current_issue": None,
-            "last_diagnostic": None,
-        }
-        self._save()
+        await self._arecord({"t": "clear"})
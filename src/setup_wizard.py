@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """SOS Agent Setup Wizard - Interactive API key configuration."""
 
+import os
+import stat
 import sys
 from pathlib import Path
+from typing import Dict, Optional
 
-
-def print_banner():
-    """Print SOS Agent banner."""
-    banner = """
+_BANNER = """
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
 ║     🆘  SOS AGENT - System Rescue & Optimization  🆘      ║
@@ -16,11 +16,60 @@ def print_banner():
 ║                                                           ║
 ╚═══════════════════════════════════════════════════════════╝
 """
-    print(banner)
+
+# Separator lines, built once
+_RULE = "=" * 60
+_THIN_RULE = "─" * 60
+
+# Characters that occur in provider API keys (URL-safe base64 alphabet).
+_KEY_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+)
+
+
+def _valid_generic_key(key: str) -> bool:
+    return len(key) >= 10 and _KEY_CHARS.issuperset(key)
+
+
+def _valid_gemini_key(key: str) -> bool:
+    # Google API keys: "AIza" followed by 35 characters
+    return len(key) == 39 and key.startswith("AIza") and _KEY_CHARS.issuperset(key)
+
+
+def _valid_openai_key(key: str) -> bool:
+    # "sk-..." / "sk-proj-..." secret keys
+    return len(key) >= 20 and key.startswith("sk-") and _KEY_CHARS.issuperset(key)
+
+
+# Format checks per environment variable; others use _valid_generic_key.
+KEY_VALIDATORS = {
+    "GEMINI_API_KEY": _valid_gemini_key,
+    "OPENAI_API_KEY": _valid_openai_key,
+}
+
+
+def is_valid_api_key(env_var: str, key: str) -> bool:
+    """Return True if ``key`` looks like an API key for ``env_var``."""
+    return KEY_VALIDATORS.get(env_var, _valid_generic_key)(key)
+
+
+def print_banner():
+    """Print SOS Agent banner."""
+    print(_BANNER)
+
+
+def _print_header(title: str) -> None:
+    """Print a section title between two rules."""
+    print(f"\n{_RULE}\n{title}\n{_RULE}")
 
 
 def get_api_key(
-    service_name: str, env_var: str, url: str, optional: bool = False
+    service_name: str,
+    env_var: str,
+    url: str,
+    optional: bool = False,
+    existing: Optional[Dict[str, str]] = None,
+    interactive: bool = True,
 ) -> str:
     """
     Prompt user for API key.
@@ -30,13 +79,25 @@ def get_api_key(
         env_var: Environment variable name
         url: URL to get API key
         optional: Whether this key is optional
+        existing: Already configured values; a usable key there is reused
+            without prompting
+        interactive: If False, never prompt; a missing required key is an
+            error
 
     Returns:
         API key or empty string
     """
-    print(f"\n{'─' * 60}")
-    print(f"📌 {service_name} API Key")
-    print(f"{'─' * 60}")
+    known = (existing or {}).get(env_var, "")
+    if known and is_valid_api_key(env_var, known):
+        print(f"✅ Using configured {service_name} API key ({env_var})")
+        return known
+
+    if not interactive:
+        if optional:
+            return ""
+        raise RuntimeError(f"{env_var} is required in non-interactive mode")
+
+    print(f"\n{_THIN_RULE}\n📌 {service_name} API Key\n{_THIN_RULE}")
 
     if optional:
         print("⚠️  This API key is OPTIONAL.")
@@ -55,16 +116,112 @@ def get_api_key(
                 print(f"❌ {service_name} API key is required!")
                 continue
 
-        # Basic validation
-        if len(key) < 10:
-            print("❌ API key seems too short. Please check and try again.")
+        # Cheap format check (prefix, length, charset)
+        if not is_valid_api_key(env_var, key):
+            print(
+                f"❌ This does not look like a {service_name} API key. "
+                "Please check and try again."
+            )
             continue
 
         return key
 
 
-def setup_wizard():
-    """Run interactive setup wizard."""
+def read_env_file(env_path: Path) -> Dict[str, str]:
+    """
+    Parse ``KEY=value`` lines of a .env file.
+
+    Args:
+        env_path: Path to the .env file
+
+    Returns:
+        Mapping of keys to values (empty if the file does not exist)
+    """
+    try:
+        text = env_path.read_text()
+    except FileNotFoundError:
+        return {}
+
+    values = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if sep and key and not key.startswith("#"):
+            values[key] = value.strip()
+    return values
+
+
+def write_env_file(env_path: Path, values: Dict[str, str]) -> None:
+    """
+    Set ``values`` in a .env file, keeping all other lines as they are.
+
+    Existing keys are updated in place and new keys are appended. The file
+    is written to a temporary sibling and renamed over the original, so an
+    interrupted run never leaves a truncated .env behind. A symlinked .env
+    is updated at its target, and the file keeps its mode (0600 if new).
+
+    Args:
+        env_path: Path to the .env file (created if missing)
+        values: Environment variables to set
+    """
+    # Replace the link's target, not the link
+    env_path = env_path.resolve()
+    try:
+        existing_lines = env_path.read_text().splitlines(keepends=True)
+        mode = stat.S_IMODE(env_path.stat().st_mode)
+    except FileNotFoundError:
+        existing_lines = []
+        # Holds API keys: readable by the owner only
+        mode = 0o600
+
+    updated_lines = []
+    pending = dict(values)
+    for line in existing_lines:
+        key, sep, _ = line.partition("=")
+        key = key.strip()
+        if sep and key in values:
+            updated_lines.append(f"{key}={values[key]}\n")
+            pending.pop(key, None)
+        else:
+            updated_lines.append(line)
+
+    if updated_lines and not updated_lines[-1].endswith("\n"):
+        updated_lines[-1] += "\n"
+    updated_lines.extend(f"{key}={value}\n" for key, value in pending.items())
+
+    tmp_path = env_path.with_name(env_path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with open(fd, "w") as f:
+        # Exact mode: os.open() applies the umask, and a stale tmp keeps its own
+        os.fchmod(fd, mode)
+        f.write("".join(updated_lines))
+    os.replace(tmp_path, env_path)
+
+
+def setup_wizard(non_interactive: bool = False):
+    """
+    Run interactive setup wizard.
+
+    Keys already set in ``.env`` or the environment are reused instead of
+    prompted for.
+
+    Args:
+        non_interactive: Never prompt; fail if a required key is missing
+    """
+    env_path = Path.cwd() / ".env"
+    # .env wins over the environment: it is what gets written back
+    existing = {
+        env_var: os.environ[env_var]
+        for env_var in (
+            "SOS_AI_LANGUAGE",
+            "GEMINI_API_KEY",
+            "OPENAI_API_KEY",
+            "INCEPTION_API_KEY",
+        )
+        if env_var in os.environ
+    }
+    existing.update(read_env_file(env_path))
+
     print_banner()
 
     print("\n👋 Welcome to SOS Agent Setup!")
@@ -79,21 +236,22 @@ def setup_wizard():
     print("  🟡 Claude (via AgentAPI) - OAuth, no key needed (has auth issues)")
     print()
 
-    proceed = input("Ready to start? (y/n): ").strip().lower()
-    if proceed != "y":
+    proceed = "y" if non_interactive else input("Ready to start? (y/n): ")
+    if proceed.strip().lower() != "y":
         print("\n👋 Setup cancelled. Run 'sos setup' when ready!")
         sys.exit(0)
 
     # Language selection
-    print("\n" + "=" * 60)
-    print("  🌍 Language Selection / Výběr Jazyka")
-    print("=" * 60)
+    _print_header("  🌍 Language Selection / Výběr Jazyka")
     print("Choose AI response language / Vyberte jazyk odpovědí AI:")
     print("  1️⃣  English (default)")
     print("  2️⃣  Čeština (Czech)")
     print()
 
-    language_choice = input("Enter choice (1 or 2) [1]: ").strip() or "1"
+    if non_interactive:
+        language_choice = "2" if existing.get("SOS_AI_LANGUAGE") == "cs" else "1"
+    else:
+        language_choice = input("Enter choice (1 or 2) [1]: ").strip() or "1"
 
     if language_choice == "2":
         ai_language = "cs"
@@ -108,15 +266,15 @@ def setup_wizard():
     api_keys = {"SOS_AI_LANGUAGE": ai_language}
 
     # Gemini (recommended)
-    print("\n" + "=" * 60)
-    print("  RECOMMENDED: Gemini API")
-    print("=" * 60)
+    _print_header("  RECOMMENDED: Gemini API")
     print("🌟 Gemini is fast, reliable, and has a generous free tier.")
     gemini_key = get_api_key(
         "Gemini",
         "GEMINI_API_KEY",
         "https://aistudio.google.com/app/apikey",
         optional=False,
+        existing=existing,
+        interactive=not non_interactive,
     )
     if gemini_key:
         api_keys["GEMINI_API_KEY"] = gemini_key
@@ -127,6 +285,8 @@ def setup_wizard():
         "OPENAI_API_KEY",
         "https://platform.openai.com/api-keys",
         optional=True,
+        existing=existing,
+        interactive=not non_interactive,
     )
     if openai_key:
         api_keys["OPENAI_API_KEY"] = openai_key
@@ -137,54 +297,21 @@ def setup_wizard():
         "INCEPTION_API_KEY",
         "https://inceptionlabs.ai",
         optional=True,
+        existing=existing,
+        interactive=not non_interactive,
     )
     if inception_key:
         api_keys["INCEPTION_API_KEY"] = inception_key
 
     # Save to .env
-    print("\n" + "=" * 60)
-    print("  💾 Saving Configuration")
-    print("=" * 60)
-
-    env_path = Path.cwd() / ".env"
-
-    # Read existing .env or create new one
-    existing_lines = []
-    if env_path.exists():
-        with open(env_path, "r") as f:
-            existing_lines = f.readlines()
-
-    # Update or add API keys
-    updated_lines = []
-    keys_updated = set()
-
-    for line in existing_lines:
-        key_found = False
-        for env_var, value in api_keys.items():
-            if line.strip().startswith(f"{env_var}="):
-                updated_lines.append(f"{env_var}={value}\n")
-                keys_updated.add(env_var)
-                key_found = True
-                break
-
-        if not key_found:
-            updated_lines.append(line)
-
-    # Add new keys that weren't in existing file
-    for env_var, value in api_keys.items():
-        if env_var not in keys_updated:
-            updated_lines.append(f"{env_var}={value}\n")
+    _print_header("  💾 Saving Configuration")
 
-    # Write back
-    with open(env_path, "w") as f:
-        f.writelines(updated_lines)
+    write_env_file(env_path, api_keys)
 
     print(f"✅ Configuration saved to: {env_path}")
 
     # Summary
-    print("\n" + "=" * 60)
-    print("  🎉 Setup Complete!")
-    print("=" * 60)
+    _print_header("  🎉 Setup Complete!")
     print()
     print("Configured providers:")
     for key in api_keys.keys():
@@ -203,7 +330,7 @@ def setup_wizard():
 
 if __name__ == "__main__":
     try:
-        setup_wizard()
+        setup_wizard(non_interactive="--non-interactive" in sys.argv[1:])
     except KeyboardInterrupt:
         print("\n\n❌ Setup cancelled by user.")
         sys.exit(1)
@@ -1,9 +1,19 @@
 """Custom system tools for SOS Agent."""
 
+from typing import Any
+
 from .log_analyzer import analyze_system_logs
-from .mcp_server import create_sos_mcp_server
 
 __all__ = [
     "analyze_system_logs",
     "create_sos_mcp_server",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The MCP server pulls in claude_agent_sdk; import it only when asked for.
+    if name == "create_sos_mcp_server":
+        from .mcp_server import create_sos_mcp_server
+
+        return create_sos_mcp_server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
+import functools
 from typing import List, Dict, Type
 from .base import Fixer
 from .network import DNSFixer
@@ -5,17 +6,21 @@ from .services import ServicesFixer
 from .disk import DiskCleanupFixer
 
 FIXERS: Dict[str, Type[Fixer]] = {
-    DNSFixer().id: DNSFixer,
-    ServicesFixer().id: ServicesFixer,
-    DiskCleanupFixer().id: DiskCleanupFixer,
+    cls.id: cls for cls in (DNSFixer, ServicesFixer, DiskCleanupFixer)
 }
 
 
+@functools.cache
+def _instances() -> Dict[str, Fixer]:
+    # Fixers are stateless, so one instance of each is shared.
+    return {fixer_id: cls() for fixer_id, cls in FIXERS.items()}
+
+
 def get_fixer(fixer_id: str) -> Fixer:
     if fixer_id in FIXERS:
-        return FIXERS[fixer_id]()
+        return _instances()[fixer_id]
     raise ValueError(f"Unknown fixer: {fixer_id}")
 
 
 def get_all_fixers() -> List[Fixer]:
-    return [cls() for cls in FIXERS.values()]
+    return list(_instances().values())
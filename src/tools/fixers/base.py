@@ -1,32 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import ClassVar, List, Tuple
 
 
 class Fixer(ABC):
     """Abstract base class for system fixers."""
 
-    @property
-    @abstractmethod
-    def id(self) -> str:
-        """Unique identifier for the fixer."""
-        pass
+    # Stateless: no per-instance __dict__ (subclasses declare __slots__ too)
+    __slots__ = ()
 
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Human-readable name of the fixer."""
-        pass
+    # Identity is class-level so the registry never has to instantiate.
+    id: ClassVar[str]
+    """Unique identifier for the fixer."""
 
-    @property
-    @abstractmethod
-    def category(self) -> str:
-        """Category (network, services, system, etc.)."""
-        pass
+    name: ClassVar[str]
+    """Human-readable name of the fixer."""
+
+    category: ClassVar[str]
+    """Category (network, services, system, etc.)."""
 
-    @property
-    def requires_root(self) -> bool:
-        """Whether this fixer requires root privileges."""
-        return True
+    requires_root: ClassVar[bool] = True
+    """Whether this fixer requires root privileges."""
 
     @abstractmethod
     async def check(self) -> Tuple[bool, str]:
@@ -1,34 +1,76 @@
 import asyncio
+import os
 from typing import Tuple, List
 from .base import Fixer
 from src.agent.privilege import is_root
 
+APT_ARCHIVES = "/var/cache/apt/archives"
+
+# Stop summing once the cache is this big; enough to say cleanup pays off.
+SIZE_CHECK_CAP = 50 * 1024 * 1024
+
+
+def _cache_size(path: str, cap: int = SIZE_CHECK_CAP) -> Tuple[int, bool]:
+    """Sum file sizes under ``path``; return (bytes, stopped_at_cap)."""
+    total = 0
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except FileNotFoundError:
+            if current == path:
+                raise
+            continue
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                if total > cap:
+                    return total, True
+    return total, False
 
-class DiskCleanupFixer(Fixer):
-    @property
-    def id(self) -> str:
-        return "disk_cleanup"
 
-    @property
-    def name(self) -> str:
-        return "Disk Cleanup (Apt Cache / Tmp)"
+def _format_size(size: float) -> str:
+    """Human-readable size in the style of ``du -h``."""
+    if size < 1024:
+        return f"{size:.0f}B"
+    for unit in ("K", "M", "G"):
+        size /= 1024
+        if size < 1024 or unit == "G":
+            break
+    return f"{size:.1f}{unit}"
 
-    @property
-    def category(self) -> str:
-        return "system"
+
+class DiskCleanupFixer(Fixer):
+    __slots__ = ()
+
+    id = "disk_cleanup"
+    name = "Disk Cleanup (Apt Cache / Tmp)"
+    category = "system"
 
     async def check(self) -> Tuple[bool, str]:
         # Simple check for disk space or cache existence
-        # Check /var/cache/apt/archives size
-        cmd = "du -sh /var/cache/apt/archives | cut -f1"
-        proc = await asyncio.create_subprocess_shell(
-            cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        size = stdout.decode().strip()
+        # Check /var/cache/apt/archives size (in-process, no du subprocess)
+        try:
+            size, capped = await asyncio.to_thread(_cache_size, APT_ARCHIVES)
+        except FileNotFoundError:
+            return False, "No apt cache found"
 
-        # Heuristic: if size is not 0 or empty, we can clean
-        return True, f"Apt cache size: {size} (Cleanup available)"
+        if not size:
+            return False, "Apt cache is empty"
+        shown = _format_size(size)
+        return (
+            True,
+            f"Apt cache size: {'>' if capped else ''}{shown} (Cleanup available)",
+        )
 
     async def apply(self, dry_run: bool = False) -> List[str]:
         actions = []
@@ -41,11 +83,11 @@ class DiskCleanupFixer(Fixer):
             raise PermissionError("Root privileges required for cleanup")
 
         try:
-            proc = await asyncio.create_subprocess_shell("apt-get clean")
+            proc = await asyncio.create_subprocess_exec("apt-get", "clean")
             await proc.communicate()
             actions.append("Executed apt-get clean")
 
-            proc2 = await asyncio.create_subprocess_shell("apt-get autoremove -y")
+            proc2 = await asyncio.create_subprocess_exec("apt-get", "autoremove", "-y")
             await proc2.communicate()
             actions.append("Executed apt-get autoremove")
         except Exception as e:
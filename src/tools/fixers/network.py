@@ -1,44 +1,41 @@
 import asyncio
 import logging
+import shutil
+import socket
+from pathlib import Path
 from typing import Tuple, List
 from .base import Fixer
 from src.agent.privilege import is_root
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the resolver before reporting DNS as broken.
+DNS_CHECK_TIMEOUT = 2.0
+
 
 class DNSFixer(Fixer):
     """Fixer to reset DNS settings."""
 
-    @property
-    def id(self) -> str:
-        return "dns_reset"
-
-    @property
-    def name(self) -> str:
-        return "Reset DNS Configuration to Public DNS"
+    __slots__ = ()
 
-    @property
-    def category(self) -> str:
-        return "network"
+    id = "dns_reset"
+    name = "Reset DNS Configuration to Public DNS"
+    category = "network"
 
     async def check(self) -> Tuple[bool, str]:
-        """Check connectivity."""
+        """Check that names resolve."""
+        # Resolve in-process: no ping fork, no ICMP privileges, and it tests
+        # exactly what this fixer repairs
         try:
-            # Try to resolve google.com
-            # Note: In a real environment we might use socket.gethostbyname
-            # But here we simulate a check.
-            proc = await asyncio.create_subprocess_shell(
-                "ping -c 1 google.com",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo("google.com", None),
+                timeout=DNS_CHECK_TIMEOUT,
             )
-            await proc.communicate()
-            if proc.returncode != 0:
-                return True, "Cannot reach google.com (DNS or Connectivity issue)"
-            return False, "Connectivity appears normal"
+        except (socket.gaierror, asyncio.TimeoutError):
+            return True, "Cannot resolve google.com (DNS issue)"
         except Exception:
             return True, "Failed to execute connectivity check"
+        return False, "Connectivity appears normal"
 
     async def apply(self, dry_run: bool = False) -> List[str]:
         actions = []
@@ -56,23 +53,20 @@ class DNSFixer(Fixer):
 
         try:
             # Backup
-            await asyncio.create_subprocess_shell(
-                "cp /etc/resolv.conf /etc/resolv.conf.bak"
-            )
+            shutil.copyfile("/etc/resolv.conf", "/etc/resolv.conf.bak")
             actions.append("Backed up /etc/resolv.conf")
 
             # Write new DNS (using tee to write as root if we were using sudo wrapper, but we check is_root)
             content = "nameserver 8.8.8.8\nnameserver 1.1.1.1\n"
             # async write to file? simpler to use shell for permission reasons if managed
-            # But since we are root:
-            with open("/etc/resolv.conf", "w") as f:
-                f.write(content)
+            # But since we are root (writes through a resolv.conf symlink):
+            Path("/etc/resolv.conf").write_text(content)
             actions.append("Updated /etc/resolv.conf")
 
             # Restart NetworkManager
             # We should check if it exists first? assuming systemd
-            proc = await asyncio.create_subprocess_shell(
-                "systemctl restart NetworkManager"
+            proc = await asyncio.create_subprocess_exec(
+                "systemctl", "restart", "NetworkManager"
             )
             await proc.communicate()
             if proc.returncode == 0:
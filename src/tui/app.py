@@ -1,8 +1,10 @@
 import asyncio
 from textual.app import App
+from textual.reactive import var
 from src.tui.screens.menu import MainMenu
 from src.agent.config import SOSConfig, load_config
 from src.agent.client import SOSAgentClient
+from src.session.store import FileSessionStore
 
 
 class SOSApp(App):
@@ -11,19 +13,44 @@ class SOSApp(App):
     CSS_PATH = "styles.css"
     TITLE = "SOS Agent"
 
+    # Replacing the client updates client_type, which screens watch; a
+    # failover switches the provider in place, see sync_client_type()
+    client: var[SOSAgentClient | None] = var(None)
+    client_type: var[str | None] = var(None)
+
     def __init__(self, init_client: bool = True, **kwargs):
         super().__init__(**kwargs)
         self._init_client = init_client
-        self.client: SOSAgentClient | None = None
         self.config: SOSConfig | None = None
+        self.session_store: FileSessionStore | None = None
+        # (store generation, messages rendered, markup) of the chat history.
+        # Between generations history only grows, so re-entering the chat
+        # renders just the new messages.
+        self.chat_history_cache: tuple[int, int, str] = (-1, 0, "")
+
+    def watch_client(self, client: SOSAgentClient | None) -> None:
+        self.sync_client_type()
+
+    def sync_client_type(self) -> None:
+        """Pick up a provider the client switched to on its own (failover).
+
+        Call after each ``execute_rescue_task`` stream.
+        """
+        self.client_type = getattr(self.client, "client_type", None)
 
     async def on_mount(self) -> None:
+        # Shared by screens that only read the session
+        self.session_store = FileSessionStore()
         self.config = await load_config(None)
         if self._init_client:
             assert self.config is not None
             self.client = SOSAgentClient(self.config)
         self.push_screen(MainMenu())
 
+    async def on_unmount(self) -> None:
+        if self.session_store is not None:
+            await self.session_store.aclose()
+
 
 async def start_tui_async() -> None:
     """Entry point for the TUI (async-safe for asyncclick)."""
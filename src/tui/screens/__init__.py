@@ -1,10 +1,26 @@
-from .chat import ChatScreen as ChatScreen
-from .diagnostics import DiagnosticsScreen as DiagnosticsScreen
-from .fix import FixScreen as FixScreen
-from .logs import LogsScreen as LogsScreen
-from .menu import MainMenu as MainMenu
-from .monitor import MonitorScreen as MonitorScreen
-from .setup import SetupScreen as SetupScreen
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chat import ChatScreen as ChatScreen
+    from .diagnostics import DiagnosticsScreen as DiagnosticsScreen
+    from .fix import FixScreen as FixScreen
+    from .logs import LogsScreen as LogsScreen
+    from .menu import MainMenu as MainMenu
+    from .monitor import MonitorScreen as MonitorScreen
+    from .setup import SetupScreen as SetupScreen
+
+# Screens are imported on first use, so showing the menu does not import
+# every screen's dependencies (psutil for the monitor, among others).
+_SCREEN_MODULES = {
+    "ChatScreen": ".chat",
+    "DiagnosticsScreen": ".diagnostics",
+    "FixScreen": ".fix",
+    "LogsScreen": ".logs",
+    "MainMenu": ".menu",
+    "MonitorScreen": ".monitor",
+    "SetupScreen": ".setup",
+}
 
 __all__ = [
     "ChatScreen",
@@ -15,3 +31,10 @@ __all__ = [
     "MonitorScreen",
     "SetupScreen",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SCREEN_MODULES:
+        module = importlib.import_module(_SCREEN_MODULES[name], __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,23 +1,39 @@
+import asyncio
+from typing import Any, cast
+
 from textual import events
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Input, RichLog, Static
 from src.session.store import FileSessionStore
 from src.agent.client import SOSAgentClient
+from src.agent.stream import iter_text_chunks
 from src.agent.config import load_config
 
 
+# Seconds between log updates while an answer streams in.
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def _history_line(msg: dict[str, Any]) -> str:
+    """Render one stored chat message as a styled log line."""
+    role = msg["role"]
+    style = "chat-message-user" if role == "user" else "chat-message-ai"
+    return f"[{style}]{role.upper()}: {msg['content']}[/{style}]"
+
+
 class ChatScreen(Screen):
     """Chat screen for interacting with the AI Agent."""
 
     CSS_PATH = "../styles.css"
     BINDINGS = [("escape", "back", "Back to Menu")]
 
+    store: FileSessionStore
+
     def __init__(
         self, name: str | None = None, id: str | None = None, classes: str | None = None
     ):
         super().__init__(name, id, classes)
-        self.store = FileSessionStore()
         # Client will be accessed from app or initialized lazily if app doesn't have it
         self.client: SOSAgentClient | None = None
         self.prompt_history: list[str] = []
@@ -25,23 +41,26 @@ class ChatScreen(Screen):
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
-        client_type = getattr(getattr(self.app, "client", None), "client_type", None)
-        suffix = f" ({client_type})" if client_type else ""
-        yield Static(f"SOS Chat Assistant{suffix}", classes="title")
+        yield Static("SOS Chat Assistant", classes="title")
         yield RichLog(id="chat-log", markup=True, wrap=True)
+        # The line of the answer still streaming in, moved to the log once done
+        yield Static(id="chat-pending")
         yield Input(placeholder="Type your message...", id="chat-input")
         yield Footer()
 
     async def on_mount(self) -> None:
         """Load history and initialize client."""
+        # Title follows the app's client type, updated only when it changes
+        self.watch(self.app, "client_type", self._show_client_type)
+        # The app-wide store, re-read only when another process changed it
+        self.store = cast(Any, self.app).session_store
+        self.store.reload_if_changed()
         # Load history
         history = await self.store.get_chat_history()
         log = self.query_one(RichLog)
-        for msg in history:
-            role = msg["role"]
-            content = msg["content"]
-            style = "chat-message-user" if role == "user" else "chat-message-ai"
-            log.write(f"[{style}]{role.upper()}: {content}[/{style}]")
+        # One write (one render pass) for the whole history, not one per message
+        if history:
+            log.write(self._history_markup(history))
 
         # Initialize client if not present in app
         if hasattr(self.app, "client") and self.app.client:
@@ -51,11 +70,21 @@ class ChatScreen(Screen):
             config = await load_config(None)
             self.client = SOSAgentClient(config)
 
-    async def on_show(self) -> None:
-        # Refresh title with current client type
-        client_type = getattr(getattr(self.app, "client", None), "client_type", None)
+    def _history_markup(self, history: list[dict[str, Any]]) -> str:
+        app = cast(Any, self.app)
+        generation, count, markup = app.chat_history_cache
+        if generation != self.store.generation or count > len(history):
+            # History was replaced (reload, clear, trim): render it from scratch
+            count, markup = 0, ""
+        new = "\n".join(_history_line(msg) for msg in history[count:])
+        if new:
+            markup = f"{markup}\n{new}" if markup else new
+        app.chat_history_cache = (self.store.generation, len(history), markup)
+        return markup
+
+    def _show_client_type(self, client_type: str | None) -> None:
         suffix = f" ({client_type})" if client_type else ""
-        self.query_one(Static).update(f"SOS Chat Assistant{suffix}")
+        self.query_one(".title", Static).update(f"SOS Chat Assistant{suffix}")
 
     def action_back(self) -> None:
         self.app.pop_screen()
@@ -92,48 +121,52 @@ class ChatScreen(Screen):
 
         full_prompt = f"{context_msg}{message}"
 
-        log.write("[chat-message-ai]AI: ...[/chat-message-ai]")
+        pending_line = self.query_one("#chat-pending", Static)
+        pending_line.update("[chat-message-ai]AI: ...[/chat-message-ai]")
 
-        # We need to handle the streaming response and update the log
-        # Since RichLog appends, we might want to buffer the AI response or just print chunks?
-        # RichLog.write appends a new line usually.
-        # Textual's RichLog doesn't support updating the last line easily unless we use a static widget we update?
-        # Better: Accumulate response and write it at the end, or write chunks.
-        # For now, let's accumulate and write at the end for simplicity, or try to stream if possible.
-        # Streaming to RichLog: log.write(chunk) works but might create many lines.
-
-        response_content = ""
         try:
             if self.client:
-                # We need to run this in a way that doesn't block the UI loop too much
-                # But execute_rescue_task is async generator.
-
                 # Note: execute_rescue_task returns a stream
-                stream = self.client.execute_rescue_task(full_prompt)
-
-                async for chunk in stream:
-                    text_chunk = ""
-                    if hasattr(chunk, "content"):
-                        for block in chunk.content:
-                            if hasattr(block, "text"):
-                                text_chunk += block.text
-                    elif isinstance(chunk, dict) and "content" in chunk:
-                        for block in chunk["content"]:
-                            if block.get("type") == "text":
-                                text_chunk += block["text"]
-                    elif isinstance(chunk, str):
-                        text_chunk = chunk
-
-                    if text_chunk:
-                        response_content += text_chunk
-                        # Optional: Streaming update logic here (complex with RichLog)
-
-                # Write full response
-                log.write(f"[chat-message-ai]AI: {response_content}[/chat-message-ai]")
-                await self.store.save_chat_message("assistant", response_content)
+                stream = iter_text_chunks(self.client.execute_rescue_task(full_prompt))
+
+                # Collect chunks in lists (no quadratic += on long answers) and
+                # render at most every STREAM_FLUSH_INTERVAL: completed lines go
+                # to the log in one write, the partial line to pending_line, so
+                # bursty output stays cheap to render.
+                parts: list[str] = []
+                pending: list[str] = []
+                prefix = "AI: "
+                loop = asyncio.get_running_loop()
+                last_flush = loop.time()
+
+                async for text_chunk in stream:
+                    parts.append(text_chunk)
+                    pending.append(text_chunk)
+
+                    now = loop.time()
+                    if now - last_flush < STREAM_FLUSH_INTERVAL:
+                        continue
+                    last_flush = now
+                    lines, newline, rest = "".join(pending).rpartition("\n")
+                    if newline:
+                        log.write(f"[chat-message-ai]{prefix}{lines}[/chat-message-ai]")
+                        prefix = ""
+                        pending = [rest] if rest else []
+                    pending_line.update(
+                        f"[chat-message-ai]{prefix}{rest}[/chat-message-ai]"
+                    )
+
+                rest = "".join(pending)
+                if rest or prefix:
+                    log.write(f"[chat-message-ai]{prefix}{rest}[/chat-message-ai]")
+                await self.store.save_chat_message("assistant", "".join(parts))
 
         except Exception as e:
             log.write(f"[bold red]Error: {e}[/bold red]")
+        finally:
+            pending_line.update("")
+            # A failover may have switched the provider mid-stream
+            cast(Any, self.app).sync_client_type()
 
     def on_key(self, event: events.Key) -> None:
         """Enable ↑/↓ prompt history when the input is focused."""
@@ -1,12 +1,23 @@
 import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, cast
+
 from textual import events
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Button, Static, RichLog, Select
 from textual.containers import Vertical, Horizontal, VerticalScroll
+from textual.worker import Worker
 from src.session.store import FileSessionStore
 from src.tools.log_analyzer import analyze_system_logs
 from src.agent.client import SOSAgentClient
+from src.agent.stream import iter_text_chunks
+
+
+# Seconds a loaded issue is trusted before the session is re-read.
+ISSUE_CACHE_TTL = 5.0
 
 
 class DiagnosticsScreen(Screen):
@@ -15,11 +26,13 @@ class DiagnosticsScreen(Screen):
     CSS_PATH = "../styles.css"
     BINDINGS = [("escape", "back", "Back to Menu")]
 
+    store: FileSessionStore
+    # (monotonic load time, issue) of the last session read
+    _issue_cache: tuple[float, str | None] | None = None
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
-        client_type = getattr(getattr(self.app, "client", None), "client_type", None)
-        suffix = f" ({client_type})" if client_type else ""
-        yield Static(f"Diagnostics Center{suffix}", classes="title")
+        yield Static("Diagnostics Center", classes="title")
 
         with VerticalScroll(id="diag-scroll"):
             with Vertical(id="diag-panel", classes="panel"):
@@ -42,16 +55,27 @@ class DiagnosticsScreen(Screen):
         yield Footer()
 
     async def on_mount(self) -> None:
+        self.store = cast(Any, self.app).session_store
+        # Title follows the app's client type, updated only when it changes
+        self.watch(self.app, "client_type", self._show_client_type)
         await self._load_issue()
 
-    async def on_show(self) -> None:
-        client_type = getattr(getattr(self.app, "client", None), "client_type", None)
+    def _show_client_type(self, client_type: str | None) -> None:
         suffix = f" ({client_type})" if client_type else ""
         self.query_one(".title", Static).update(f"Diagnostics Center{suffix}")
 
-    async def _load_issue(self) -> None:
-        store = FileSessionStore()
-        issue = await store.get_issue()
+    async def _get_issue(self, refresh: bool = False) -> str | None:
+        """Return the saved issue, re-reading the session once the cache aged."""
+        now = time.monotonic()
+        cached = self._issue_cache
+        if refresh or cached is None or now - cached[0] >= ISSUE_CACHE_TTL:
+            if cached is not None:
+                self.store.reload_if_changed()
+            cached = self._issue_cache = (now, await self.store.get_issue())
+        return cached[1]
+
+    async def _load_issue(self, refresh: bool = False) -> None:
+        issue = await self._get_issue(refresh)
         issue_label = self.query_one("#diag-issue", Static)
         issue_label.update(
             f"[bold yellow]Aktuální problém:[/bold yellow] {issue}"
@@ -72,63 +96,48 @@ class DiagnosticsScreen(Screen):
             out, _ = await proc.communicate()
             return out.decode(errors="replace")
 
+        # OS facts are read in-process (one cached page, one syscall);
+        # only the resource commands need subprocesses
         try:
-            os_release = await _cmd("cat /etc/os-release")
-            uname = await _cmd("uname -a")
+            os_release = Path("/etc/os-release").read_text()
+            uname = " ".join(os.uname())
             system_info = f"OS:\\n{os_release}\\nKernel:\\n{uname}"
-        except Exception:
+        except OSError:
             system_info = "Could not detect OS info."
 
-        try:
-            free = await _cmd("free -h")
-            df = await _cmd("df -h /")
-            uptime = await _cmd("uptime")
-            resources = f"Memory:\\n{free}\\nDisk:\\n{df}\\nLoad:\\n{uptime}"
-        except Exception:
+        # Start the commands at once; failures come back as exception objects
+        outputs = await asyncio.gather(
+            _cmd("free -h"),
+            _cmd("df -h /"),
+            _cmd("uptime"),
+            return_exceptions=True,
+        )
+        if any(isinstance(out, BaseException) for out in outputs):
             resources = "Could not collect resource info."
+        else:
+            free, df, uptime = outputs
+            resources = f"Memory:\\n{free}\\nDisk:\\n{df}\\nLoad:\\n{uptime}"
 
         return system_info, resources
 
     async def _run_diagnostics(self, category: str) -> None:
         log = self.query_one("#diag-log", RichLog)
         log.clear()
-        log.write("[dim]Collecting logs...[/dim]")
-
-        errors = await analyze_system_logs(time_range="24h", severity="error")
-        warnings = await analyze_system_logs(time_range="24h", severity="warning")
-
-        def _dedupe(entries):
-            seen = set()
-            unique = []
-            for entry in entries:
-                key = (entry.get("unit", ""), entry.get("message", ""))
-                if key in seen:
-                    continue
-                seen.add(key)
-                unique.append(entry)
-            return unique
-
-        log_data = {
-            "hardware_errors": _dedupe(
-                errors["hardware_errors"] + warnings["hardware_errors"]
-            ),
-            "driver_errors": _dedupe(
-                errors["driver_errors"] + warnings["driver_errors"]
-            ),
-            "service_errors": _dedupe(
-                errors["service_errors"] + warnings["service_errors"]
-            ),
-            "security_warnings": _dedupe(
-                errors["security_warnings"] + warnings["security_warnings"]
-            ),
-            "recommendations": errors["recommendations"] + warnings["recommendations"],
-        }
-
-        log.write("[dim]Collecting system info...[/dim]")
-        system_info, resources = await self._collect_system_info()
-
-        store = FileSessionStore()
-        issue = await store.get_issue()
+        log.write("[dim]Collecting logs and system info...[/dim]")
+
+        # Independent journalctl/subprocess work: wait for all of it at once.
+        # journalctl -p warning includes errors, so one log scan suffices.
+        log_results, (system_info, resources) = await asyncio.gather(
+            analyze_system_logs(time_range="24h", severity="warning"),
+            self._collect_system_info(),
+        )
+
+        # Full totals: the category lists are capped
+        counts = log_results["counts"]
+
+        issue = await self._get_issue()
+        # Backslashes are not allowed inside f-string expressions (< 3.12)
+        recommendations = "\n".join([f"- {r}" for r in log_results["recommendations"]])
 
         prompt = f"""
 Analyze the REAL collected data and return a concise one-page summary (max ~25 lines).
@@ -144,14 +153,14 @@ System:
 Resources:
 {resources}
 
-Log summary (last 24h, deduped):
-- Hardware errors: {len(log_data['hardware_errors'])}
-- Driver errors: {len(log_data['driver_errors'])}
-- Service errors: {len(log_data['service_errors'])}
-- Security warnings: {len(log_data['security_warnings'])}
+Log summary (last 24h, total entries):
+- Hardware errors: {counts['hardware_errors']}
+- Driver errors: {counts['driver_errors']}
+- Service errors: {counts['service_errors']}
+- Security warnings: {counts['security_warnings']}
 
 Analyzer Recommendations (automated pre-analysis):
-{chr(10).join(f"- {r}" for r in log_data['recommendations'])}
+{recommendations}
 """.strip()
 
         app_client = getattr(self.app, "client", None)
@@ -162,17 +171,28 @@ Analyzer Recommendations (automated pre-analysis):
         assert isinstance(client, SOSAgentClient)
 
         log.write("[bold cyan]Running diagnostics...[/bold cyan]")
-        response_text = ""
-        async for chunk in client.execute_rescue_task(prompt):
-            response_text += str(chunk)
-        log.write(response_text)
+        # Collect chunks in a list: += on a str is quadratic for long answers
+        parts = [
+            text async for text in iter_text_chunks(client.execute_rescue_task(prompt))
+        ]
+        # A failover may have switched the provider mid-stream
+        cast(Any, self.app).sync_client_type()
+        log.write("".join(parts))
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-refresh":
-            await self._load_issue()
+            await self._load_issue(refresh=True)
         elif event.button.id == "btn-run":
             category = str(self.query_one("#diag-category", Select).value or "all")
-            await self._run_diagnostics(category)
+            # Run as a worker so the screen keeps handling input meanwhile
+            event.button.disabled = True
+            self.run_worker(
+                self._run_diagnostics(category), group="diagnostics", exclusive=True
+            )
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        if event.worker.group == "diagnostics" and event.worker.is_finished:
+            self.query_one("#btn-run", Button).disabled = False
 
     def action_back(self) -> None:
         self.app.pop_screen()
@@ -46,16 +46,21 @@ class FixScreen(Screen):
 
     def on_mount(self) -> None:
         """Load fixers."""
+        # Shared, process-wide fixer instances (the registry caches them)
         self.fixers: list[Fixer] = get_all_fixers()
+        self._fixer_by_id = {fixer.id: fixer for fixer in self.fixers}
         list_view = self.query_one("#fixer-list", ListView)
 
-        for fixer in self.fixers:
-            list_view.append(
-                ListItem(Label(f"{fixer.name} ({fixer.category})"), id=fixer.id)
-            )
+        # Mount all items in one go
+        list_view.extend(
+            ListItem(Label(f"{fixer.name} ({fixer.category})"), id=fixer.id)
+            for fixer in self.fixers
+        )
 
         self.selected_fixer: Fixer | None = None
         self.confirm_execute = False
+        # The effective UID cannot change while the TUI runs
+        self._is_root = is_root()
 
     async def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle fixer selection."""
@@ -63,7 +68,7 @@ class FixScreen(Screen):
             return
 
         fixer_id = event.item.id
-        self.selected_fixer = next((f for f in self.fixers if f.id == fixer_id), None)
+        self.selected_fixer = self._fixer_by_id.get(fixer_id)
 
         if self.selected_fixer:
             log = self.query_one(RichLog)
@@ -73,6 +78,8 @@ class FixScreen(Screen):
             )
             log.write(f"Category: {self.selected_fixer.category}")
             log.write(f"Requires Root: {self.selected_fixer.requires_root}")
+            if self._lacks_root(self.selected_fixer):
+                log.write("[yellow]Run 'sudo sos menu' to execute this fix.[/yellow]")
 
             # Reset buttons
             self.query_one("#btn-execute").disabled = True
@@ -101,11 +108,17 @@ class FixScreen(Screen):
             for step in plan:
                 log.write(f"- {step}")
 
+            self.confirm_execute = False
+            if self._lacks_root(self.selected_fixer):
+                log.write(
+                    "\n[bold yellow]Executing this fix requires ROOT privileges "
+                    "(run 'sudo sos menu').[/bold yellow]"
+                )
+                return
             log.write(
                 "\n[bold]Review the plan above. Click 'EXECUTE FIX' to apply.[/bold]"
             )
             self.query_one("#btn-execute").disabled = False
-            self.confirm_execute = False
 
         elif btn_id == "btn-execute":
             if not self.confirm_execute:
@@ -114,7 +127,7 @@ class FixScreen(Screen):
                 )
                 self.confirm_execute = True
                 return
-            if self.selected_fixer.requires_root and not is_root():
+            if self._lacks_root(self.selected_fixer):
                 log.write(
                     "\n[bold red]ERROR: This fix requires ROOT privileges.[/bold red]"
                 )
@@ -132,5 +145,8 @@ class FixScreen(Screen):
             except Exception as e:
                 log.write(f"[bold red]Fix Failed:[/bold red] {e}")
 
+    def _lacks_root(self, fixer: Fixer) -> bool:
+        return fixer.requires_root and not self._is_root
+
     def action_back(self) -> None:
         self.app.pop_screen()
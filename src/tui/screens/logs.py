@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from textual.app import ComposeResult
 from textual.screen import Screen
@@ -5,6 +6,28 @@ from textual.widgets import Header, Footer, Button, RichLog, Static
 from textual.containers import Vertical, Horizontal
 
 
+# Lines of the agent log shown on the screen.
+TAIL_LINES = 100
+_TAIL_CHUNK = 64 * 1024
+
+
+def _tail_lines(path: Path, count: int) -> list[str]:
+    """Return the last ``count`` lines of ``path``, reading only its tail."""
+    with open(path, "rb") as f:
+        end = f.seek(0, 2)
+        pos = end
+        tail = b""
+        # Read backwards until the tail holds more than `count` line breaks
+        while pos > 0 and tail.count(b"\n") <= count:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    lines = tail.decode("utf-8", errors="replace").splitlines()
+    # A line cut off at the read boundary is never among the last `count`
+    return lines[-count:]
+
+
 class LogsScreen(Screen):
     """View agent log output."""
 
@@ -39,14 +62,16 @@ class LogsScreen(Screen):
         log_widget = self.query_one("#log-view", RichLog)
         log_widget.clear()
         path = Path("logs/sos-agent.log")
-        if not path.exists():
+        try:
+            # File I/O off the event loop; a missing file surfaces here too
+            content = await asyncio.to_thread(_tail_lines, path, TAIL_LINES)
+        except FileNotFoundError:
             log_widget.write("[red]Log file not found. Spusť nějaký příkaz sos.*[/red]")
             return
-        try:
-            content = path.read_text(encoding="utf-8").splitlines()[-100:]
         except Exception as e:
             log_widget.write(f"[red]Failed to read log: {e}[/red]")
             return
 
-        for line in content:
-            log_widget.write(line)
+        # One write (one render pass) for the whole tail, not one per line
+        if content:
+            log_widget.write("\n".join(content))
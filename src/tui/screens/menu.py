@@ -1,17 +1,52 @@
+from typing import Any, cast
+
 from textual import events
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Button, Static, Label
 from textual.containers import Horizontal, Vertical
-from src.tui.screens.chat import ChatScreen
-from src.tui.screens.fix import FixScreen
-from src.tui.screens.monitor import MonitorScreen
-from src.tui.screens.setup import SetupScreen
-from src.tui.screens.diagnostics import DiagnosticsScreen
-from src.tui.screens.logs import LogsScreen
+from src.agent.config import PROVIDER_MODEL_ATTRS
 from src.session.store import FileSessionStore
 
 
+# Menu button ids as laid out on screen, row by row.
+_MENU_LAYOUT = (
+    ("btn-1", "btn-2"),
+    ("btn-3", "btn-4"),
+    ("btn-5", "btn-6"),
+    ("btn-7", "btn-8"),
+    ("btn-9", "btn-0"),
+)
+_ARROW_KEYS = frozenset({"up", "down", "left", "right"})
+
+
+def _neighbor_table(
+    layout: tuple[tuple[str, ...], ...],
+) -> dict[str, dict[str, str]]:
+    """Map each button id to the id each arrow key moves to (clamped at edges)."""
+    last_row = len(layout) - 1
+    table = {}
+    for r, cols in enumerate(layout):
+        last_col = len(cols) - 1
+        for c, button_id in enumerate(cols):
+            table[button_id] = {
+                "up": layout[max(0, r - 1)][c],
+                "down": layout[min(last_row, r + 1)][c],
+                "left": cols[max(0, c - 1)],
+                "right": cols[min(last_col, c + 1)],
+            }
+    return table
+
+
+_NEIGHBORS = _neighbor_table(_MENU_LAYOUT)
+
+
+def _set_text(label: Label, text: str) -> None:
+    """Update ``label`` unless it already shows ``text`` (update() always repaints)."""
+    if label.renderable != text:
+        label.update(text)
+
+
 class MainMenu(Screen):
     """Main menu screen for SOS Agent."""
 
@@ -31,6 +66,18 @@ class MainMenu(Screen):
         ("9", "emergency", "Emergency"),
     ]
 
+    # Button id -> action method, one lookup per click
+    _BUTTON_ACTIONS = {
+        "btn-0": "action_quit",
+        "btn-1": "action_diagnose",
+        "btn-2": "action_fix",
+        "btn-3": "action_monitor",
+        "btn-4": "action_chat",
+        "btn-5": "action_setup",
+        "btn-6": "action_logs",
+        "btn-9": "action_emergency",
+    }
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
 
@@ -65,6 +112,9 @@ class MainMenu(Screen):
         yield Footer()
 
     async def on_mount(self) -> None:
+        # Refreshed on every return to the menu; resolve the labels once
+        self._session_label = self.query_one("#session-label", Label)
+        self._provider_label = self.query_one("#provider-label", Label)
         await self._refresh_status()
         # Default focus for keyboard navigation
         self.query_one("#btn-1", Button).focus()
@@ -74,121 +124,82 @@ class MainMenu(Screen):
 
     async def _refresh_status(self) -> None:
         # Show current issue status
-        store = FileSessionStore()
+        # One app-wide store, re-read only when another process changed it
+        store: FileSessionStore = cast(Any, self.app).session_store
+        store.reload_if_changed()
         issue = await store.get_issue()
-        label = self.query_one("#session-label", Label)
         if issue:
-            label.update(f"[yellow]Issue:[/yellow] {issue}")
+            issue_text = f"[yellow]Issue:[/yellow] {issue}"
         else:
-            label.update("[dim]No issue stored. Run sos diagnose --issue ...[/dim]")
+            issue_text = "[dim]No issue stored. Run sos diagnose --issue ...[/dim]"
+        _set_text(self._session_label, issue_text)
 
-        provider_label = self.query_one("#provider-label", Label)
         cfg = getattr(self.app, "config", None)
         client = getattr(self.app, "client", None)
         provider = getattr(cfg, "ai_provider", "unknown") if cfg else "unknown"
         lang = getattr(cfg, "ai_language", "en") if cfg else "en"
-        model = ""
-        if cfg:
-            if provider == "gemini":
-                model = getattr(cfg, "gemini_model", "")
-            elif provider == "openai":
-                model = getattr(cfg, "openai_model", "")
-            elif provider == "inception":
-                model = getattr(cfg, "inception_model", "")
-            elif provider == "claude-agentapi":
-                model = getattr(cfg, "model", "")
+        model_attr = PROVIDER_MODEL_ATTRS.get(provider)
+        model = getattr(cfg, model_attr, "") if cfg and model_attr else ""
         runtime = getattr(client, "client_type", None)
         runtime_str = f" (active: {runtime})" if runtime else ""
         model_str = f" / {model}" if model else ""
-        provider_label.update(
-            f"[cyan]Provider:[/cyan] {provider}{model_str}{runtime_str}  [cyan]Lang:[/cyan] {lang}"
+        _set_text(
+            self._provider_label,
+            f"[cyan]Provider:[/cyan] {provider}{model_str}{runtime_str}  [cyan]Lang:[/cyan] {lang}",
         )
 
     def on_key(self, event: events.Key) -> None:
         """Arrow-key navigation between menu buttons."""
         key = event.key
-        if key not in {"up", "down", "left", "right"}:
-            return
-
-        layout = [
-            ["btn-1", "btn-2"],
-            ["btn-3", "btn-4"],
-            ["btn-5", "btn-6"],
-            ["btn-7", "btn-8"],
-            ["btn-9", "btn-0"],
-        ]
-
-        focused = getattr(self.app, "focused", None)
-        focused_id = getattr(focused, "id", None)
-        row = col = None
-        for r, cols in enumerate(layout):
-            for c, bid in enumerate(cols):
-                if bid == focused_id:
-                    row, col = r, c
-                    break
-            if row is not None:
-                break
-
-        if row is None or col is None:
-            self.query_one("#btn-1", Button).focus()
-            event.prevent_default()
-            event.stop()
+        if key not in _ARROW_KEYS:
             return
 
-        new_row, new_col = row, col
-        if key == "up":
-            new_row = max(0, row - 1)
-        elif key == "down":
-            new_row = min(len(layout) - 1, row + 1)
-        elif key == "left":
-            new_col = max(0, col - 1)
-        elif key == "right":
-            new_col = min(len(layout[row]) - 1, col + 1)
-
-        self.query_one(f"#{layout[new_row][new_col]}", Button).focus()
+        focused_id = getattr(getattr(self.app, "focused", None), "id", None)
+        neighbors = _NEIGHBORS.get(focused_id)
+        # Outside the grid: arrows bring focus back to the first button
+        target = neighbors[key] if neighbors else "btn-1"
+        self.query_one(f"#{target}", Button).focus()
         event.prevent_default()
         event.stop()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
-        btn_id = event.button.id
-        if btn_id == "btn-0":
-            self.app.exit()
-        elif btn_id == "btn-1":
-            self.action_diagnose()
-        elif btn_id == "btn-2":
-            self.action_fix()
-        elif btn_id == "btn-3":
-            self.action_monitor()
-        elif btn_id == "btn-4":
-            self.action_chat()
-        elif btn_id == "btn-5":
-            self.action_setup()
-        elif btn_id == "btn-6":
-            self.action_logs()
-        elif btn_id == "btn-9":
-            self.action_emergency()
-        # Add other actions as they are implemented
+        action = self._BUTTON_ACTIONS.get(event.button.id or "")
+        if action:
+            getattr(self, action)()
+        # Add other actions to _BUTTON_ACTIONS as they are implemented
 
     def action_quit(self) -> None:
         self.app.exit()
 
     def action_diagnose(self) -> None:
+        from src.tui.screens.diagnostics import DiagnosticsScreen
+
         self.app.push_screen(DiagnosticsScreen())
 
     def action_fix(self) -> None:
+        from src.tui.screens.fix import FixScreen
+
         self.app.push_screen(FixScreen())
 
     def action_monitor(self) -> None:
+        from src.tui.screens.monitor import MonitorScreen
+
         self.app.push_screen(MonitorScreen())
 
     def action_chat(self) -> None:
+        from src.tui.screens.chat import ChatScreen
+
         self.app.push_screen(ChatScreen())
 
     def action_setup(self) -> None:
+        from src.tui.screens.setup import SetupScreen
+
         self.app.push_screen(SetupScreen())
 
     def action_logs(self) -> None:
+        from src.tui.screens.logs import LogsScreen
+
         self.app.push_screen(LogsScreen())
 
     def action_emergency(self) -> None:
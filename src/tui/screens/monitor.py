@@ -5,6 +5,11 @@ from textual.widgets import Header, Footer, Label, ProgressBar, Static, Button
 from textual.containers import Vertical, Container, Horizontal
 
 
+# Seconds between samples; root filesystem usage moves slowly.
+STATS_INTERVAL = 1.0
+DISK_INTERVAL = 5.0
+
+
 class MonitorScreen(Screen):
     """System monitoring screen."""
 
@@ -39,32 +44,73 @@ class MonitorScreen(Screen):
 
     def on_mount(self) -> None:
         """Start monitoring."""
+        # (bar, label) per metric, resolved once rather than on every tick
+        self._gauges = {
+            metric: (
+                self.query_one(f"#{metric}-bar", ProgressBar),
+                self.query_one(f"#{metric}-label", Label),
+            )
+            for metric in ("cpu", "ram", "disk")
+        }
+        # Last value rendered per metric
+        self._shown: dict[str, float] = {}
         self.monitoring = True
-        self.update_stats()
-        self.timer = self.set_interval(1.0, self.update_stats)
+        # The first cpu_percent() call only starts psutil's measurement window
+        # (it returns 0.0), so CPU is first shown on the next tick.
+        psutil.cpu_percent(interval=None)
+        self._show("ram", psutil.virtual_memory().percent)
+        self.update_disk()
+        self.timer = self.set_interval(STATS_INTERVAL, self.update_stats)
+        self.disk_timer = self.set_interval(DISK_INTERVAL, self.update_disk)
+
+    def _show(self, metric: str, percent: float) -> None:
+        # Unchanged readings leave the widgets (and their refresh) alone
+        if self._shown.get(metric) == percent:
+            return
+        self._shown[metric] = percent
+        bar, label = self._gauges[metric]
+        # The bar only shows whole percents: sub-percent jitter leaves it as is
+        whole = round(percent)
+        if bar.progress != whole:
+            bar.progress = whole
+        label.update(f"{percent}%")
 
     def update_stats(self) -> None:
-        """Update system metrics."""
+        """Update CPU and memory metrics."""
         if not getattr(self, "monitoring", False):
             return
-        cpu = psutil.cpu_percent()
-        ram = psutil.virtual_memory().percent
-        disk = psutil.disk_usage("/").percent
+        self._show("cpu", psutil.cpu_percent(interval=None))
+        self._show("ram", psutil.virtual_memory().percent)
 
-        self.query_one("#cpu-bar", ProgressBar).progress = cpu
-        self.query_one("#cpu-label", Label).update(f"{cpu}%")
+    def update_disk(self) -> None:
+        """Update root filesystem usage."""
+        if not getattr(self, "monitoring", False):
+            return
+        self._show("disk", psutil.disk_usage("/").percent)
+
+    def _set_timers_running(self, running: bool) -> None:
+        for timer in (self.timer, self.disk_timer):
+            if running:
+                timer.resume()
+            else:
+                timer.pause()
 
-        self.query_one("#ram-bar", ProgressBar).progress = ram
-        self.query_one("#ram-label", Label).update(f"{ram}%")
+    def on_screen_suspend(self) -> None:
+        # Another screen covers this one: stop sampling until it is back
+        self._set_timers_running(False)
 
-        self.query_one("#disk-bar", ProgressBar).progress = disk
-        self.query_one("#disk-label", Label).update(f"{disk}%")
+    def on_screen_resume(self) -> None:
+        if hasattr(self, "timer"):
+            self._set_timers_running(self.monitoring)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-start":
             self.monitoring = True
         elif event.button.id == "btn-stop":
             self.monitoring = False
+        else:
+            return
+        self._set_timers_running(self.monitoring)
 
     def action_back(self) -> None:
         self.app.pop_screen()
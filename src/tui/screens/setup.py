@@ -1,3 +1,5 @@
+import asyncio
+
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual import events
@@ -15,8 +17,70 @@ from textual.widgets import (
 from pathlib import Path
 from textual.containers import Vertical, Horizontal, Container, VerticalScroll
 from typing import Any, cast
-from src.agent.config import load_config
+from src.agent.config import PROVIDER_MODEL_ATTRS, SOSConfig, load_config
 from src.agent.client import SOSAgentClient
+from src.agent.stream import iter_text_chunks
+
+
+# Models offered in the model select, as (label, value) options per provider.
+PROVIDER_MODELS: dict[str, tuple[tuple[str, str], ...]] = {
+    "gemini": (
+        ("gemini-2.0-flash-exp", "gemini-2.0-flash-exp"),
+        ("gemini-2.0-flash", "gemini-2.0-flash"),
+        ("gemini-1.5-pro", "gemini-1.5-pro"),
+    ),
+    "openai": (
+        ("gpt-4o", "gpt-4o"),
+        ("gpt-4o-mini", "gpt-4o-mini"),
+        ("o1-mini", "o1-mini"),
+    ),
+    "inception": (
+        ("mercury-coder", "mercury-coder"),
+        ("mercury", "mercury"),
+    ),
+    "claude-agentapi": (
+        ("claude-sonnet-4", "claude-sonnet-4"),
+        ("claude-opus-4", "claude-opus-4"),
+    ),
+}
+_AUTO_MODEL_OPTIONS = (("(auto)", "(auto)"),)
+
+# Arrow keys moving focus, mapped to the app action method they call.
+_ARROW_FOCUS = {
+    "up": "action_focus_previous",
+    "left": "action_focus_previous",
+    "down": "action_focus_next",
+    "right": "action_focus_next",
+}
+
+# (provider, display name) of the API keys whose status is shown.
+_API_KEY_LABELS = (
+    ("gemini", "Gemini"),
+    ("openai", "OpenAI"),
+    ("inception", "Inception"),
+)
+
+# Focused widgets that use the arrow keys themselves.
+_ARROW_KEY_WIDGETS = (Input, Select, RadioSet)
+
+
+def _settings(config: SOSConfig) -> tuple[str, ...]:
+    """The config fields edited on this screen: language, provider, models."""
+    return (
+        config.ai_language,
+        config.ai_provider,
+        *(getattr(config, attr) for attr in PROVIDER_MODEL_ATTRS.values()),
+    )
+
+
+def _needs_new_client(
+    client: SOSAgentClient, old: tuple[str, ...], new: tuple[str, ...]
+) -> bool:
+    """Whether saving ``new`` over ``old`` settings requires rebuilding ``client``."""
+    if old[1:] != new[1:]:
+        return True  # provider or a model changed
+    # Inception takes the language at construction, the others per request
+    return old[0] != new[0] and client.client_type == "inception"
 
 
 class SetupScreen(Screen):
@@ -65,85 +129,61 @@ class SetupScreen(Screen):
 
     async def on_mount(self) -> None:
         """Load current config."""
-        self.config = await load_config(None)
-
-        # Set UI state
-        self.query_one("#lang-radio", RadioSet)
-        if getattr(self.config, "ai_language", "en") == "cs":
-            self.query_one("#lang-cz", RadioButton).value = True
-        else:
-            self.query_one("#lang-en", RadioButton).value = True
+        # Widgets the handlers below keep using, resolved once
+        self._lang_radio = self.query_one("#lang-radio", RadioSet)
+        self._provider_select = self.query_one("#provider-select", Select)
+        self._model_select = self.query_one("#model-select", Select)
+        self._status_output = self.query_one("#status-output", Static)
+        # Provider whose models model-select currently lists
+        self._last_provider: str | None = None
 
-        # Provider
-        provider_select = self.query_one("#provider-select", Select)
-        provider_select.value = self.config.ai_provider
-
-        await self._sync_model_select()
-        provider_select.focus()
+        self.config = await load_config(None)
+        # What is on disk and what the running client was built with,
+        # compared on save; each only moves once its update succeeded
+        self._saved_settings = _settings(self.config)
+        self._client_settings = self._saved_settings
+
+        # Set UI state in one batch: a single repaint instead of one per widget
+        with self.app.batch_update():
+            if getattr(self.config, "ai_language", "en") == "cs":
+                self.query_one("#lang-cz", RadioButton).value = True
+            else:
+                self.query_one("#lang-en", RadioButton).value = True
 
-        # Keys
-        # We don't show real keys for security, just status
-        gemini_label = cast(Label, self.query_one("#key-gemini", Label))
-        if self.config.gemini_api_key:
-            gemini_label.update("Gemini: [green]Configured[/green]")
-        else:
-            gemini_label.update("Gemini: [red]Missing[/red]")
+            # Provider
+            self._provider_select.value = self.config.ai_provider
+            await self._sync_model_select()
 
-        openai_label = cast(Label, self.query_one("#key-openai", Label))
-        if self.config.openai_api_key:
-            openai_label.update("OpenAI: [green]Configured[/green]")
-        else:
-            openai_label.update("OpenAI: [red]Missing[/red]")
+            # Keys
+            # We don't show real keys for security, just status
+            for provider, name in _API_KEY_LABELS:
+                configured = getattr(self.config, f"{provider}_api_key")
+                status = (
+                    "[green]Configured[/green]" if configured else "[red]Missing[/red]"
+                )
+                self.query_one(f"#key-{provider}", Label).update(f"{name}: {status}")
 
-        inception_label = cast(Label, self.query_one("#key-inception", Label))
-        if self.config.inception_api_key:
-            inception_label.update("Inception: [green]Configured[/green]")
-        else:
-            inception_label.update("Inception: [red]Missing[/red]")
+        self._provider_select.focus()
 
     async def on_select_changed(self, event: Select.Changed) -> None:
         if event.select.id == "provider-select":
             await self._sync_model_select()
 
     async def _sync_model_select(self) -> None:
-        provider_select = self.query_one("#provider-select", Select)
-        model_select = self.query_one("#model-select", Select)
+        provider_select = self._provider_select
+        model_select = self._model_select
         provider = str(provider_select.value) if provider_select.value else "auto"
+        # Select.Changed also fires for the value set in on_mount and for
+        # re-selecting the same provider; the options are already right then
+        if provider == self._last_provider:
+            return
 
-        options: list[tuple[str, str]] = []
-        current_value: str | None = None
-
-        if provider == "gemini":
-            options = [
-                ("gemini-2.0-flash-exp", "gemini-2.0-flash-exp"),
-                ("gemini-2.0-flash", "gemini-2.0-flash"),
-                ("gemini-1.5-pro", "gemini-1.5-pro"),
-            ]
-            current_value = self.config.gemini_model
-        elif provider == "openai":
-            options = [
-                ("gpt-4o", "gpt-4o"),
-                ("gpt-4o-mini", "gpt-4o-mini"),
-                ("o1-mini", "o1-mini"),
-            ]
-            current_value = self.config.openai_model
-        elif provider == "inception":
-            options = [
-                ("mercury-coder", "mercury-coder"),
-                ("mercury", "mercury"),
-            ]
-            current_value = self.config.inception_model
-        elif provider == "claude-agentapi":
-            options = [
-                ("claude-sonnet-4", "claude-sonnet-4"),
-                ("claude-opus-4", "claude-opus-4"),
-            ]
-            current_value = self.config.model
-        else:
-            # auto mode: keep per-provider models, but don't force a single one
-            options = [("(auto)", "(auto)")]
-            current_value = "(auto)"
+        # auto mode keeps per-provider models without forcing a single one
+        options = PROVIDER_MODELS.get(provider, _AUTO_MODEL_OPTIONS)
+        model_attr = PROVIDER_MODEL_ATTRS.get(provider)
+        current_value = getattr(self.config, model_attr) if model_attr else None
 
+        self._last_provider = provider
         model_select.set_options(options)
         model_select.value = current_value if current_value else options[0][1]
 
@@ -155,7 +195,7 @@ class SetupScreen(Screen):
 
     async def run_health_check(self) -> None:
         """Run connectivity check via AI client."""
-        output = cast(Static, self.query_one("#status-output", Static))
+        output = self._status_output
         output.update("[yellow]Running health check (Ping AI)...[/yellow]")
 
         try:
@@ -165,22 +205,18 @@ class SetupScreen(Screen):
                 return
 
             client = cast(SOSAgentClient, app_client)
-            response_text = ""
-
-            # Use a short timeout task
-            async for chunk in client.execute_rescue_task(
-                "Ping. Respond with 'Pong'.", stream=False
-            ):
-                if hasattr(chunk, "content"):  # AgentAPI
-                    for block in chunk.content:
-                        if hasattr(block, "text"):
-                            response_text += block.text
-                elif isinstance(chunk, dict) and "content" in chunk:  # Claude
-                    for block in chunk["content"]:
-                        if block.get("type") == "text":
-                            response_text += block["text"]
-                else:
-                    response_text += str(chunk)
+            # Collected in a list and joined once: += on a str is quadratic
+            parts = [
+                text
+                async for text in iter_text_chunks(
+                    client.execute_rescue_task(
+                        "Ping. Respond with 'Pong'.", stream=False
+                    )
+                )
+            ]
+            response_text = "".join(parts)
+            # A failover may have switched the provider mid-stream
+            cast(Any, self.app).sync_client_type()
 
             if response_text:
                 output.update(
@@ -193,54 +229,70 @@ class SetupScreen(Screen):
             output.update(f"[red]Health Check Failed: {e}[/red]")
 
     async def save_settings(self) -> None:
-        lang_radio = self.query_one("#lang-radio", RadioSet)
-        pressed = lang_radio.pressed_button
+        pressed = self._lang_radio.pressed_button
         ai_language = "cs" if pressed and pressed.id == "lang-cz" else "en"
 
-        provider_select = self.query_one("#provider-select", Select)
+        provider_select = self._provider_select
         provider = str(provider_select.value) if provider_select.value else "auto"
 
-        model_select = self.query_one("#model-select", Select)
+        model_select = self._model_select
         model_value = str(model_select.value) if model_select.value else ""
 
         self.config.ai_language = ai_language
         self.config.ai_provider = provider
 
-        if provider == "gemini" and model_value and model_value != "(auto)":
-            self.config.gemini_model = model_value
-        elif provider == "openai" and model_value and model_value != "(auto)":
-            self.config.openai_model = model_value
-        elif provider == "inception" and model_value and model_value != "(auto)":
-            self.config.inception_model = model_value
-        elif provider == "claude-agentapi" and model_value and model_value != "(auto)":
-            self.config.model = model_value
+        model_attr = PROVIDER_MODEL_ATTRS.get(provider)
+        if model_attr and model_value and model_value != "(auto)":
+            setattr(self.config, model_attr, model_value)
 
-        config_path = Path("config/default.yaml")
-        self.config.to_yaml(config_path)
+        settings = _settings(self.config)
 
-        # Apply changes to the running app immediately
+        config_path = Path("config/default.yaml")
+        save_error: Exception | None = None
+        if settings != self._saved_settings or not config_path.exists():
+            try:
+                # File I/O off the event loop
+                await asyncio.to_thread(self.config.to_yaml, config_path)
+                self._saved_settings = settings
+            except Exception as e:
+                save_error = e
+
+        # Apply changes to the running app immediately, even if saving failed
         try:
             app = cast(Any, self.app)
-            app.config = self.config
-            app.client = SOSAgentClient(self.config)
-            self.notify("Uloženo + aplikováno (config/default.yaml)")
+            client = app.client
+            if client is not None and not _needs_new_client(
+                client, self._client_settings, settings
+            ):
+                # Same provider and models: keep the client and its connections;
+                # the response language is read from its config per request
+                client.config.ai_language = self.config.ai_language
+                app.config = client.config
+            else:
+                app.config = self.config
+                app.client = SOSAgentClient(self.config)
+            self._client_settings = settings
         except Exception as e:
-            self.notify(f"Uloženo, ale klient nešel přepnout: {e}")
+            saved = "Uloženo" if save_error is None else "Neuloženo"
+            self.notify(f"{saved}, ale klient nešel přepnout: {e}", severity="error")
+            return
+
+        if save_error is not None:
+            self.notify(f"Aplikováno, ale neuloženo: {save_error}", severity="error")
+        else:
+            self.notify("Uloženo + aplikováno (config/default.yaml)")
 
     def action_back(self) -> None:
         self.app.pop_screen()
 
     def on_key(self, event: events.Key) -> None:
         """Arrow-key navigation between focusable controls (when not inside inputs/selects)."""
-        focused = getattr(self.app, "focused", None)
-        if isinstance(focused, (Input, Select, RadioSet)):
+        action = _ARROW_FOCUS.get(event.key)
+        if action is None:
+            return
+        if isinstance(getattr(self.app, "focused", None), _ARROW_KEY_WIDGETS):
             return
 
-        if event.key in {"up", "left"}:
-            self.app.action_focus_previous()
-            event.prevent_default()
-            event.stop()
-        elif event.key in {"down", "right"}:
-            self.app.action_focus_next()
-            event.prevent_default()
-            event.stop()
+        getattr(self.app, action)()
+        event.prevent_default()
+        event.stop()
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 import os
 import sys
+from unittest.mock import AsyncMock
 
 # Add src to python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
@@ -14,3 +16,22 @@ def mock_env(monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
     monkeypatch.setenv("INCEPTION_API_KEY", "test_inception_key")
     monkeypatch.setenv("CLAUDE_API_KEY", "test_claude_key")
+
+
+@pytest.fixture
+def journal_process():
+    """Build fake journalctl processes whose output is read from real streams."""
+
+    def make(stdout=b"", stderr=b"", returncode=0):
+        process = AsyncMock()
+        process.stdout = asyncio.StreamReader()
+        process.stdout.feed_data(stdout)
+        process.stdout.feed_eof()
+        process.stderr = asyncio.StreamReader()
+        process.stderr.feed_data(stderr)
+        process.stderr.feed_eof()
+        process.wait.return_value = returncode
+        process.returncode = returncode
+        return process
+
+    return make
@@ -3,40 +3,56 @@ from unittest.mock import MagicMock, AsyncMock
 from src.agent.inception_client import InceptionClient
 
 
+# Canned non-stream chat completion returned by the mocked API.
+CANNED_RESPONSE = {"choices": [{"message": {"content": "Odpověď"}}]}
+
+
+@pytest.fixture(scope="module")
+def inception_mock_session_factory():
+    """Build mocked aiohttp.ClientSession classes for InceptionClient.
+
+    post() either raises ``error`` or answers with CANNED_RESPONSE, storing
+    the JSON payload it was sent in ``captured_payload``.
+    """
+
+    def make(captured_payload=None, error=None):
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = CANNED_RESPONSE
+        mock_post = MagicMock()
+        mock_post.__aenter__.return_value = mock_response
+
+        def post(url, json, headers):
+            if error is not None:
+                raise error
+            if captured_payload is not None:
+                captured_payload.update(json)
+            return mock_post
+
+        mock_session = MagicMock()
+        mock_session.post.side_effect = post
+
+        mock_session_cls = MagicMock()
+        mock_session_cls.return_value.__aenter__.return_value = mock_session
+        return mock_session_cls
+
+    return make
+
+
 @pytest.mark.asyncio
-async def test_mercury_language_cs(monkeypatch):
+async def test_mercury_language_cs(monkeypatch, inception_mock_session_factory):
     """
     Phase 5: AI Consistency - Language
     Verify that setting language='cs' adds Czech instruction to system prompt.
     """
     monkeypatch.setenv("INCEPTION_API_KEY", "test")
 
-    # Mock aiohttp
-    mock_post = MagicMock()
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.raise_for_status = MagicMock()
-    # Mock json response for non-stream
-    mock_response.json.return_value = {"choices": [{"message": {"content": "Odpověď"}}]}
-    # Mock context manager
-    mock_post.return_value.__aenter__.return_value = mock_response
-
     # Capture the payload sent to post
-    captured_payload = {}
-
-    def side_effect(url, json, headers):
-        nonlocal captured_payload
-        captured_payload = json
-        return mock_post.return_value
-
-    # Mock ClientSession
-    mock_session = MagicMock()
-    mock_session.post.side_effect = side_effect
-
-    mock_session_cls = MagicMock()
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
-
-    monkeypatch.setattr("aiohttp.ClientSession", mock_session_cls)
+    captured_payload: dict = {}
+    monkeypatch.setattr(
+        "aiohttp.ClientSession", inception_mock_session_factory(captured_payload)
+    )
 
     client = InceptionClient(language="cs")
 
@@ -52,34 +68,21 @@ async def test_mercury_language_cs(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_quota_handling(monkeypatch):
+async def test_quota_handling(monkeypatch, inception_mock_session_factory):
     """
     Phase 5: Quota Handling
     Simulate 429 error.
     """
     monkeypatch.setenv("INCEPTION_API_KEY", "test")
 
-    # Mock ClientSession raising exception
-    MagicMock()
-    # Create exception
-
-    async def fake_query(*args, **kwargs):
-        raise Exception("429 Too Many Requests")
-
     client = InceptionClient()
-    # Monkeypatch query directly to simulate failure logic inside query is harder with inner context managers
-    # But InceptionClient catches Exception.
-
-    # Let's mock aiohttp.ClientSession to raise inside post
-    mock_session_cls = MagicMock()
-    mock_session_inst = MagicMock()
-    mock_session_cls.return_value.__aenter__.return_value = mock_session_inst
-
-    mock_post = MagicMock()
-    mock_post.side_effect = Exception("429 Too Many Requests")
-    mock_session_inst.post = mock_post
 
-    monkeypatch.setattr("aiohttp.ClientSession", mock_session_cls)
+    # Mock aiohttp.ClientSession to raise inside post; InceptionClient
+    # catches the exception and reports it in the output
+    monkeypatch.setattr(
+        "aiohttp.ClientSession",
+        inception_mock_session_factory(error=Exception("429 Too Many Requests")),
+    )
 
     results = []
     async for chunk in client.query("test"):
@@ -17,6 +17,12 @@ async def test_diagnose_issue_flag(tmp_path):
                 "driver_errors": [],
                 "service_errors": [],
                 "security_warnings": [],
+                "counts": {
+                    "hardware_errors": 0,
+                    "driver_errors": 0,
+                    "service_errors": 0,
+                    "security_warnings": 0,
+                },
                 "recommendations": [],
             },
         ),
@@ -26,6 +32,7 @@ async def test_diagnose_issue_flag(tmp_path):
         with patch("asyncio.create_subprocess_shell", return_value=mock_subprocess):
             with patch("src.cli.FileSessionStore") as mock_store_cls:
                 mock_store_instance = mock_store_cls.return_value
+                mock_store_instance.aclose = AsyncMock()
                 mock_store_instance.save_issue = AsyncMock()
 
                 runner = CliRunner()
@@ -51,6 +58,12 @@ async def test_diagnose_prompt_includes_issue():
                 "driver_errors": [],
                 "service_errors": [],
                 "security_warnings": [],
+                "counts": {
+                    "hardware_errors": 0,
+                    "driver_errors": 0,
+                    "service_errors": 0,
+                    "security_warnings": 0,
+                },
                 "recommendations": [],
             },
         ),
@@ -60,6 +73,7 @@ async def test_diagnose_prompt_includes_issue():
         with patch("asyncio.create_subprocess_shell", return_value=mock_subprocess):
             with patch("src.cli.FileSessionStore") as mock_store_cls:
                 mock_store = mock_store_cls.return_value
+                mock_store.aclose = AsyncMock()
                 mock_store.save_issue = AsyncMock()
 
                 async def _fake_stream(task):
@@ -34,6 +34,12 @@ async def test_diagnose_stub_provider(monkeypatch):
                 }
             ],
             "security_warnings": [],
+            "counts": {
+                "hardware_errors": 0,
+                "driver_errors": 0,
+                "service_errors": 1,
+                "security_warnings": 0,
+            },
             "recommendations": ["Restart service-x.service"],
         }
 
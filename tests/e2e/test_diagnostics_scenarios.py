@@ -1,6 +1,5 @@
 import pytest
 import json
-from unittest.mock import MagicMock
 from src.tools.log_analyzer import analyze_system_logs
 
 
@@ -17,7 +16,7 @@ def create_log_line(message, unit="kernel", priority="3", timestamp="16000000000
 
 
 @pytest.mark.asyncio
-async def test_gpu_regression_radeon(monkeypatch):
+async def test_gpu_regression_radeon(monkeypatch, journal_process):
     """
     Phase 2: GPU Driver (Regression #4)
     Inject kernel log: [drm:radeon_ib_ring_tests] *ERROR*
@@ -27,20 +26,8 @@ async def test_gpu_regression_radeon(monkeypatch):
 
     # Mock subprocess
     async def fake_create_subprocess_exec(program, *args, **kwargs):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-
-        # Determine output based on command
-        if "-k" in args:  # Kernel logs
-            stdout = gpu_log.encode()
-        else:  # System logs
-            stdout = b""
-
-        async def async_communicate():
-            return (stdout, b"")
-
-        mock_proc.communicate = async_communicate
-        return mock_proc
+        # Kernel messages are part of the single journal query
+        return journal_process(gpu_log.encode())
 
     monkeypatch.setattr("asyncio.create_subprocess_exec", fake_create_subprocess_exec)
 
@@ -53,7 +40,7 @@ async def test_gpu_regression_radeon(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_hardware_critical_thermal(monkeypatch):
+async def test_hardware_critical_thermal(monkeypatch, journal_process):
     """
     Phase 2: Hardware Critical
     Inject: CPU thermal throttling
@@ -62,19 +49,7 @@ async def test_hardware_critical_thermal(monkeypatch):
     hw_log = create_log_line("CPU thermal throttling detected", unit="kernel")
 
     async def fake_create_subprocess_exec(program, *args, **kwargs):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-
-        if "-k" in args:
-            stdout = hw_log.encode()
-        else:
-            stdout = b""
-
-        async def async_communicate():
-            return (stdout, b"")
-
-        mock_proc.communicate = async_communicate
-        return mock_proc
+        return journal_process(hw_log.encode())
 
     monkeypatch.setattr("asyncio.create_subprocess_exec", fake_create_subprocess_exec)
 
@@ -86,7 +61,7 @@ async def test_hardware_critical_thermal(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_gui_warnings_plasma(monkeypatch):
+async def test_gui_warnings_plasma(monkeypatch, journal_process):
     """
     Phase 2: GUI Warnings (Regression #5)
     Inject: plasma-kded failed
@@ -95,19 +70,7 @@ async def test_gui_warnings_plasma(monkeypatch):
     gui_log = create_log_line("plasma-kded failed to start", unit="plasma-kded.service")
 
     async def fake_create_subprocess_exec(program, *args, **kwargs):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-
-        if "-k" in args:
-            stdout = b""
-        else:
-            stdout = gui_log.encode()
-
-        async def async_communicate():
-            return (stdout, b"")
-
-        mock_proc.communicate = async_communicate
-        return mock_proc
+        return journal_process(gui_log.encode())
 
     monkeypatch.setattr("asyncio.create_subprocess_exec", fake_create_subprocess_exec)
 
@@ -118,7 +81,7 @@ async def test_gui_warnings_plasma(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_service_failure_nginx(monkeypatch):
+async def test_service_failure_nginx(monkeypatch, journal_process):
     """
     Phase 2: Service Failure
     Inject: nginx failed
@@ -129,19 +92,7 @@ async def test_service_failure_nginx(monkeypatch):
     )
 
     async def fake_create_subprocess_exec(program, *args, **kwargs):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-
-        if "-k" in args:
-            stdout = b""
-        else:
-            stdout = svc_log.encode()
-
-        async def async_communicate():
-            return (stdout, b"")
-
-        mock_proc.communicate = async_communicate
-        return mock_proc
+        return journal_process(svc_log.encode())
 
     monkeypatch.setattr("asyncio.create_subprocess_exec", fake_create_subprocess_exec)
 
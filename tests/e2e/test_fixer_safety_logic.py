@@ -6,8 +6,8 @@ from src.tools.fixers import get_all_fixers
 async def test_all_fixers_dry_run_safety(mocker):
     """Ensure dry_run never calls subprocess (executes commands)."""
     # Mock subprocess to fail if called (or just spy)
-    # create_subprocess_shell is the dangerous one
     mock_sub = mocker.patch("asyncio.create_subprocess_shell")
+    mock_exec = mocker.patch("asyncio.create_subprocess_exec")
 
     fixers = get_all_fixers()
     for fixer in fixers:
@@ -17,6 +17,7 @@ async def test_all_fixers_dry_run_safety(mocker):
 
     # Assert subprocess was NEVER called
     mock_sub.assert_not_called()
+    mock_exec.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -43,7 +44,7 @@ async def test_services_fixer_logic(mocker):
 
     # Mock subprocess
     mock_sub = mocker.patch(
-        "asyncio.create_subprocess_shell", new_callable=mocker.AsyncMock
+        "asyncio.create_subprocess_exec", new_callable=mocker.AsyncMock
     )
     mock_sub.return_value.returncode = 0
     mock_sub.return_value.communicate.return_value = (b"", b"")
@@ -58,7 +59,7 @@ async def test_services_fixer_logic(mocker):
     assert "Restarted sshd" in str(actions)
 
     # Verify commands
-    calls = [c[0][0] for c in mock_sub.call_args_list]
+    calls = [" ".join(c[0]) for c in mock_sub.call_args_list]
     assert any("systemctl restart NetworkManager" in cmd for cmd in calls)
     assert any("systemctl restart sshd" in cmd for cmd in calls)
 
@@ -72,7 +73,7 @@ async def test_disk_fixer_logic(mocker):
     """Test DiskCleanupFixer commands."""
     mocker.patch("src.tools.fixers.disk.is_root", return_value=True)
     mock_sub = mocker.patch(
-        "asyncio.create_subprocess_shell", new_callable=mocker.AsyncMock
+        "asyncio.create_subprocess_exec", new_callable=mocker.AsyncMock
     )
     mock_sub.return_value.returncode = 0
     mock_sub.return_value.communicate.return_value = (b"", b"")
@@ -83,7 +84,7 @@ async def test_disk_fixer_logic(mocker):
 
     await fixer.apply(dry_run=False)
 
-    calls = [c[0][0] for c in mock_sub.call_args_list]
+    calls = [" ".join(c[0]) for c in mock_sub.call_args_list]
     assert any("apt-get clean" in cmd for cmd in calls)
     assert any("apt-get autoremove" in cmd for cmd in calls)
 
@@ -97,12 +98,13 @@ async def test_dns_fixer_safety(mocker):
     """Ensure DNS fixer backs up configuration."""
     mocker.patch("src.tools.fixers.network.is_root", return_value=True)
     mock_sub = mocker.patch(
-        "asyncio.create_subprocess_shell", new_callable=mocker.AsyncMock
+        "asyncio.create_subprocess_exec", new_callable=mocker.AsyncMock
     )
     mock_sub.return_value.returncode = 0
     mock_sub.return_value.communicate.return_value = (b"", b"")
-    # Mock open() to avoid writing to real file
-    mocker.patch("builtins.open", mocker.mock_open())
+    # Mock the write and the backup copy to avoid touching real files
+    mock_write = mocker.patch("src.tools.fixers.network.Path.write_text")
+    mock_copy = mocker.patch("src.tools.fixers.network.shutil.copyfile")
 
     from src.tools.fixers.network import DNSFixer
 
@@ -110,8 +112,9 @@ async def test_dns_fixer_safety(mocker):
 
     await fixer.apply(dry_run=False)
 
-    calls = [c[0][0] for c in mock_sub.call_args_list]
-    # Ensure backup is made via CP (copy)
-    assert any("cp /etc/resolv.conf" in cmd for cmd in calls)
+    calls = [" ".join(c[0]) for c in mock_sub.call_args_list]
+    # Ensure backup is made by copying
+    mock_copy.assert_called_once_with("/etc/resolv.conf", "/etc/resolv.conf.bak")
+    mock_write.assert_called_once_with("nameserver 8.8.8.8\nnameserver 1.1.1.1\n")
     # Ensure no MV (destructive move)
     assert not any("mv /etc/resolv.conf" in cmd for cmd in calls)
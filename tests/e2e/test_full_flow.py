@@ -24,6 +24,12 @@ async def test_full_user_journey(monkeypatch):
             ],
             "service_errors": [],
             "security_warnings": [],
+            "counts": {
+                "hardware_errors": 0,
+                "driver_errors": 1,
+                "service_errors": 0,
+                "security_warnings": 0,
+            },
             "recommendations": ["Update driver"],
         }
 
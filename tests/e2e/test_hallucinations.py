@@ -20,6 +20,12 @@ async def test_clean_system_empty_logs(monkeypatch):
             "driver_errors": [],
             "service_errors": [],
             "security_warnings": [],
+            "counts": {
+                "hardware_errors": 0,
+                "driver_errors": 0,
+                "service_errors": 0,
+                "security_warnings": 0,
+            },
             "recommendations": ["✅ No error level issues found"],
         }
 
@@ -74,6 +80,12 @@ async def test_os_context_debian(monkeypatch):
             "driver_errors": [],
             "service_errors": [],
             "security_warnings": [],
+            "counts": {
+                "hardware_errors": 0,
+                "driver_errors": 0,
+                "service_errors": 0,
+                "security_warnings": 0,
+            },
             "recommendations": [],
         }
 
@@ -1,8 +1,14 @@
 """Tests for session storage."""
 
+import asyncio
+import fcntl
 import json
+import mmap
+import os
+from unittest.mock import patch
 import pytest
 from src.session.store import FileSessionStore
+from src.utils import fastjson
 
 
 @pytest.fixture
@@ -30,7 +36,8 @@ async def test_save_and_get_issue(session_file):
     # Check in memory
     assert await store.get_issue() == "System is slow"
 
-    # Check on disk
+    # Check on disk (writes are debounced)
+    await store.flush()
     with open(session_file, "r") as f:
         data = json.load(f)
     assert data["current_issue"] == "System is slow"
@@ -67,6 +74,7 @@ async def test_clear_session(session_file):
     assert await store.get_issue() is None
     assert await store.get_chat_history() == []
 
+    await store.aclose()
     with open(session_file, "r") as f:
         data = json.load(f)
     assert data == {
@@ -74,3 +82,171 @@ async def test_clear_session(session_file):
         "current_issue": None,
         "last_diagnostic": None,
     }
+
+
+@pytest.mark.asyncio
+async def test_writes_are_coalesced(session_file, mocker):
+    """Several mutations in a burst result in a single file write."""
+    store = FileSessionStore(path=session_file, debounce_s=0.01)
+    write = mocker.spy(store, "_write")
+
+    await store.save_issue("Issue")
+    await store.save_chat_message("user", "one")
+    await store.save_chat_message("assistant", "two")
+    assert write.call_count == 0
+
+    await store.aclose()
+
+    assert write.call_count == 1
+    with open(session_file, "r") as f:
+        data = json.load(f)
+    assert data["current_issue"] == "Issue"
+    assert len(data["chat_history"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_journal_replayed_without_compaction(session_file):
+    """Appended entries are visible to a new store before any snapshot."""
+    store = FileSessionStore(path=session_file)
+    await store.save_issue("Disk full")
+    await store.save_chat_message("user", "help")
+    assert not session_file.exists()
+
+    # Simulate a crash in the middle of the next append.
+    with open(store.journal_path, "a") as f:
+        f.write('{"t": "msg", "role": "us')
+
+    store2 = FileSessionStore(path=session_file)
+    assert await store2.get_issue() == "Disk full"
+    assert len(await store2.get_chat_history()) == 1
+
+    await store2.save_chat_message("assistant", "ok")
+    store3 = FileSessionStore(path=session_file)
+    assert [m["content"] for m in await store3.get_chat_history()] == ["help", "ok"]
+
+    store3.compact()
+    assert store3.journal_path.stat().st_size == 0
+    assert [m["content"] for m in await store3.get_chat_history()] == ["help", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_chat_history_is_capped(session_file):
+    """Only the newest max_history messages are kept, also after reload."""
+    store = FileSessionStore(path=session_file, max_history=3)
+    for i in range(5):
+        await store.save_chat_message("user", str(i))
+
+    assert [m["content"] for m in await store.get_chat_history()] == ["2", "3", "4"]
+
+    store2 = FileSessionStore(path=session_file, max_history=3)
+    assert [m["content"] for m in await store2.get_chat_history()] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_reload_sees_other_writers(session_file):
+    reader = FileSessionStore(path=session_file)
+    writer = FileSessionStore(path=session_file)
+
+    await writer.save_issue("Disk full")
+    assert await reader.get_issue() is None
+
+    reader.reload()
+    assert await reader.get_issue() == "Disk full"
+
+
+async def test_reload_if_changed_skips_untouched_files(session_file):
+    reader = FileSessionStore(path=session_file)
+    writer = FileSessionStore(path=session_file)
+
+    assert reader.reload_if_changed() is False
+
+    await writer.save_issue("Disk full")
+    assert reader.reload_if_changed() is True
+    assert await reader.get_issue() == "Disk full"
+    assert reader.reload_if_changed() is False
+
+
+async def test_generation_changes_only_when_history_is_replaced(session_file):
+    store = FileSessionStore(path=session_file, max_history=2)
+    start = store.generation
+
+    await store.save_chat_message("user", "one")
+    await store.save_chat_message("user", "two")
+    assert store.generation == start
+    # Our own appends are not another process's change
+    assert store.reload_if_changed() is False
+
+    await store.save_chat_message("user", "three")
+    trimmed = store.generation
+    assert trimmed != start
+
+    await store.clear_session()
+    assert store.generation != trimmed
+
+    cleared = store.generation
+    store.reload()
+    assert store.generation != cleared
+
+
+async def test_append_waits_for_compaction_in_another_process(session_file):
+    """A journal flocked by another compaction defers the append off the loop."""
+    store = FileSessionStore(path=session_file)
+    await store.save_issue("one")
+
+    other = os.open(store.journal_path, os.O_RDWR)
+    fcntl.flock(other, fcntl.LOCK_EX)
+    try:
+        task = asyncio.create_task(store.save_issue("two"))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        assert await store.get_issue() == "one"
+    finally:
+        fcntl.flock(other, fcntl.LOCK_UN)
+        os.close(other)
+    await task
+
+    assert await store.get_issue() == "two"
+    assert await FileSessionStore(path=session_file).get_issue() == "two"
+
+
+@pytest.mark.parametrize("messages", [3, 2000])
+async def test_snapshot_loaded_whatever_its_size(session_file, messages):
+    """Large snapshots are parsed from a memory map, small ones read directly."""
+    history = [
+        {"role": "user", "content": f"message {i} " + "x" * 40, "timestamp": None}
+        for i in range(messages)
+    ]
+    session_file.write_text(
+        json.dumps({"chat_history": history, "current_issue": "Disk full"})
+    )
+    large = session_file.stat().st_size >= fastjson.MMAP_THRESHOLD
+    assert large == (messages > 3)
+
+    with patch("src.utils.fastjson.mmap.mmap", wraps=mmap.mmap) as mapped:
+        store = FileSessionStore(path=session_file, max_history=messages)
+
+    assert mapped.called == (large and fastjson.orjson is not None)
+    assert await store.get_chat_history() == history
+    assert await store.get_issue() == "Disk full"
+
+
+async def test_entry_after_torn_line_is_parsed(session_file):
+    """A reopened store terminates a torn line before its next append."""
+    store = FileSessionStore(path=session_file)
+    await store.save_chat_message("user", "before")
+    await store.aclose()
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"t": "issue", "val')
+
+    reopened = FileSessionStore(path=session_file)
+    await reopened.save_chat_message("assistant", "after")
+    await reopened.save_issue("Disk full")
+
+    lines = store.journal_path.read_bytes().splitlines()
+    assert lines[-3] == b'{"t": "issue", "val'
+    fresh = FileSessionStore(path=session_file)
+    assert [m["content"] for m in await fresh.get_chat_history()] == [
+        "before",
+        "after",
+    ]
+    assert await fresh.get_issue() == "Disk full"
@@ -99,3 +99,6 @@ async def test_execute_emergency_diagnostics(mock_config):
             output = "".join(responses)
             assert "Free Memory" in output
             assert "Memory OK" in output
+            mock_run.assert_any_call(
+                ["free", "-h"], capture_output=True, text=True, timeout=10
+            )
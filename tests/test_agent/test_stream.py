@@ -0,0 +1,26 @@
+import pytest
+from types import SimpleNamespace
+from src.agent.stream import iter_text_chunks
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_text_chunks_follows_format_changes():
+    """A failover or final error string may switch the chunk format."""
+    agentapi = SimpleNamespace(
+        content=[SimpleNamespace(text="a"), SimpleNamespace(type="tool")]
+    )
+    claude = {"content": [{"type": "text", "text": "b"}, {"type": "tool_use"}]}
+
+    chunks = [
+        text
+        async for text in iter_text_chunks(
+            _stream(agentapi, agentapi, 42, claude, {"usage": 1}, "", "❌ ERROR")
+        )
+    ]
+
+    assert chunks == ["a", "a", "b", "❌ ERROR"]
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch, AsyncMock
 from click.testing import CliRunner
-from src.cli import cli
+from src.cli import cli, _ShellPool, _print_output, MAX_PRINTED_OUTPUT
 
 
 @pytest.fixture(autouse=True)
@@ -39,6 +39,12 @@ async def test_cli_diagnose_hardware(runner, mock_client_cls):
             "driver_errors": [],
             "service_errors": [],
             "security_warnings": [],
+            "counts": {
+                "hardware_errors": 0,
+                "driver_errors": 0,
+                "service_errors": 0,
+                "security_warnings": 0,
+            },
             "recommendations": [],
         }
 
@@ -53,6 +59,34 @@ async def test_cli_diagnose_hardware(runner, mock_client_cls):
         mock_client_cls.return_value.execute_rescue_task.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_cli_diagnose_reports_total_counts(runner, mock_client_cls):
+    """The prompt reports full totals, not the capped entry lists."""
+    entry = {"unit": "kernel", "message": "mce: hardware error", "ts": 0}
+    with patch("src.cli.analyze_system_logs", new_callable=AsyncMock) as mock_logs:
+        mock_logs.return_value = {
+            "hardware_errors": [entry],
+            "driver_errors": [],
+            "service_errors": [],
+            "security_warnings": [],
+            "counts": {
+                "hardware_errors": 5000,
+                "driver_errors": 0,
+                "service_errors": 0,
+                "security_warnings": 0,
+            },
+            "recommendations": [],
+        }
+
+        from asyncclick.testing import CliRunner as AsyncCliRunner
+
+        result = await AsyncCliRunner().invoke(cli, ["diagnose"])
+
+        assert result.exit_code == 0
+        prompt = mock_client_cls.return_value.execute_rescue_task.call_args.args[0]
+        assert "Hardware errors: 5000" in prompt
+
+
 @pytest.mark.asyncio
 async def test_cli_emergency_mode(runner, mock_client_cls):
     from asyncclick.testing import CliRunner as AsyncCliRunner
@@ -190,6 +224,52 @@ async def test_cli_gcloud_check_no_project(runner, mock_client_cls):
         assert "No active GCloud project" in result.output
 
 
+@pytest.mark.asyncio
+async def test_cli_gcloud_check_with_project(runner, mock_client_cls):
+    from asyncclick.testing import CliRunner as AsyncCliRunner
+    from src.gcloud.manager import QuotaStatus
+
+    runner = AsyncCliRunner()
+
+    with patch("src.gcloud.manager.GCloudManager") as MockManager:
+        instance = MockManager.return_value
+        instance.get_current_project.return_value = "proj-1"
+        instance.is_api_enabled.return_value = True
+        instance.check_quota_status.return_value = QuotaStatus(
+            project_id="proj-1",
+            limit_name="limit",
+            limit_value=100,
+            current_usage=1,
+            is_exceeded=False,
+            region="us-central1",
+        )
+
+        result = await runner.invoke(cli, ["gcloud", "check", "--no-cache"])
+        assert result.exit_code == 0
+        assert "Active project" in result.output
+        assert "Enabled" in result.output
+        instance.is_api_enabled.assert_called_once_with("proj-1")
+        instance.check_quota_status.assert_called_once_with("proj-1")
+        MockManager.assert_called_once_with(cache_path=None, use_rest=True)
+
+
+def test_gcloud_manager_shared_per_cache_setting():
+    import asyncclick as click
+    from unittest.mock import MagicMock
+    from src.cli import _gcloud_manager
+
+    root = click.Context(cli)
+    sub = click.Context(cli, parent=root)
+    with patch("src.gcloud.manager.GCloudManager") as MockManager:
+        MockManager.side_effect = lambda **kwargs: MagicMock()
+        cached = _gcloud_manager(sub)
+        assert _gcloud_manager(root) is cached
+        uncached = _gcloud_manager(sub, use_cache=False)
+
+    assert uncached is not cached
+    assert MockManager.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_cli_gcloud_list_projects(runner, mock_client_cls):
     from asyncclick.testing import CliRunner as AsyncCliRunner
@@ -284,6 +364,7 @@ async def test_cli_chat_message_flow():
     with patch("src.cli.load_config", new_callable=AsyncMock, return_value=cfg):
         with patch("src.cli.FileSessionStore") as mock_store_cls:
             mock_store = mock_store_cls.return_value
+            mock_store.aclose = AsyncMock()
             mock_store.get_issue = AsyncMock(return_value="Slow Wi-Fi")
             mock_store.get_chat_history = AsyncMock(return_value=[])
             mock_store.save_chat_message = AsyncMock()
@@ -305,3 +386,77 @@ async def test_cli_chat_message_flow():
 
                 assert result.exit_code == 0
                 mock_store.save_chat_message.assert_any_call("user", "Hello")
+                mock_store.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_runs_commands_in_isolation():
+    pool = _ShellPool(1)
+    try:
+        assert await pool.run("printf out; printf err >&2; exit 3") == (3, "out", "err")
+        await pool.run("cd /; FOO=1")
+        assert await pool.run('echo "$FOO"') == (0, "\n", "")
+        assert await pool.run("cat") == (0, "", "")
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_reads_lines_longer_than_stream_limit():
+    pool = _ShellPool(1)
+    try:
+        rc, out, err = await pool.run("head -c 3000000 /dev/zero | tr '\\0' x")
+        assert (rc, len(out), err) == (0, 3_000_000, "")
+        assert await pool.run("echo next") == (0, "next\n", "")
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_optimize_apps_recomputes_previews_after_executed_step(
+    runner, mock_client_cls
+):
+    from asyncclick.testing import CliRunner as AsyncCliRunner
+
+    runs: list[str] = []
+
+    async def fake_preview(self, command):
+        runs.append(command)
+        return 0, f"preview #{len(runs)}", ""
+
+    with (
+        patch(
+            "src.cli.shutil.which",
+            side_effect=lambda name: "/usr/bin/apt-get" if name == "apt-get" else None,
+        ),
+        patch.object(_ShellPool, "run", fake_preview),
+        patch(
+            "src.cli._run_shell", new_callable=AsyncMock, return_value=(0, "", "")
+        ) as mock_exec,
+        patch(
+            "src.cli.safe_permission_handler",
+            new_callable=AsyncMock,
+            return_value={"behavior": "allow"},
+        ),
+    ):
+        result = await AsyncCliRunner().invoke(
+            cli, ["optimize-apps", "--platform", "apt", "--yes"]
+        )
+
+    assert result.exit_code == 0
+    assert mock_exec.await_count == 2
+    # Both previews up front, then the upgrade preview again after autoremove
+    assert len(runs) == 3
+    assert "-s upgrade" in runs[2]
+    assert "preview #3" in result.output
+
+
+def test_print_output_shows_the_limit_before_truncating():
+    text = "x" * MAX_PRINTED_OUTPUT + "y" * 10
+    with patch("src.cli.console") as console:
+        _print_output(text)
+        _print_output("short [bold]")
+
+    truncated, short = (c.args[0] for c in console.print.call_args_list)
+    assert truncated == "x" * MAX_PRINTED_OUTPUT + "\n... [truncated 10 chars]"
+    assert short == "short [bold]"
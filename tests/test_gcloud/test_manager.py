@@ -1,7 +1,15 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import subprocess
-from src.gcloud.manager import GCloudManager
+from src.gcloud.manager import GCloudManager, _gcloud_version
+
+
+@pytest.fixture(autouse=True)
+def fresh_gcloud_probe():
+    """Every test starts without a cached ``gcloud version`` probe."""
+    _gcloud_version.cache_clear()
+    yield
+    _gcloud_version.cache_clear()
 
 
 @pytest.fixture
@@ -25,6 +33,16 @@ def test_init_check_failed():
         assert "not installed" in str(exc.value)
 
 
+def test_gcloud_probed_once_per_process():
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "Google Cloud SDK 410.0.0"
+        GCloudManager()
+        GCloudManager()
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args.args[0] == ["gcloud", "version"]
+
+
 def test_list_projects(manager):
     mock_output = [
         {
@@ -77,27 +95,48 @@ def test_is_api_enabled_false(manager):
 
 
 def test_create_project_auto(manager):
+    created = {
+        "projectId": "auto-gen-id",
+        "name": "SOS Agent",
+        "projectNumber": "1",
+        "lifecycleState": "ACTIVE",
+    }
+    with patch.object(manager, "_run_gcloud_command") as mock_run_cmd:
+        with patch("subprocess.run"):
+            # Project details come from the create output itself
+            mock_run_cmd.return_value = created
+
+            project = manager.create_project(
+                project_id="auto-gen-id", auto_confirm=True
+            )
+
+            assert project.project_id == "auto-gen-id"
+            assert mock_run_cmd.call_count == 1
+
+
+def test_create_project_falls_back_to_describe(manager):
     with patch.object(manager, "_run_gcloud_command") as mock_run_cmd:
         with patch("subprocess.run"):
-            # Mock list_projects to verify creation
             mock_run_cmd.side_effect = [
-                {},  # create output (ignored)
-                [  # list projects output
-                    {
-                        "projectId": "auto-gen-id",
-                        "name": "SOS Agent",
-                        "projectNumber": "1",
-                        "lifecycleState": "ACTIVE",
-                    }
-                ],
+                {},  # create output without project fields
+                {  # projects describe
+                    "projectId": "auto-gen-id",
+                    "name": "SOS Agent",
+                    "projectNumber": "1",
+                    "lifecycleState": "ACTIVE",
+                },
             ]
 
             project = manager.create_project(
                 project_id="auto-gen-id", auto_confirm=True
             )
 
-            assert project.project_id == "auto-gen-id"
-            assert mock_run_cmd.call_count == 2
+            assert project.project_number == "1"
+            assert mock_run_cmd.call_args_list[1].args[0] == [
+                "projects",
+                "describe",
+                "auto-gen-id",
+            ]
 
 
 def test_create_project_no_auto(manager):
@@ -132,3 +171,176 @@ def test_check_quota_status_failed(manager):
         status = manager.check_quota_status("proj")
 
         assert status.is_exceeded is True  # Fallback is True (assume worst)
+
+
+def test_run_gcloud_command_cached(manager):
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = '[{"name": "api"}]'
+
+        assert manager.is_api_enabled("proj", "api") is True
+        assert manager.is_api_enabled("proj", "api") is True
+
+        assert mock_run.call_count == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    cache_file = tmp_path / "gcloud.json"
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = '[{"name": "api"}]'
+        first = GCloudManager(cache_path=cache_file)
+        assert first.is_api_enabled("proj", "api") is True
+
+    assert cache_file.exists()
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "Google Cloud SDK 410.0.0"
+        second = GCloudManager(cache_path=cache_file)
+        assert second.is_api_enabled("proj", "api") is True
+        # Neither the lookup nor the (once per process) version check ran
+        mock_run.assert_not_called()
+
+
+def test_current_project_not_persisted(tmp_path):
+    """A `gcloud config set project` between runs is picked up."""
+    cache_file = tmp_path / "gcloud.json"
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "old-project\n"
+        first = GCloudManager(cache_path=cache_file)
+        assert first.get_current_project() == "old-project"
+        assert first.get_current_project() == "old-project"
+        # Version check plus one lookup: reused within the process
+        assert mock_run.call_count == 2
+
+        mock_run.return_value.stdout = "new-project\n"
+        second = GCloudManager(cache_path=cache_file)
+        assert second.get_current_project() == "new-project"
+
+
+def test_enable_api_invalidates_cache(manager):
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "[]"
+        assert manager.is_api_enabled("proj") is False
+
+        manager.enable_api("proj")
+
+        mock_run.return_value.stdout = '[{"name": "api"}]'
+        assert manager.is_api_enabled("proj") is True
+
+
+def test_list_projects_rest_fast_path(manager):
+    pages = [
+        {
+            "projects": [
+                {
+                    "projectId": "rest-1",
+                    "name": "REST 1",
+                    "projectNumber": "1",
+                    "lifecycleState": "ACTIVE",
+                }
+            ],
+            "nextPageToken": "next",
+        },
+        {
+            "projects": [
+                {
+                    "projectId": "rest-2",
+                    "name": "REST 2",
+                    "projectNumber": "2",
+                    "lifecycleState": "ACTIVE",
+                },
+                # Hidden by `gcloud projects list` too
+                {
+                    "projectId": "rest-3",
+                    "name": "REST 3",
+                    "projectNumber": "3",
+                    "lifecycleState": "DELETE_REQUESTED",
+                },
+            ]
+        },
+    ]
+    session = MagicMock()
+    session.get.return_value.json.side_effect = pages
+    manager.use_rest = True
+    manager._session = session
+
+    with patch("subprocess.run") as mock_run:
+        projects = manager.list_projects()
+
+    assert [p.project_id for p in projects] == ["rest-1", "rest-2"]
+    assert session.get.call_count == 2
+    mock_run.assert_not_called()
+
+
+def test_rest_failure_falls_back_to_gcloud(manager):
+    requests = pytest.importorskip("requests")
+    session = MagicMock()
+    session.get.return_value.raise_for_status.side_effect = (
+        requests.exceptions.HTTPError("403 Forbidden")
+    )
+    manager.use_rest = True
+    manager._session = session
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = '[{"name": "api"}]'
+        assert manager.is_api_enabled("proj", "api") is True
+        mock_run.assert_called_once()
+
+
+def test_rest_session_uses_active_gcloud_account(manager):
+    manager.use_rest = True
+
+    with (
+        patch("subprocess.run") as mock_run,
+        patch("google.auth.transport.requests.AuthorizedSession") as MockSession,
+    ):
+        mock_run.return_value.stdout = "ya29.token\n"
+        assert manager._rest_session() is MockSession.return_value
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args.args[0] == ["gcloud", "auth", "print-access-token"]
+    credentials = MockSession.call_args.args[0]
+    assert credentials.token == "ya29.token"
+
+
+def test_iter_json_array_across_chunks():
+    from src.gcloud.manager import _iter_json_array
+
+    text = '[\n  {"projectId": "a", "n": [1, 2]},\n  {"projectId": "b"}\n]\n'
+    chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+
+    items = list(_iter_json_array(chunks))
+
+    assert items == [{"projectId": "a", "n": [1, 2]}, {"projectId": "b"}]
+    assert list(_iter_json_array([])) == []
+
+
+def test_list_projects_streams_gcloud_output(manager):
+    output = (
+        '[{"projectId": "s-1", "name": "S1", "projectNumber": "1",'
+        ' "lifecycleState": "ACTIVE"}]'
+    )
+    with patch("subprocess.Popen") as mock_popen:
+        proc = mock_popen.return_value
+        proc.stdout.read.side_effect = [output, ""]
+        proc.wait.return_value = 0
+        proc.poll.return_value = 0
+
+        projects = manager.list_projects()
+
+    assert [p.project_id for p in projects] == ["s-1"]
+    assert mock_popen.call_args[0][0][:3] == ["gcloud", "projects", "list"]
+
+
+def test_stream_unparsable_output_is_drained_before_wait(manager):
+    with patch("subprocess.Popen") as mock_popen:
+        proc = mock_popen.return_value
+        proc.stdout.read.side_effect = ["Updates are available", "x" * 10, ""]
+        proc.wait.side_effect = lambda: (
+            0 if proc.stdout.read.call_count == 3 else pytest.fail("wait() blocks")
+        )
+        proc.poll.return_value = 0
+
+        with pytest.raises(RuntimeError, match="Failed to parse gcloud output"):
+            manager.list_projects()
@@ -4,92 +4,51 @@ from src.tools.log_analyzer import analyze_system_logs
 
 
 @pytest.mark.asyncio
-async def test_analyze_system_logs_success():
+async def test_analyze_system_logs_success(journal_process):
     """Test successful log analysis."""
     with patch("asyncio.create_subprocess_exec") as mock_shell:
-        process_all = AsyncMock()
-        process_all.communicate.return_value = (
-            b'{"MESSAGE": "Test error", "_SYSTEMD_UNIT": "test.service", "PRIORITY": "3", "__REALTIME_TIMESTAMP": "1630000000000"}\n',
-            b"",
+        process_all = journal_process(
+            b'{"MESSAGE": "Test error", "_SYSTEMD_UNIT": "test.service", "PRIORITY": "3", "__REALTIME_TIMESTAMP": "1630000000000"}\n'
+            b'{"MESSAGE": "Kernel error", "_SYSTEMD_UNIT": "kernel", "PRIORITY": "3", "__REALTIME_TIMESTAMP": "1630000000000"}\n'
         )
-        process_all.returncode = 0
 
-        process_kernel = AsyncMock()
-        process_kernel.communicate.return_value = (
-            b'{"MESSAGE": "Kernel error", "_SYSTEMD_UNIT": "kernel", "PRIORITY": "3", "__REALTIME_TIMESTAMP": "1630000000000"}\n',
-            b"",
-        )
-        process_kernel.returncode = 0
-
-        mock_shell.side_effect = [process_all, process_kernel]
+        mock_shell.return_value = process_all
 
         results = await analyze_system_logs()
 
-        assert len(results["service_errors"]) > 0
+        assert len(results["service_errors"]) == 2
         assert "Test error" in results["service_errors"][0]["message"]
         assert "Kernel error" in results["service_errors"][1]["message"]
+        # Kernel messages come with the journal; no separate -k run
+        mock_shell.assert_called_once()
+        assert "-k" not in mock_shell.call_args.args
 
 
 @pytest.mark.asyncio
-async def test_analyze_system_logs_kernel_failure_silenced():
-    """
-    Test the BUG where kernel log failure is ignored if system logs succeed.
-    """
+async def test_analyze_system_logs_failure_reported(journal_process):
+    """A journalctl failure is reported with its error message."""
     with patch("asyncio.create_subprocess_exec") as mock_shell:
-        # Setup mock for process_all (SUCCESS)
-        process_all = AsyncMock()
-        process_all.communicate.return_value = (
-            b'{"MESSAGE": "System ok", "PRIORITY": "6"}\n',
-            b"",
-        )
-        process_all.returncode = 0
-
-        # Setup mock for process_kernel (FAILURE)
-        process_kernel = AsyncMock()
-        process_kernel.communicate.return_value = (
-            b"",
-            b"Permission denied for kernel logs",
-        )
-        process_kernel.returncode = 1
+        process_all = journal_process(b"", b"Permission denied", returncode=1)
 
-        # Configure side_effect
-        mock_shell.side_effect = [process_all, process_kernel]
+        mock_shell.return_value = process_all
 
         results = await analyze_system_logs()
 
         recommendations = results.get("recommendations", [])
 
-        # We specifically want to see a warning about journalctl failing or permission denied
-        # The current code swallows the kernel error completely if process_all succeeds.
-
-        warning_found = False
-        for r in recommendations:
-            if (
-                "failed to read" in r.lower()
-                or "permission denied" in r.lower()
-                or "kernel logs" in r.lower()
-            ):
-                warning_found = True
-                break
-
-        assert (
-            warning_found
-        ), f"Should report kernel log retrieval failure. Actual: {recommendations}"
+        assert any(
+            "Failed to read journalctl" in r and "Permission denied" in r
+            for r in recommendations
+        ), f"Should report log retrieval failure. Actual: {recommendations}"
 
 
 @pytest.mark.asyncio
-async def test_analyze_system_logs_all_failure():
+async def test_analyze_system_logs_all_failure(journal_process):
     """Test when system logs fail."""
     with patch("asyncio.create_subprocess_exec") as mock_shell:
-        process_all = AsyncMock()
-        process_all.communicate.return_value = (b"", b"Journalctl failed")
-        process_all.returncode = 1
+        process_all = journal_process(b"", b"Journalctl failed", returncode=1)
 
-        process_kernel = AsyncMock()
-        process_kernel.communicate.return_value = (b"", b"")
-        process_kernel.returncode = 1
-
-        mock_shell.side_effect = [process_all, process_kernel]
+        mock_shell.return_value = process_all
 
         results = await analyze_system_logs()
 
@@ -98,23 +57,17 @@ async def test_analyze_system_logs_all_failure():
 
 
 @pytest.mark.asyncio
-async def test_analyze_system_logs_parsing():
+async def test_analyze_system_logs_parsing(journal_process):
     """Test parsing of various log formats."""
     with patch("asyncio.create_subprocess_exec") as mock_shell:
-        process_all = AsyncMock()
         output = b"""
         {"MESSAGE": "Hardware error CPU", "_SYSTEMD_UNIT": "", "PRIORITY": "3"}
         Invalid JSON line
         {"MESSAGE": "Driver failed", "_SYSTEMD_UNIT": "nvidia", "PRIORITY": "3"}
         """
-        process_all.communicate.return_value = (output.strip(), b"")
-        process_all.returncode = 0
-
-        process_kernel = AsyncMock()
-        process_kernel.communicate.return_value = (b"", b"")
-        process_kernel.returncode = 0
+        process_all = journal_process(output.strip())
 
-        mock_shell.side_effect = [process_all, process_kernel]
+        mock_shell.return_value = process_all
 
         results = await analyze_system_logs()
 
@@ -123,27 +76,176 @@ async def test_analyze_system_logs_parsing():
 
 
 @pytest.mark.asyncio
-async def test_analyze_system_logs_kernel_failure_silent_stderr():
+async def test_journal_lines_split_across_reads(journal_process):
+    """Output is parsed in small reads; lines may span them."""
+    output = b"".join(
+        b'{"MESSAGE": "cpu fault %d", "PRIORITY": "3"}\n' % i for i in range(20)
+    )
+    with (
+        patch("asyncio.create_subprocess_exec") as mock_shell,
+        patch("src.tools.log_analyzer.JOURNAL_READ_SIZE", 7),
+    ):
+        # The last line has no trailing newline
+        mock_shell.return_value = journal_process(output.rstrip())
+
+        results = await analyze_system_logs()
+
+    messages = [e["message"] for e in results["hardware_errors"]]
+    assert messages == [f"cpu fault {i}" for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_analyze_system_logs_failure_silent_stderr(journal_process):
     """
-    Test when kernel log failure happens but stderr is empty.
+    Test when journalctl fails but stderr is empty.
     """
     with patch("asyncio.create_subprocess_exec") as mock_shell:
-        process_all = AsyncMock()
-        process_all.communicate.return_value = (
-            b'{"MESSAGE": "System ok", "PRIORITY": "6"}\n',
-            b"",
-        )
-        process_all.returncode = 0
+        process_all = journal_process(b"", returncode=1)
 
-        process_kernel = AsyncMock()
-        process_kernel.communicate.return_value = (b"", b"")
-        process_kernel.returncode = 1
-
-        mock_shell.side_effect = [process_all, process_kernel]
+        mock_shell.return_value = process_all
 
         results = await analyze_system_logs()
 
         recommendations = results.get("recommendations", [])
 
         # We expect a warning even if stderr is empty, because returncode is 1
-        assert any("Failed to read kernel logs" in r for r in recommendations)
+        assert any("Unknown error" in r for r in recommendations)
+
+
+@pytest.mark.asyncio
+async def test_analyze_system_logs_requests_only_needed_fields(journal_process):
+    """journalctl emits only the used fields; byte-array messages decode."""
+    with patch("asyncio.create_subprocess_exec") as mock_shell:
+        process_all = journal_process(
+            b'{"MESSAGE": [100, 105, 115, 107, 32, 255], "PRIORITY": "3"}\n'
+        )
+
+        mock_shell.return_value = process_all
+
+        results = await analyze_system_logs()
+
+        args = mock_shell.call_args_list[0].args
+        assert "--output-fields=MESSAGE,_SYSTEMD_UNIT,PRIORITY" in args
+        assert results["hardware_errors"][0]["message"].startswith("disk")
+
+
+@pytest.mark.asyncio
+async def test_timestamps_formatted_only_when_shown(journal_process):
+    """Entries keep raw journal time; rendering formats it."""
+    import time
+    from src.tools.log_analyzer import format_timestamp
+
+    with patch("asyncio.create_subprocess_exec") as mock_shell:
+        process_all = journal_process(
+            b'{"MESSAGE": "cpu fault", "PRIORITY": "3", "__REALTIME_TIMESTAMP": "1630000000000000"}\n'
+            b'{"MESSAGE": "cpu fault", "PRIORITY": "3"}\n'
+        )
+        mock_shell.return_value = process_all
+
+        results = await analyze_system_logs()
+
+    with_ts, without_ts = results["hardware_errors"]
+    assert with_ts["ts"] == 1630000000000000
+    assert format_timestamp(with_ts) == time.strftime(
+        "%Y-%m-%d %H:%M:%S", time.localtime(1630000000)
+    )
+    assert format_timestamp(without_ts) == "unknown"
+    assert format_timestamp({"timestamp": "2025-01-01 00:00:00"}) == (
+        "2025-01-01 00:00:00"
+    )
+
+
+@pytest.mark.asyncio
+async def test_category_lists_are_capped_but_counted(journal_process):
+    from src.tools.log_analyzer import MAX_KEPT_ENTRIES
+
+    total = MAX_KEPT_ENTRIES + 50
+    output = b"".join(
+        b'{"MESSAGE": "cpu fault %d", "PRIORITY": "3"}\n' % i for i in range(total)
+    )
+    with patch("asyncio.create_subprocess_exec") as mock_shell:
+        process_all = journal_process(output)
+        mock_shell.return_value = process_all
+
+        results = await analyze_system_logs()
+
+    hardware = results["hardware_errors"]
+    assert isinstance(hardware, list)
+    assert len(hardware) == MAX_KEPT_ENTRIES
+    assert hardware[-1]["message"] == f"cpu fault {total - 1}"
+    assert results["counts"]["hardware_errors"] == total
+    assert any(f"{total} hardware error(s)" in r for r in results["recommendations"])
+
+
+@pytest.mark.asyncio
+async def test_errors_survive_a_warning_flood(journal_process):
+    """Errors come first and are not pushed out by newer warnings."""
+    from src.tools.log_analyzer import MAX_KEPT_ENTRIES
+
+    output = b"".join(
+        b'{"MESSAGE": "cpu error %d", "PRIORITY": "3"}\n' % i for i in range(3)
+    ) + b"".join(
+        b'{"MESSAGE": "cpu warning %d", "PRIORITY": "4"}\n' % i
+        for i in range(MAX_KEPT_ENTRIES + 10)
+    )
+    with patch("asyncio.create_subprocess_exec") as mock_shell:
+        mock_shell.return_value = journal_process(output)
+
+        results = await analyze_system_logs(severity="warning")
+
+    messages = [e["message"] for e in results["hardware_errors"]]
+    assert len(messages) == MAX_KEPT_ENTRIES
+    assert messages[:4] == [
+        "cpu error 0",
+        "cpu error 1",
+        "cpu error 2",
+        "cpu warning 13",
+    ]
+    assert messages[-1] == f"cpu warning {MAX_KEPT_ENTRIES + 9}"
+    assert results["counts"]["hardware_errors"] == MAX_KEPT_ENTRIES + 13
+
+
+@pytest.mark.asyncio
+async def test_mcp_report_lists_top_entries_per_category():
+    from src.tools.log_analyzer import MCP_SHOWN_ENTRIES, analyze_system_logs_mcp
+
+    entries = [
+        {"ts": 0, "unit": "u", "priority": "3", "message": f"m{i}"} for i in range(12)
+    ]
+    results = {
+        "hardware_errors": entries,
+        "driver_errors": [],
+        "service_errors": [],
+        "security_warnings": [],
+        "counts": {
+            "hardware_errors": 300,
+            "driver_errors": 0,
+            "service_errors": 0,
+            "security_warnings": 0,
+        },
+        "recommendations": ["check"],
+    }
+    with patch(
+        "src.tools.log_analyzer.analyze_system_logs",
+        new_callable=AsyncMock,
+        return_value=results,
+    ):
+        response = await analyze_system_logs_mcp({})
+
+    text = response["content"][0]["text"]
+    assert text.startswith("# System Log Analysis Results\n")
+    assert "## 🔴 Hardware Errors (300)\n" in text
+    assert "- [unknown] u: m0\n" in text
+    assert text.count("- [unknown]") == MCP_SHOWN_ENTRIES
+    assert "Driver Errors" not in text
+    assert text.endswith("## 📋 Recommendations\n- check\n")
+
+
+def test_dedupe_entries_keeps_first_occurrence():
+    from src.tools.log_analyzer import dedupe_entries
+
+    first = {"unit": "a", "message": "x", "ts": 1}
+    entries = [first, {"unit": "b", "message": "x"}, {"unit": "a", "message": "x"}]
+
+    assert dedupe_entries(entries) == [first, {"unit": "b", "message": "x"}]
+    assert dedupe_entries(entries)[0] is first
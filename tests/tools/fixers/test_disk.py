@@ -0,0 +1,38 @@
+import pytest
+from src.tools.fixers import disk
+from src.tools.fixers.disk import DiskCleanupFixer, _cache_size
+
+
+def test_cache_size_walks_subdirectories(tmp_path):
+    (tmp_path / "a.deb").write_bytes(b"x" * 100)
+    (tmp_path / "partial").mkdir()
+    (tmp_path / "partial" / "b.deb").write_bytes(b"x" * 50)
+
+    assert _cache_size(str(tmp_path)) == (150, False)
+    # Stops at the first file that crosses the cap
+    size, capped = _cache_size(str(tmp_path), cap=10)
+    assert capped is True
+    assert size in (50, 100)
+
+
+@pytest.mark.asyncio
+async def test_disk_fixer_check_without_subprocess(tmp_path, mocker):
+    (tmp_path / "a.deb").write_bytes(b"x" * 2048)
+    mocker.patch.object(disk, "APT_ARCHIVES", str(tmp_path))
+    mock_exec = mocker.patch("asyncio.create_subprocess_exec")
+
+    needs_fix, reason = await DiskCleanupFixer().check()
+
+    assert needs_fix is True
+    assert reason == "Apt cache size: 2.0K (Cleanup available)"
+    mock_exec.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_disk_fixer_check_missing_cache(tmp_path, mocker):
+    mocker.patch.object(disk, "APT_ARCHIVES", str(tmp_path / "missing"))
+
+    needs_fix, reason = await DiskCleanupFixer().check()
+
+    assert needs_fix is False
+    assert "No apt cache" in reason
@@ -1,3 +1,5 @@
+import socket
+
 import pytest
 from src.tools.fixers.network import DNSFixer
 
@@ -13,29 +15,25 @@ async def test_dns_fixer_dry_run():
 
 @pytest.mark.asyncio
 async def test_dns_fixer_check(mocker):
-    # Mock subprocess for check
-    mock_proc = mocker.AsyncMock()
-    mock_proc.communicate.return_value = (b"", b"")
-    mock_proc.returncode = 0  # Success
-
-    mocker.patch("asyncio.create_subprocess_shell", return_value=mock_proc)
+    # Mock the resolver for check
+    mocker.patch("socket.getaddrinfo", return_value=[])
+    mock_exec = mocker.patch("asyncio.create_subprocess_exec")
 
     fixer = DNSFixer()
     needs_fix, reason = await fixer.check()
     assert needs_fix is False
     assert "normal" in reason
+    mock_exec.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_dns_fixer_check_fail(mocker):
-    # Mock subprocess for check failure
-    mock_proc = mocker.AsyncMock()
-    mock_proc.communicate.return_value = (b"", b"")
-    mock_proc.returncode = 1  # Failure
-
-    mocker.patch("asyncio.create_subprocess_shell", return_value=mock_proc)
+    # Mock resolver failure
+    mocker.patch(
+        "socket.getaddrinfo", side_effect=socket.gaierror("Name or service not known")
+    )
 
     fixer = DNSFixer()
     needs_fix, reason = await fixer.check()
     assert needs_fix is True
-    assert "Cannot reach" in reason
+    assert "Cannot resolve" in reason
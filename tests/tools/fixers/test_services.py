@@ -0,0 +1,53 @@
+import pytest
+from src.tools.fixers.services import ServicesFixer
+
+
+@pytest.mark.asyncio
+async def test_services_fixer_check_single_call(mocker):
+    mock_proc = mocker.AsyncMock()
+    mock_proc.communicate.return_value = (b"active\ninactive\nactive\n", b"")
+    mock_proc.returncode = 3
+
+    mock_exec = mocker.patch("asyncio.create_subprocess_exec", return_value=mock_proc)
+
+    needs_fix, reason = await ServicesFixer().check()
+
+    assert needs_fix is True
+    assert reason == "Services not active: sshd"
+    mock_exec.assert_called_once()
+    assert mock_exec.call_args[0] == (
+        "systemctl",
+        "is-active",
+        "NetworkManager",
+        "sshd",
+        "cron",
+    )
+
+
+@pytest.mark.asyncio
+async def test_services_fixer_check_all_active(mocker):
+    mock_proc = mocker.AsyncMock()
+    mock_proc.communicate.return_value = (b"active\nactive\nactive\n", b"")
+    mock_proc.returncode = 0
+
+    mocker.patch("asyncio.create_subprocess_exec", return_value=mock_proc)
+
+    needs_fix, reason = await ServicesFixer().check()
+
+    assert needs_fix is False
+    assert "running" in reason
+
+
+@pytest.mark.asyncio
+async def test_services_fixer_without_systemctl(mocker, monkeypatch):
+    """Hosts without systemctl (sysvinit) report, not raise."""
+    monkeypatch.setenv("PATH", "")
+    mocker.patch("src.tools.fixers.services.is_root", return_value=True)
+    fixer = ServicesFixer()
+
+    needs_fix, reason = await fixer.check()
+    assert needs_fix is True
+    assert reason.startswith("systemctl not available")
+
+    actions = await fixer.apply(dry_run=False)
+    assert actions == [f"Failed to restart {svc}" for svc in fixer.services]
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 pytest.importorskip("textual")
 from src.tui.app import SOSApp
@@ -7,6 +7,7 @@ from src.tui.screens.menu import MainMenu
 from src.tui.screens.fix import FixScreen
 from src.tui.screens.chat import ChatScreen
 from src.tui.screens.logs import LogsScreen
+from src.session.store import FileSessionStore
 
 
 @pytest.mark.asyncio
@@ -41,8 +42,9 @@ async def test_menu_to_fix_and_back():
 async def test_menu_to_chat():
     """Chat screen loads without crashing and respects bindings."""
     app = SOSApp(init_client=False)
-    with patch("src.tui.screens.chat.FileSessionStore") as mock_store_cls:
+    with patch("src.tui.app.FileSessionStore") as mock_store_cls:
         mock_store = mock_store_cls.return_value
+        mock_store.aclose = AsyncMock()
         mock_store.get_chat_history = AsyncMock(return_value=[])
         mock_store.get_issue = AsyncMock(return_value=None)
         with patch(
@@ -61,6 +63,47 @@ async def test_menu_to_chat():
                     await pilot.press("escape")
                     assert isinstance(app.screen, MainMenu)
 
+        # The shared store is compacted and closed when the app exits
+        mock_store.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_response_once_saved():
+    """Streamed chunks are shown and saved as one assistant message."""
+    app = SOSApp(init_client=False)
+    with patch("src.tui.app.FileSessionStore") as mock_store_cls:
+        mock_store = mock_store_cls.return_value
+        mock_store.aclose = AsyncMock()
+        mock_store.get_chat_history = AsyncMock(return_value=[])
+        mock_store.get_issue = AsyncMock(return_value=None)
+        mock_store.save_chat_message = AsyncMock()
+
+        async def fake_stream(task):
+            for chunk in (
+                "Line one\n",
+                {"content": [{"type": "text", "text": "Li"}]},
+                "ne two",
+            ):
+                yield chunk
+
+        with patch("src.tui.screens.chat.SOSAgentClient") as MockClient:
+            MockClient.return_value.execute_rescue_task.side_effect = fake_stream
+            with patch("src.tui.screens.chat.load_config", new_callable=AsyncMock):
+                async with app.run_test() as pilot:
+                    await pilot.press("4")
+                    await pilot.pause()
+                    app.screen.query_one("#chat-input").focus()
+                    await pilot.press("h", "i", "enter")
+                    await pilot.pause()
+                    lines = [
+                        line.text for line in app.screen.query_one("#chat-log").lines
+                    ]
+                    assert lines[-2:] == ["AI: Line one", "Line two"]
+                    # Nothing left in the in-progress line once the stream ends
+                    assert str(app.screen.query_one("#chat-pending").renderable) == ""
+
+        mock_store.save_chat_message.assert_any_call("assistant", "Line one\nLine two")
+
 
 @pytest.mark.asyncio
 async def test_menu_to_logs():
@@ -69,3 +112,233 @@ async def test_menu_to_logs():
     async with app.run_test() as pilot:
         await pilot.press("6")
         assert isinstance(app.screen, LogsScreen)
+
+
+@pytest.mark.asyncio
+async def test_chat_title_follows_client_type():
+    """Replacing the app client or failing over updates the chat title."""
+    app = SOSApp(init_client=False)
+    with patch("src.tui.app.FileSessionStore") as mock_store_cls:
+        mock_store_cls.return_value.get_chat_history = AsyncMock(return_value=[])
+        mock_store_cls.return_value.save_chat_message = AsyncMock()
+        mock_store_cls.return_value.get_issue = AsyncMock(return_value=None)
+        mock_store_cls.return_value.aclose = AsyncMock()
+        with patch("src.tui.screens.chat.SOSAgentClient"):
+            with patch("src.tui.screens.chat.load_config", new_callable=AsyncMock):
+                async with app.run_test() as pilot:
+                    await pilot.press("4")
+                    await pilot.pause()
+                    title = app.screen.query_one(".title")
+                    assert str(title.renderable) == "SOS Chat Assistant"
+
+                    app.client = MagicMock(client_type="gemini")
+                    await pilot.pause()
+                    assert app.client_type == "gemini"
+                    assert str(title.renderable) == "SOS Chat Assistant (gemini)"
+
+                    # Failover switches the provider of the same client
+                    async def failover(task):
+                        app.client.client_type = "openai"
+                        yield "Pong"
+
+                    app.client.execute_rescue_task.side_effect = failover
+                    await pilot.press("escape", "4")
+                    await pilot.pause()
+                    app.screen.query_one("#chat-input").focus()
+                    await pilot.press("h", "i", "enter")
+                    await pilot.pause()
+                    title = app.screen.query_one(".title")
+                    assert str(title.renderable) == "SOS Chat Assistant (openai)"
+
+
+@pytest.mark.asyncio
+async def test_fix_dry_run_keeps_execute_disabled_without_root():
+    """Root-only fixers cannot be armed for execution when not root."""
+    app = SOSApp(init_client=False)
+    with patch("src.tui.screens.fix.is_root", return_value=False):
+        async with app.run_test() as pilot:
+            await pilot.press("2")
+            screen = app.screen
+            fixer_list = screen.query_one("#fixer-list")
+            fixer_list.focus()
+            fixer_list.index = 0
+            fixer_list.action_select_cursor()
+            await pilot.pause()
+            assert screen.selected_fixer.requires_root
+
+            screen.query_one("#btn-dry-run").press()
+            await pilot.pause()
+            assert screen.query_one("#btn-execute").disabled
+
+
+@pytest.mark.asyncio
+async def test_chat_history_markup_renders_only_new_messages(tmp_path):
+    """Re-entering the chat reuses the markup built for earlier messages."""
+    store = FileSessionStore(path=tmp_path / "session.json")
+    await store.save_chat_message("user", "hi")
+    await store.save_chat_message("assistant", "hello")
+    app = SOSApp(init_client=False)
+    with (
+        patch("src.tui.app.FileSessionStore", return_value=store),
+        patch("src.tui.screens.chat.SOSAgentClient"),
+        patch("src.tui.screens.chat.load_config", new_callable=AsyncMock),
+    ):
+        async with app.run_test() as pilot:
+            await pilot.press("4")
+            await pilot.pause()
+            first = app.chat_history_cache[2]
+            await pilot.press("escape")
+
+            await store.save_chat_message("user", "again")
+            with patch(
+                "src.tui.screens.chat._history_line", return_value="NEW"
+            ) as line:
+                await pilot.press("4")
+                await pilot.pause()
+            line.assert_called_once_with((await store.get_chat_history())[-1])
+            assert app.chat_history_cache[2] == f"{first}\nNEW"
+            await pilot.press("escape")
+
+            # A cleared session is rendered from scratch
+            await store.clear_session()
+            await store.save_chat_message("user", "other")
+            with patch("src.tui.screens.chat._history_line", return_value="X"):
+                await pilot.press("4")
+                await pilot.pause()
+            assert app.chat_history_cache[2] == "X"
+
+
+@pytest.mark.asyncio
+async def test_menu_button_opens_screen():
+    """Menu buttons dispatch to the same actions as the key bindings."""
+    app = SOSApp(init_client=False)
+    async with app.run_test() as pilot:
+        app.screen.query_one("#btn-6").press()
+        await pilot.pause()
+        assert isinstance(app.screen, LogsScreen)
+
+
+@pytest.mark.asyncio
+async def test_menu_arrow_navigation():
+    """Arrow keys move focus across the button grid and stop at its edges."""
+    app = SOSApp(init_client=False)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await pilot.press("right", "down")
+        assert app.focused.id == "btn-4"
+        await pilot.press("right", "up", "up")
+        assert app.focused.id == "btn-2"
+
+
+@pytest.mark.asyncio
+async def test_monitor_skips_unchanged_readings():
+    """A repeated reading does not touch the monitor widgets again."""
+    app = SOSApp(init_client=False)
+    with patch("src.tui.screens.monitor.psutil") as mock_psutil:
+        mock_psutil.cpu_percent.return_value = 12.5
+        mock_psutil.virtual_memory.return_value.percent = 40.0
+        mock_psutil.disk_usage.return_value.percent = 70.0
+        async with app.run_test() as pilot:
+            await pilot.press("3")
+            screen = app.screen
+            screen.update_stats()  # first tick after priming
+            assert str(screen.query_one("#cpu-label").renderable) == "12.5%"
+
+            bar, label = screen._gauges["cpu"]
+            with patch.object(label, "update") as update:
+                screen.update_stats()
+            update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_monitor_bar_ignores_sub_percent_changes():
+    """The progress bar is only reassigned when the whole percent changes."""
+    app = SOSApp(init_client=False)
+    with patch("src.tui.screens.monitor.psutil") as mock_psutil:
+        mock_psutil.cpu_percent.return_value = 12.4
+        mock_psutil.virtual_memory.return_value.percent = 40.0
+        mock_psutil.disk_usage.return_value.percent = 70.0
+        async with app.run_test() as pilot:
+            await pilot.press("3")
+            screen = app.screen
+            screen.update_stats()
+            bar, label = screen._gauges["cpu"]
+            assert bar.progress == 12
+
+            mock_psutil.cpu_percent.return_value = 11.9
+            screen.update_stats()
+            assert bar.progress == 12
+            assert str(label.renderable) == "11.9%"
+
+
+@pytest.mark.asyncio
+async def test_setup_save_keeps_client_for_language_change(tmp_path, monkeypatch):
+    """Saving only a new language reuses the running client."""
+    monkeypatch.chdir(tmp_path)
+    app = SOSApp(init_client=False)
+    with patch("src.tui.screens.setup.SOSAgentClient") as MockClient:
+        async with app.run_test() as pilot:
+            await pilot.press("5")
+            await pilot.pause()
+            screen = app.screen
+            client = MagicMock(client_type="gemini")
+            client.config = app.config
+            app.client = client
+
+            screen.query_one("#lang-cz").value = True
+            await pilot.pause()
+            await screen.save_settings()
+            assert app.client is client
+            assert client.config.ai_language == "cs"
+
+            screen._provider_select.value = "openai"
+            await pilot.pause()
+            await screen.save_settings()
+            assert app.client is MockClient.return_value
+
+
+async def test_setup_save_retries_failed_client_switch(tmp_path, monkeypatch):
+    """A provider switch whose client fails to build is retried on next save."""
+    monkeypatch.chdir(tmp_path)
+    app = SOSApp(init_client=False)
+    with patch("src.tui.screens.setup.SOSAgentClient") as MockClient:
+        async with app.run_test() as pilot:
+            await pilot.press("5")
+            await pilot.pause()
+            screen = app.screen
+            client = MagicMock(client_type="gemini")
+            client.config = app.config
+            app.client = client
+
+            MockClient.side_effect = ValueError("missing key")
+            screen._provider_select.value = "openai"
+            await pilot.pause()
+            await screen.save_settings()
+            assert app.client is client
+
+            MockClient.side_effect = None
+            await screen.save_settings()
+            assert app.client is MockClient.return_value
+
+
+async def test_setup_model_options_follow_provider_changes(tmp_path, monkeypatch):
+    """Model options are rebuilt only when the provider actually changes."""
+    monkeypatch.chdir(tmp_path)
+    app = SOSApp(init_client=False)
+    async with app.run_test() as pilot:
+        await pilot.press("5")
+        await pilot.pause()
+        screen = app.screen
+        model_select = screen._model_select
+        with patch.object(
+            model_select, "set_options", wraps=model_select.set_options
+        ) as set_options:
+            screen._provider_select.value = screen._provider_select.value
+            await pilot.pause()
+            await screen._sync_model_select()
+            set_options.assert_not_called()
+
+            screen._provider_select.value = "openai"
+            await pilot.pause()
+            set_options.assert_called_once()
+            assert model_select.value == app.config.openai_model
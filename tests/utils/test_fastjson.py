@@ -0,0 +1,42 @@
+"""Tests for the orjson-backed JSON helpers."""
+
+import json
+
+import pytest
+from src.utils import fastjson
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run a test with orjson and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+def test_dumps_loads_round_trip(backend):
+    data = {"chat_history": [{"role": "user", "content": "Ahoj, světe"}], "n": 1}
+
+    encoded = fastjson.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert "světe" in encoded.decode("utf-8")
+    assert fastjson.loads(encoded) == data
+    assert fastjson.loads(encoded.decode("utf-8")) == data
+
+
+def test_dumps_indent(backend):
+    data = {"a": [1, 2]}
+
+    assert b"\n" not in fastjson.dumps(data)
+    assert fastjson.dumps(data, indent=True) == json.dumps(data, indent=2).encode()
+
+
+@pytest.mark.parametrize("bad", [b'{"t": "msg", "role": "us', b"", "not json"])
+def test_loads_raises_json_decode_error(backend, bad):
+    with pytest.raises(fastjson.JSONDecodeError):
+        fastjson.loads(bad)
+    # Callers that only catch ValueError keep working
+    assert issubclass(fastjson.JSONDecodeError, ValueError)